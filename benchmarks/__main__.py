@@ -0,0 +1,83 @@
+"""Run the benchmark suite: ``python -m benchmarks [--out FILE] [--compare BASELINE]``.
+
+Storage goes to a fresh temporary directory (the real ``assets/state.json``
+is never touched); set ``DB_BACKEND``/``DB_WRITE_BEHIND`` as for the bot to
+benchmark another storage setup. Exits with status 1 when ``--compare``
+finds a benchmark whose median regressed by more than ``--threshold``.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+
+from benchmarks.harness import compare, format_comparison, load_results, use_temp_storage, write_results
+
+SUITES = ("render", "storage", "roll")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--only", default=",".join(SUITES), help=f"comma-separated subset of {','.join(SUITES)}")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="storage history sizes")
+    parser.add_argument("--teams", default="1,10,50,200", help="team counts for the render suite")
+    parser.add_argument("--repeat", type=int, default=5, help="timed samples per benchmark")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    suites = [s for s in args.only.split(",") if s]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix="tr-bench-") as tmp:
+        use_temp_storage(tmp)
+        from util.logger import log
+
+        log.setLevel(logging.WARNING)  # paint_team_circles logs every save
+        results = run(suites, args)
+
+        from db.client import flush_db
+
+        flush_db()
+
+    text = write_results(results, args.out)
+    if args.out is None:
+        print(text)
+    else:
+        print(f"Wrote {len(results)} results → {args.out}", file=sys.stderr)
+
+    if args.compare:
+        rows = compare(results, load_results(args.compare), args.threshold)
+        print(format_comparison(rows), file=sys.stderr)
+        regressions = [r["name"] for r in rows if r["status"] == "regression"]
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+def run(suites, args) -> dict:
+    results = {}
+    if "render" in suites:
+        from benchmarks import bench_render
+
+        teams = tuple(int(n) for n in args.teams.split(","))
+        results.update(bench_render.run(repeat=args.repeat, team_counts=teams))
+    if "storage" in suites:
+        from benchmarks import bench_storage
+
+        sizes = tuple(int(n) for n in args.sizes.split(","))
+        results.update(bench_storage.run(repeat=args.repeat, sizes=sizes))
+    if "roll" in suites:
+        from benchmarks import bench_roll
+
+        results.update(bench_roll.run(repeat=max(args.repeat, 20)))
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Tile detection and board painting on the real board assets."""
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import List
+
+from benchmarks.harness import Results, measure
+from game_state import BOARD_BACKGROUND, BOARD_BASE
+from services.team_service import Team
+
+TEAM_COUNTS = (1, 10, 50, 200)
+
+
+def make_teams(count: int, tiles: int, seed: int = 0) -> List[Team]:
+    """``count`` teams spread over the board, some sharing tiles and with blacklists."""
+    teams = []
+    for i in range(count):
+        position = (i * 7 + seed) % tiles
+        teams.append(
+            Team(
+                team_id=f"team-{i}",
+                role_id=1_000 + i,
+                name=f"Team {i}",
+                position=position,
+                color=(0x1F3B73 * (i + 1)) & 0xFFFFFF,
+                pending=False,
+                blacklist_tiles=[(position + 3 + i % 5) % tiles] if i % 3 == 0 else [],
+                blacklist_charges=1,
+            )
+        )
+    return teams
+
+
+def run(repeat: int = 5, team_counts=TEAM_COUNTS) -> Results:
+    from board.board_detector import detect_tiles_by_bg
+    from board.visualize import (
+        IncrementalBoardRenderer,
+        encode_png,
+        load_board_image,
+        paint_team_circles,
+        render_board,
+    )
+
+    results: Results = {}
+    results["render.detect_tiles_by_bg"] = measure(
+        lambda: detect_tiles_by_bg(BOARD_BACKGROUND, BOARD_BASE), repeat=max(1, repeat // 2)
+    )
+    tiles = detect_tiles_by_bg(BOARD_BACKGROUND, BOARD_BASE)
+    base = load_board_image(BOARD_BASE)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, "board_state.png")
+        for count in team_counts:
+            teams = make_teams(count, len(tiles))
+            results[f"render.paint_team_circles[{count}]"] = measure(
+                lambda: paint_team_circles(BOARD_BASE, tiles, teams, out_path=out_path),
+                repeat=repeat,
+                teams=count,
+            )
+            results[f"render.render_board+encode[{count}]"] = measure(
+                lambda: encode_png(render_board(base, tiles, teams)),
+                repeat=repeat,
+                teams=count,
+            )
+
+            # One team moves per refresh, as after a /roll.
+            renderer = IncrementalBoardRenderer(base, tiles)
+            renderer.render_png(teams)
+            frames = [teams, make_teams(count, len(tiles), seed=1)[:1] + teams[1:]]
+            step = iter(range(1 << 30))
+            results[f"render.incremental_move[{count}]"] = measure(
+                lambda: renderer.render_png(frames[next(step) % 2]),
+                repeat=repeat,
+                teams=count,
+            )
+    return results
@@ -0,0 +1,50 @@
+"""The full ``/roll`` handler, driven by a fake interaction."""
+from __future__ import annotations
+
+import itertools
+
+import commands.roll_command as roll_command
+from benchmarks.fakes import FakeInteraction
+from benchmarks.harness import Results, measure_async
+from benchmarks.world import seed_world
+from db.client import Q
+from db.teams_table import teams_table
+from util.guild_context import use_guild
+
+GUILD_ID = 424_242
+TEAMS = 10
+MEMBERS_PER_TEAM = 5
+
+
+def run(repeat: int = 50, latency: float = 0.0) -> Results:
+    """Roll once per sample, rotating through every member of every team.
+
+    The board refresh is replaced by a no-op: rendering is covered by
+    ``bench_render`` and the refresh is debounced off the command path.
+    """
+    original = roll_command.request_board_update
+    roll_command.request_board_update = lambda bot: None
+    try:
+        with use_guild(GUILD_ID):
+            world = seed_world(GUILD_ID, TEAMS, MEMBERS_PER_TEAM, latency=latency)
+            users = itertools.cycle(world.users)
+
+            def reset() -> None:
+                # Pending is set by every roll; clear it so the next one is accepted.
+                teams_table.update({"pos": 0}, Q.pos >= 90)
+                teams_table.update({"pending": False})
+
+            async def roll() -> None:
+                user, _ = next(users)
+                inter = FakeInteraction(user, world.guild, world.client)
+                await roll_command.roll_dice_command(inter)
+                if not inter.followup.messages:
+                    raise RuntimeError(f"/roll sent no reply: {inter.replies()}")
+
+            return {
+                "roll.roll_dice_command": measure_async(
+                    roll, repeat=repeat, warmup=3, setup=reset, latency_s=latency
+                )
+            }
+    finally:
+        roll_command.request_board_update = original
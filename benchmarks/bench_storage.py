@@ -0,0 +1,104 @@
+"""Per-operation timings of the ``db/*_table.py`` helpers at growing history sizes.
+
+Every size lives in its own guild partition, i.e. its own database file,
+prefilled with ``size`` proofs and ``size`` rolls spread across the teams.
+"""
+from __future__ import annotations
+
+import itertools
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict
+
+from discord import Colour
+
+from benchmarks.harness import Results, autorange, measure
+from db import meta_table, members_table, pet_proofs_table, proofs_table, rolls_table, teams_table
+from util.guild_context import use_guild
+
+SIZES = (1_000, 10_000, 100_000)
+TEAMS = 10
+MEMBERS_PER_TEAM = 20
+TILES = 90
+
+
+def prefill(size: int) -> None:
+    """Seed the current partition with teams, members and ``size`` proofs/rolls."""
+    for t in range(TEAMS):
+        teams_table.add_team(f"Team {t}", f"team-{t}", 1_000 + t, Colour(0x3366CC))
+    members_table.members_table.insert_multiple(
+        {"user_id": t * MEMBERS_PER_TEAM + m + 1, "user_name": f"user{m}", "team_slug": f"team-{t}"}
+        for t in range(TEAMS)
+        for m in range(MEMBERS_PER_TEAM)
+    )
+
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    proofs_table.proofs_table.insert_multiple(
+        {
+            "team_id": f"team-{i % TEAMS}",
+            "tile": (i // TEAMS) % TILES,
+            "url": f"https://cdn.example/{i}.png",
+            "user_id": i % (TEAMS * MEMBERS_PER_TEAM) + 1,
+            "user_name": "user",
+            "ts": (start + timedelta(seconds=i)).isoformat(timespec="seconds"),
+        }
+        for i in range(size)
+    )
+    rolls_table.rolls_table.insert_multiple(
+        {
+            "team_id": f"team-{i % TEAMS}",
+            "user_id": i % (TEAMS * MEMBERS_PER_TEAM) + 1,
+            "user_name": "user",
+            "die": i % 6 + 1,
+            "pos_before": 0,
+            "pos_after": i % 6 + 1,
+            "ts": (start + timedelta(seconds=i)).isoformat(timespec="seconds"),
+        }
+        for i in range(size)
+    )
+    meta_table.set_race_started(True)
+
+
+def operations() -> Dict[str, Callable[[], object]]:
+    seq = itertools.count()
+
+    def team() -> str:
+        return f"team-{next(seq) % TEAMS}"
+
+    return {
+        "proofs.add_proof": lambda: proofs_table.add_proof(team(), 5, "https://cdn.example/x.png", 1, "user"),
+        "proofs.list_proofs": lambda: proofs_table.list_proofs(team(), 5),
+        "proofs.list_proof_urls": lambda: proofs_table.list_proof_urls(team(), 5),
+        "rolls.log_roll": lambda: rolls_table.log_roll(
+            team_id=team(), user_id=1, user_name="user", die=3, pos_before=0, pos_after=3
+        ),
+        "rolls.last_roll": lambda: rolls_table.last_roll(team()),
+        "pet_proofs.add_pet_proof": lambda: pet_proofs_table.add_pet_proof(
+            team(), "https://cdn.example/pet.png", 1, "user"
+        ),
+        "pet_proofs.count_pet_proofs_for_team": lambda: pet_proofs_table.count_pet_proofs_for_team(team()),
+        "teams.get_team": lambda: teams_table.get_team(team()),
+        "teams.get_teams": teams_table.get_teams,
+        "teams.update_team_position": lambda: teams_table.update_team_position(next(seq) % TILES, team()),
+        "teams.clear_pending_flag": lambda: teams_table.clear_pending_flag(team()),
+        "teams.add_blacklist_charges": lambda: teams_table.add_blacklist_charges(team(), 0),
+        "members.get_member": lambda: members_table.get_member(next(seq) % (TEAMS * MEMBERS_PER_TEAM) + 1),
+        "members.get_team_members": lambda: members_table.get_team_members(team()),
+        "members.get_all_members": members_table.get_all_members,
+        "meta.is_race_started": meta_table.is_race_started,
+        "meta.get_channel_ids": meta_table.get_channel_ids,
+        "meta.set_board_message_id": lambda: meta_table.set_board_message_id(next(seq)),
+    }
+
+
+def run(repeat: int = 5, sizes=SIZES) -> Results:
+    results: Results = {}
+    for size in sizes:
+        # Partition keyed by the size so runs at different sizes never mix.
+        with use_guild(size):
+            prefill(size)
+            for name, op in operations().items():
+                number = autorange(op)
+                results[f"storage.{name}[{size}]"] = measure(
+                    op, repeat=repeat, number=number, history=size
+                )
+    return results
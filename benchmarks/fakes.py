@@ -0,0 +1,183 @@
+"""Stand-ins for the discord.py objects the command handlers touch.
+
+Every call that would be a REST request awaits ``latency`` seconds first,
+so handlers can be driven end to end without a gateway connection. Sent
+messages are recorded on the objects for inspection.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import discord
+
+_ids = itertools.count(10_000)
+
+
+@dataclass
+class FakeLatency:
+    seconds: float = 0.0
+    calls: int = 0
+
+    async def wait(self) -> None:
+        self.calls += 1
+        if self.seconds > 0:
+            await asyncio.sleep(self.seconds)
+        else:
+            await asyncio.sleep(0)
+
+
+@dataclass
+class FakeUser:
+    id: int
+    display_name: str
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+
+@dataclass
+class FakeRole:
+    id: int
+    name: str
+
+    @property
+    def mention(self) -> str:
+        return f"<@&{self.id}>"
+
+
+@dataclass
+class FakeAttachment:
+    url: str
+    filename: str = "proof.png"
+    content_type: str | None = "image/png"
+
+
+class FakeMessage:
+    def __init__(self, channel: "FakeChannel", message_id: int):
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, **kwargs) -> "FakeMessage":
+        await self.channel.latency.wait()
+        self.channel.edits.append(kwargs)
+        return self
+
+
+class FakeChannel(discord.TextChannel):
+    # Subclassed only so game_state accepts it as a board channel; none of
+    # the real channel state is set up.
+    def __init__(self, channel_id: int, latency: FakeLatency, guild=None):
+        self.id = channel_id
+        self.latency = latency
+        self.guild = guild
+        self.sent: List[Dict[str, Any]] = []
+        self.edits: List[Dict[str, Any]] = []
+
+    async def send(self, **kwargs) -> FakeMessage:
+        await self.latency.wait()
+        self.sent.append(kwargs)
+        return FakeMessage(self, next(_ids))
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        return FakeMessage(self, message_id)
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int, latency: FakeLatency):
+        self.id = guild_id
+        self.latency = latency
+        self.roles: Dict[int, FakeRole] = {}
+        self.members: Dict[int, FakeUser] = {}
+        self.channels: Dict[int, FakeChannel] = {}
+
+    def get_role(self, role_id: int):
+        return self.roles.get(role_id)
+
+    def get_member(self, user_id: int):
+        return self.members.get(user_id)
+
+    async def fetch_member(self, user_id: int):
+        await self.latency.wait()
+        return self.members.get(user_id)
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+    def add_channel(self) -> FakeChannel:
+        channel = FakeChannel(next(_ids), self.latency, guild=self)
+        self.channels[channel.id] = channel
+        return channel
+
+
+class FakeClient:
+    def __init__(self, guilds: List[FakeGuild]):
+        self.guilds = guilds
+
+    def get_channel(self, channel_id: int):
+        for guild in self.guilds:
+            if (channel := guild.get_channel(channel_id)) is not None:
+                return channel
+        return None
+
+    async def fetch_channel(self, channel_id: int):
+        await self.guilds[0].latency.wait()
+        return self.get_channel(channel_id)
+
+
+class FakeResponse:
+    def __init__(self, latency: FakeLatency):
+        self.latency = latency
+        self._done = False
+        # Loop time of the initial response (defer or message).
+        self.acked_at: float | None = None
+        self.messages: List[Dict[str, Any]] = []
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        await self.latency.wait()
+        self._ack()
+
+    async def send_message(self, content=None, **kwargs) -> None:
+        await self.latency.wait()
+        self._ack()
+        self.messages.append({"content": content, **kwargs})
+
+    def _ack(self) -> None:
+        self._done = True
+        self.acked_at = asyncio.get_running_loop().time()
+
+
+class FakeFollowup:
+    def __init__(self, latency: FakeLatency):
+        self.latency = latency
+        self.messages: List[Dict[str, Any]] = []
+
+    async def send(self, content=None, **kwargs):
+        await self.latency.wait()
+        self.messages.append({"content": content, **kwargs})
+
+
+@dataclass
+class FakeInteraction:
+    user: FakeUser
+    guild: FakeGuild
+    client: FakeClient
+    response: FakeResponse = field(init=False)
+    followup: FakeFollowup = field(init=False)
+
+    def __post_init__(self):
+        self.response = FakeResponse(self.guild.latency)
+        self.followup = FakeFollowup(self.guild.latency)
+
+    @property
+    def guild_id(self) -> int:
+        return self.guild.id
+
+    def replies(self) -> List[str]:
+        return [m["content"] for m in self.response.messages + self.followup.messages if m["content"]]
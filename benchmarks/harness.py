@@ -0,0 +1,159 @@
+"""Timing, result files and baseline comparison for the benchmark suite."""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+Results = Dict[str, Dict[str, Any]]
+
+
+def use_temp_storage(directory: str) -> None:
+    """Point the bot's storage at ``directory``; call before anything imports config."""
+    os.environ["DB_PATH"] = os.path.join(directory, "state.json")
+    os.environ["SQLITE_PATH"] = os.path.join(directory, "state.sqlite3")
+    os.environ.pop("DB_DEFAULT_GUILD_ID", None)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def summarize(samples_s: List[float], **params) -> Dict[str, Any]:
+    ms = [s * 1000 for s in samples_s]
+    return {
+        "runs": len(ms),
+        "min_ms": round(min(ms), 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "p95_ms": round(percentile(ms, 95), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        **params,
+    }
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeat: int = 5,
+    warmup: int = 1,
+    setup: Callable[[], Any] | None = None,
+    number: int = 1,
+    **params,
+) -> Dict[str, Any]:
+    """Time ``fn`` ``repeat`` times (``setup`` runs untimed before each sample).
+
+    Each sample calls ``fn`` ``number`` times and records the per-call time.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return summarize(samples, number=number, **params)
+
+
+def autorange(fn: Callable[[], Any], target_s: float = 0.02, limit: int = 1000) -> int:
+    """Calls per sample so that one sample of ``fn`` takes about ``target_s``."""
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    if once <= 0:
+        return limit
+    return max(1, min(limit, int(target_s / once)))
+
+
+def measure_async(
+    fn: Callable[[], Awaitable[Any]],
+    repeat: int = 5,
+    warmup: int = 1,
+    setup: Callable[[], Any] | None = None,
+    **params,
+) -> Dict[str, Any]:
+    async def run() -> List[float]:
+        for _ in range(warmup):
+            if setup:
+                setup()
+            await fn()
+        samples = []
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            await fn()
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    return summarize(asyncio.run(run()), **params)
+
+
+def write_results(results: Results, path: str | Path | None) -> str:
+    doc = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    text = json.dumps(doc, indent=2, sort_keys=True)
+    if path is not None:
+        Path(path).write_text(text + "\n", encoding="utf-8")
+    return text
+
+
+def load_results(path: str | Path) -> Results:
+    with Path(path).open(encoding="utf-8") as fp:
+        return json.load(fp)["results"]
+
+
+def compare(current: Results, baseline: Results, threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """Median-time comparison per benchmark present in both result sets.
+
+    ``status`` is ``"regression"`` when the median grew by more than
+    ``threshold`` (0.2 = 20 %), ``"improvement"`` when it shrank by as much.
+    """
+    rows = []
+    for name in sorted(current.keys() & baseline.keys()):
+        before = baseline[name]["median_ms"]
+        after = current[name]["median_ms"]
+        ratio = after / before if before > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append(
+            {"name": name, "baseline_ms": before, "current_ms": after,
+             "ratio": round(ratio, 3), "status": status}
+        )
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    width = max((len(r["name"]) for r in rows), default=10)
+    lines = [f"{'benchmark':<{width}}  {'baseline':>10}  {'current':>10}  {'ratio':>6}"]
+    for r in rows:
+        flag = {"regression": "  <-- slower", "improvement": "  faster"}.get(r["status"], "")
+        lines.append(
+            f"{r['name']:<{width}}  {r['baseline_ms']:>8.3f}ms  {r['current_ms']:>8.3f}ms"
+            f"  {r['ratio']:>6.2f}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,298 @@
+"""Synthetic load on the real command handlers.
+
+Hundreds of simulated members spread over many teams issue ``/roll``,
+``/post``, ``/complete``, ``/blacklist`` and ``/current-proofs`` at the same
+time. They go through the same race gate as in ``bot.py``, against the fake
+Discord objects from ``benchmarks.fakes``, with artificial REST latency and a
+temporary database. The report gives throughput, p50/p95/p99 latency, errors
+and expired interactions per command. An interaction counts as expired when
+its initial response (defer or message) came later than Discord's 3 s window.
+
+    python -m benchmarks.loadgen --users 500 --teams 50 --duration 30 --latency 0.08
+
+Exits with status 1 when any interaction errored or expired.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from benchmarks.fakes import FakeAttachment, FakeInteraction
+from benchmarks.harness import percentile, use_temp_storage
+
+COMMANDS = ("roll", "post", "complete", "blacklist", "proofs")
+DEFAULT_WEIGHTS = {"roll": 3, "post": 3, "complete": 2, "blacklist": 1, "proofs": 1}
+# Discord drops an interaction that is not responded to within 3 seconds.
+ACK_DEADLINE = 3.0
+LOAD_GUILD_ID = 515_151
+
+
+@dataclass(slots=True)
+class Sample:
+    command: str
+    latency: float  # whole handler, seconds
+    ack: float | None  # until the initial response; None if there was none
+    error: str | None
+
+
+@dataclass(slots=True)
+class LoadReport:
+    users: int
+    teams: int
+    latency: float
+    elapsed: float
+    samples: List[Sample]
+
+    def summary(self) -> Dict[str, Any]:
+        by_command: Dict[str, List[Sample]] = {}
+        for sample in self.samples:
+            by_command.setdefault(sample.command, []).append(sample)
+        return {
+            "users": self.users,
+            "teams": self.teams,
+            "latency_s": self.latency,
+            "elapsed_s": round(self.elapsed, 3),
+            "interactions": len(self.samples),
+            "throughput_per_s": round(len(self.samples) / self.elapsed, 2) if self.elapsed else 0.0,
+            "errors": sum(s.error is not None for s in self.samples),
+            "expired": sum(_expired(s) for s in self.samples),
+            "commands": {
+                name: self._describe(by_command[name]) for name in COMMANDS if name in by_command
+            },
+        }
+
+    def _describe(self, samples: List[Sample]) -> Dict[str, Any]:
+        latencies = [s.latency * 1000 for s in samples]
+        acks = [s.ack * 1000 for s in samples if s.ack is not None]
+        errors: Dict[str, int] = {}
+        for s in samples:
+            if s.error is not None:
+                errors[s.error] = errors.get(s.error, 0) + 1
+        out: Dict[str, Any] = {
+            "count": len(samples),
+            "throughput_per_s": round(len(samples) / self.elapsed, 2) if self.elapsed else 0.0,
+            "errors": errors,
+            "expired": sum(_expired(s) for s in samples),
+            "latency_ms": _percentiles(latencies),
+        }
+        if acks:
+            out["ack_ms"] = _percentiles(acks)
+        return out
+
+
+def _expired(sample: Sample) -> bool:
+    return sample.ack is None or sample.ack > ACK_DEADLINE
+
+
+def _percentiles(values_ms: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(percentile(values_ms, 50), 2),
+        "p95": round(percentile(values_ms, 95), 2),
+        "p99": round(percentile(values_ms, 99), 2),
+        "max": round(max(values_ms), 2),
+    }
+
+
+@contextmanager
+def _board_refresh(enabled: bool):
+    """Without ``enabled`` the handlers' board refresh requests are dropped."""
+    from commands import blacklist_commands, game_commands, roll_command
+
+    modules = (blacklist_commands, game_commands, roll_command)
+    originals = [m.request_board_update for m in modules]
+    if not enabled:
+        for m in modules:
+            m.request_board_update = lambda bot: None
+    try:
+        yield
+    finally:
+        for m, original in zip(modules, originals):
+            m.request_board_update = original
+
+
+def run_load(
+    users: int = 200,
+    teams: int = 20,
+    duration: float | None = 10.0,
+    actions: int | None = None,
+    latency: float = 0.05,
+    think: float = 0.5,
+    weights: Dict[str, float] | None = None,
+    board: bool = False,
+    guild_id: int = LOAD_GUILD_ID,
+    seed: int | None = None,
+) -> LoadReport:
+    """Drive the handlers until ``duration`` seconds pass or every user ran ``actions``.
+
+    Each user waits an exponentially distributed think time (mean ``think``
+    seconds) before each command. ``board=True`` keeps the real debounced
+    board refresh, rendering included.
+    """
+    if duration is None and actions is None:
+        raise ValueError("set duration, actions or both")
+
+    from benchmarks.world import seed_world
+    from commands import blacklist_commands, game_commands, proofs_command, roll_command
+    from commands.race_gate import ensure_tile_race_live
+    from util.guild_context import use_guild
+
+    rng = random.Random(seed)
+    weights = weights or DEFAULT_WEIGHTS
+    names = [n for n in COMMANDS if weights.get(n, 0) > 0]
+    cum_weights = list(itertools.accumulate(weights[n] for n in names))
+    uploads = itertools.count()
+    handlers = {
+        "roll": roll_command.roll_dice_command,
+        "post": lambda inter: game_commands.post_command(
+            inter, FakeAttachment(f"https://cdn.example/proof-{next(uploads)}.png")
+        ),
+        "complete": game_commands.complete_command,
+        "blacklist": lambda inter: blacklist_commands.blacklist_command(inter, rng.randint(1, 79)),
+        "proofs": proofs_command.proofs_command,
+    }
+    samples: List[Sample] = []
+
+    async def one(world, user, command: str) -> None:
+        loop = asyncio.get_running_loop()
+        inter = FakeInteraction(user, world.guild, world.client)
+        start = loop.time()
+        error = None
+        try:
+            if await ensure_tile_race_live(inter):
+                await handlers[command](inter)
+            if not (inter.response.messages or inter.followup.messages):
+                error = "no reply"
+        except Exception as e:
+            error = type(e).__name__
+        acked = inter.response.acked_at
+        samples.append(
+            Sample(command, loop.time() - start, None if acked is None else acked - start, error)
+        )
+
+    async def member(world, user, stop: float) -> None:
+        loop = asyncio.get_running_loop()
+        done = 0
+        while actions is None or done < actions:
+            if think > 0:
+                await asyncio.sleep(rng.expovariate(1 / think))
+            if loop.time() >= stop:
+                return
+            await one(world, user, rng.choices(names, cum_weights=cum_weights)[0])
+            done += 1
+
+    async def drive(world) -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        stop = started + duration if duration is not None else float("inf")
+        await asyncio.gather(*(member(world, user, stop) for user, _ in world.users))
+        elapsed = loop.time() - started
+        if board:
+            from game_state import wait_board_refresh
+
+            # Otherwise asyncio.run cancels a refresh still in its debounce.
+            await wait_board_refresh()
+        return elapsed
+
+    members_per_team = max(1, users // max(1, teams))
+    with use_guild(guild_id), _board_refresh(board):
+        world = seed_world(guild_id, teams, members_per_team, latency=latency)
+        # The per-team locks bind to the first event loop that waits on them.
+        roll_command.team_locks.clear()
+        try:
+            elapsed = asyncio.run(drive(world))
+        finally:
+            roll_command.team_locks.clear()
+    return LoadReport(len(world.users), teams, latency, elapsed, samples)
+
+
+def format_report(summary: Dict[str, Any]) -> str:
+    lines = [
+        f"{summary['interactions']} interactions from {summary['users']} users in "
+        f"{summary['teams']} teams over {summary['elapsed_s']}s "
+        f"({summary['throughput_per_s']}/s, REST latency {summary['latency_s'] * 1000:.0f} ms)",
+        f"{'command':<10} {'count':>6} {'/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} "
+        f"{'ack p99':>8} {'errors':>6} {'expired':>7}",
+    ]
+    for name, c in summary["commands"].items():
+        lat = c["latency_ms"]
+        ack = c.get("ack_ms", {}).get("p99", float("nan"))
+        lines.append(
+            f"{name:<10} {c['count']:>6} {c['throughput_per_s']:>7} {lat['p50']:>8.1f} "
+            f"{lat['p95']:>8.1f} {lat['p99']:>8.1f} {ack:>8.1f} "
+            f"{sum(c['errors'].values()):>6} {c['expired']:>7}"
+        )
+        for error, n in sorted(c["errors"].items()):
+            lines.append(f"{'':<10} {n} × {error}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadgen", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds (0: until --actions)")
+    parser.add_argument("--actions", type=int, help="commands per user")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per fake REST call")
+    parser.add_argument("--think", type=float, default=0.5, help="mean seconds between a user's commands")
+    parser.add_argument(
+        "--weights",
+        default=",".join(f"{k}={v}" for k, v in DEFAULT_WEIGHTS.items()),
+        help="command mix, e.g. roll=3,post=3,complete=2,blacklist=1,proofs=1",
+    )
+    parser.add_argument("--board", action="store_true", help="keep the real board refresh (renders)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    weights = {}
+    for part in args.weights.split(","):
+        name, _, value = part.partition("=")
+        if name not in COMMANDS:
+            parser.error(f"unknown command in --weights: {name!r}")
+        weights[name] = float(value or 1)
+
+    with tempfile.TemporaryDirectory(prefix="tr-load-") as tmp:
+        use_temp_storage(tmp)
+        from util.logger import log
+
+        log.setLevel(logging.WARNING)
+        wall = time.perf_counter()
+        report = run_load(
+            users=args.users,
+            teams=args.teams,
+            duration=args.duration or None,
+            actions=args.actions,
+            latency=args.latency,
+            think=args.think,
+            weights=weights,
+            board=args.board,
+            seed=args.seed,
+        )
+        from db.client import flush_db
+
+        flush_db()
+
+    summary = report.summary()
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_report(summary))
+        print(f"(wall time incl. setup {time.perf_counter() - wall:.1f}s)")
+    return 1 if summary["errors"] or summary["expired"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""A seeded race (teams, members, channels) in the current guild's DB."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from discord import Colour
+
+from benchmarks.fakes import FakeChannel, FakeClient, FakeGuild, FakeLatency, FakeRole, FakeUser
+from db import members_table, teams_table
+from db.meta_table import BOARD_CHANNEL_ID, PROOFS_CHANNEL_ID, set_meta_many, set_race_started
+
+
+@dataclass
+class World:
+    guild: FakeGuild
+    client: FakeClient
+    users: List[Tuple[FakeUser, str]]  # (user, team slug)
+    proofs_channel: FakeChannel
+    board_channel: FakeChannel
+
+    @property
+    def team_slugs(self) -> List[str]:
+        return sorted({slug for _, slug in self.users})
+
+
+def seed_world(
+    guild_id: int,
+    teams: int,
+    members_per_team: int,
+    latency: float = 0.0,
+) -> World:
+    """Create ``teams`` teams with members in the current guild's storage."""
+    guild = FakeGuild(guild_id, FakeLatency(latency))
+    client = FakeClient([guild])
+    users: List[Tuple[FakeUser, str]] = []
+    next_user = 1
+    for t in range(teams):
+        slug = f"team-{t}"
+        role = FakeRole(1_000 + t, slug)
+        guild.roles[role.id] = role
+        teams_table.add_team(slug.title(), slug, role.id, Colour(0x100000 * (t % 15) + 0x3366))
+        for _ in range(members_per_team):
+            user = FakeUser(next_user, f"user{next_user}")
+            next_user += 1
+            guild.members[user.id] = user
+            members_table.add_member(user.id, user.display_name, slug)
+            users.append((user, slug))
+
+    proofs = guild.add_channel()
+    board = guild.add_channel()
+    set_meta_many({PROOFS_CHANNEL_ID: proofs.id, BOARD_CHANNEL_ID: board.id})
+    set_race_started(True)
+    return World(guild, client, users, proofs, board)
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from util.logger import log
+
+# Bump when detect_tiles_by_bg changes in a way that alters its output.
+_DETECTOR_VERSION = 1
+
+Box = Tuple[int, int, int, int]
+
+_memo: Dict[Tuple[str, str], Tuple[tuple, List[Box]]] = {}
+
+
+def sidecar_path(board_png: str | Path) -> Path:
+    """Geometry cache location next to the rendered board PNG."""
+    p = Path(board_png)
+    return p.with_name(f"{p.stem}.tiles.json")
+
+
+def geometry_key(bg_path: str | Path, board_path: str | Path) -> str:
+    h = hashlib.sha256()
+    h.update(f"detector-v{_DETECTOR_VERSION}".encode())
+    for path in (bg_path, board_path):
+        h.update(b"\0")
+        h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def detect_tiles_by_bg(bg_path: str | Path, board_path: str | Path) -> List[Box]:
+    # Imported on first detection so a sidecar hit never loads OpenCV.
+    from board.board_detector import detect_tiles_by_bg as detect
+
+    return detect(bg_path, board_path)
+
+
+def load_tile_geometry(
+    bg_path: str | Path,
+    board_path: str | Path,
+    cache_path: str | Path,
+) -> List[Box]:
+    """Return tile boxes from the sidecar cache, detecting them on a miss."""
+    key = geometry_key(bg_path, board_path)
+    tiles = _read_cache(Path(cache_path), key)
+    if tiles is not None:
+        return tiles
+
+    tiles = detect_tiles_by_bg(bg_path, board_path)
+    _write_cache(Path(cache_path), key, tiles)
+    log.info(f"Detected {len(tiles)} tiles, cached geometry → {cache_path}")
+    return tiles
+
+
+def get_tile_geometry(
+    bg_path: str | Path,
+    board_path: str | Path,
+    cache_path: str | Path,
+) -> List[Box]:
+    """Process-wide memo over load_tile_geometry.
+
+    Only a stat() of both images is done per call; the images are re-hashed
+    (and detection re-run on a key mismatch) when either file changes.
+    """
+    memo_key = (str(bg_path), str(board_path))
+    stamp = _stat_stamp(bg_path, board_path)
+    cached = _memo.get(memo_key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    tiles = load_tile_geometry(bg_path, board_path, cache_path)
+    _memo[memo_key] = (stamp, tiles)
+    return tiles
+
+
+def _stat_stamp(*paths: str | Path) -> tuple:
+    out = []
+    for path in paths:
+        st = os.stat(path)
+        out.append((st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+def _read_cache(cache_path: Path, key: str) -> List[Box] | None:
+    try:
+        with cache_path.open(encoding="utf-8") as fp:
+            data = json.load(fp)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != key:
+        return None
+    try:
+        return [tuple(int(v) for v in box) for box in data["tiles"]]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _write_cache(cache_path: Path, key: str, tiles: List[Box]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as fp:
+            json.dump({"key": key, "tiles": [list(b) for b in tiles]}, fp)
+        os.replace(tmp, cache_path)
+    except OSError:
+        log.warning(f"Could not write tile geometry cache {cache_path}")
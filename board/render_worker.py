@@ -0,0 +1,155 @@
+"""Board rendering in a separate process.
+
+The worker keeps the base image, tile geometry and one incremental renderer
+per guild warm in its own memory, so OpenCV work never holds the bot
+process's GIL. Requests carry a compact snapshot of the teams (name,
+position, colour, blacklist) over a pipe and get PNG bytes back. A worker
+that dies or stops answering is replaced and the request retried once.
+"""
+import atexit
+import multiprocessing
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Tuple
+
+from util.logger import log
+
+CompactTeam = Tuple[str, int, int, Tuple[int, ...]]
+
+
+class RenderWorkerError(RuntimeError):
+    pass
+
+
+@dataclass(slots=True, frozen=True)
+class _MarkerTeam:
+    """The fields of ``Team`` that the renderer reads."""
+
+    name: str
+    position: int
+    color: int
+    blacklist_tiles: Tuple[int, ...]
+
+
+def compact_teams(teams: Iterable) -> Tuple[CompactTeam, ...]:
+    return tuple(
+        (t.name, int(t.position), int(t.color), tuple(int(b) for b in t.blacklist_tiles))
+        for t in teams
+    )
+
+
+class RenderWorker:
+    def __init__(
+        self,
+        background: str | Path,
+        base: str | Path,
+        geometry_cache: str | Path,
+        timeout: float = 30.0,
+    ):
+        self._args = (str(background), str(base), str(geometry_cache))
+        self.timeout = timeout
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._spawned = False
+
+    def render(self, key, teams: Iterable) -> bytes:
+        """PNG of ``teams`` rendered on the worker's renderer for ``key``."""
+        request = (key, compact_teams(teams))
+        with self._lock:
+            try:
+                return self._request(request)
+            except (EOFError, OSError, RenderWorkerError) as e:
+                log.warning("Render worker failed (%s); restarting", e)
+                self._stop()
+                return self._request(request)
+
+    def ensure_started(self) -> None:
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                self._start()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.send(None)
+                except OSError:
+                    pass
+            self._stop()
+
+    def _request(self, request) -> bytes:
+        if self._process is None or not self._process.is_alive():
+            self._start()
+        self._conn.send(request)
+        if not self._conn.poll(self.timeout):
+            raise RenderWorkerError(f"no reply within {self.timeout}s")
+        ok, payload = self._conn.recv()
+        if not ok:
+            # The worker is fine; the render itself failed.
+            raise ValueError(payload)
+        return payload
+
+    def _start(self) -> None:
+        if self._spawned:
+            self.restarts += 1
+        self._spawned = True
+        self._stop()
+        parent, child = self._ctx.Pipe()
+        self._process = self._ctx.Process(
+            target=_serve, args=(child, *self._args), name="board-render", daemon=True
+        )
+        log.info("Starting render worker process")
+        self._process.start()
+        child.close()
+        self._conn = parent
+
+    def _stop(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            self._process.join(timeout=1)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+            self._process = None
+
+
+def start_render_worker(background, base, geometry_cache, timeout: float = 30.0) -> RenderWorker:
+    worker = RenderWorker(background, base, geometry_cache, timeout=timeout)
+    atexit.register(worker.close)
+    return worker
+
+
+def _serve(conn, background: str, base: str, geometry_cache: str) -> None:
+    from board.geometry_cache import get_tile_geometry
+    from board.visualize import IncrementalBoardRenderer, load_board_image
+
+    tiles = get_tile_geometry(background, base, geometry_cache)
+    base_image = load_board_image(base)
+    renderers = {}
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        key, teams = request
+        try:
+            current = get_tile_geometry(background, base, geometry_cache)
+            if current is not tiles:
+                # The board art changed; start every guild from the new base.
+                tiles, base_image, renderers = current, load_board_image(base), {}
+            renderer = renderers.get(key)
+            if renderer is None:
+                renderer = renderers[key] = IncrementalBoardRenderer(base_image, tiles)
+            png = renderer.render_png([_MarkerTeam(*team) for team in teams])
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+        else:
+            conn.send((True, png))
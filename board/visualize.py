@@ -1,5 +1,6 @@
 from util.logger import log
 import cv2
+import numpy as np
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -10,6 +11,20 @@ def _int_to_bgr(col_int: int) -> Tuple[int, int, int]:
     return (col_int & 0xFF, (col_int >> 8) & 0xFF, (col_int >> 16) & 0xFF)
 
 
+def load_board_image(board_path: str | Path) -> np.ndarray:
+    board = cv2.imread(str(board_path))
+    if board is None:
+        raise FileNotFoundError(board_path)
+    return board
+
+
+def encode_png(board: np.ndarray) -> bytes:
+    ok, buf = cv2.imencode(".png", board)
+    if not ok:
+        raise ValueError("PNG encoding failed")
+    return buf.tobytes()
+
+
 def paint_team_circles(
     board_path: str | Path,
     tiles: List[Tuple[int, int, int, int]],
@@ -19,54 +34,157 @@ def paint_team_circles(
     pad: int = 10,
     shift: int = 10,
 ) -> None:
-    board = cv2.imread(str(board_path))
-    if board is None:
-        raise FileNotFoundError(board_path)
+    board = render_board(
+        load_board_image(board_path), tiles, teams, radius=radius, pad=pad, shift=shift
+    )
+    cv2.imwrite(out_path, board)
+    log.info(f"Saved board overlay → {out_path}")
 
-    tile_to_teams: Dict[int, List[Tuple[str, Tuple[int, int, int]]]] = {}
-    tile_to_blacklists: Dict[int, List[Tuple[int, int, int]]] = {}
 
-    for team in teams:
-        bgr = _int_to_bgr(team.color)
-        tile_to_teams.setdefault(int(team.position), []).append((team.name, bgr))
-        for tile_id in team.blacklist_tiles:
-            tile_to_blacklists.setdefault(int(tile_id), []).append(bgr)
+def render_board(
+    base: np.ndarray,
+    tiles: List[Tuple[int, int, int, int]],
+    teams: List[Team],
+    radius: int = 10,
+    pad: int = 10,
+    shift: int = 10,
+) -> np.ndarray:
+    """Paint team circles and blacklist crosses onto a copy of ``base``."""
+    board = base.copy()
+    tile_to_teams, tile_to_blacklists = _group_markers(teams)
 
     for idx, team_list in tile_to_teams.items():
         if idx >= len(tiles):
-            print(f"⚠  Tile index {idx} not in tiles list - skipped")
+            _warn_missing_tile(idx)
             continue
+        _paint_circles(board, tiles[idx], team_list, radius, pad, shift)
 
-        x, y, w, h = tiles[idx]
-        base_cx = x + w - pad - radius
-        cy = y + h - pad - radius
-
-        for k, (_, bgr) in enumerate(team_list):
-            cx = base_cx - k * shift
-            if cx - radius < x + pad:
-                cx = x + pad + radius
-
-            cv2.circle(
-                board,
-                (cx, cy),
-                radius + 2,
-                (255, 255, 255),
-                thickness=-1,
-                lineType=cv2.LINE_AA,
+    _paint_blacklist_crosses(board, tiles, tile_to_blacklists, pad)
+    return board
+
+
+class IncrementalBoardRenderer:
+    """Keeps the last rendered frame and only repaints tiles whose markers changed.
+
+    All markers are drawn inside their tile's box, so a changed tile is
+    restored from the pristine base and repainted without touching the rest
+    of the frame. The PNG encoding is reused while nothing changed.
+    """
+
+    def __init__(
+        self,
+        base: np.ndarray,
+        tiles: List[Tuple[int, int, int, int]],
+        radius: int = 10,
+        pad: int = 10,
+        shift: int = 10,
+    ):
+        self.base = base
+        self.tiles = tiles
+        self.radius = radius
+        self.pad = pad
+        self.shift = shift
+        self.frame = base.copy()
+        self.last_dirty: List[int] = []
+        self._markers: Dict[int, tuple] = {}
+        self._png: bytes | None = None
+
+    def render(self, teams: List[Team]) -> np.ndarray:
+        """Bring the frame up to date with ``teams`` and return it (do not mutate)."""
+        tile_to_teams, tile_to_blacklists = _group_markers(teams)
+        markers = {
+            idx: (
+                tuple(tile_to_teams.get(idx, ())),
+                tuple(tile_to_blacklists.get(idx, ())),
             )
-            cv2.circle(
-                board,
-                (cx, cy),
-                radius,
-                bgr,
-                thickness=-1,
-                lineType=cv2.LINE_AA,
+            for idx in tile_to_teams.keys() | tile_to_blacklists.keys()
+        }
+
+        dirty = sorted(
+            idx
+            for idx in markers.keys() | self._markers.keys()
+            if markers.get(idx) != self._markers.get(idx)
+        )
+        for idx in dirty:
+            if idx >= len(self.tiles):
+                if idx in tile_to_teams:
+                    _warn_missing_tile(idx)
+                continue
+            x, y, w, h = self.tiles[idx]
+            self.frame[y : y + h, x : x + w] = self.base[y : y + h, x : x + w]
+            team_list, colors = markers.get(idx, ((), ()))
+            _paint_circles(
+                self.frame, self.tiles[idx], team_list, self.radius, self.pad, self.shift
             )
+            _paint_blacklist_crosses(self.frame, self.tiles, {idx: colors}, self.pad)
 
-    _paint_blacklist_crosses(board, tiles, tile_to_blacklists, pad)
+        self._markers = markers
+        self.last_dirty = dirty
+        if dirty:
+            self._png = None
+        return self.frame
 
-    cv2.imwrite(out_path, board)
-    log.info(f"Saved board overlay → {out_path}")
+    def render_png(self, teams: List[Team]) -> bytes:
+        self.render(teams)
+        if self._png is None:
+            self._png = encode_png(self.frame)
+        return self._png
+
+
+def _group_markers(
+    teams: List[Team],
+) -> tuple[
+    Dict[int, List[Tuple[str, Tuple[int, int, int]]]],
+    Dict[int, List[Tuple[int, int, int]]],
+]:
+    tile_to_teams: Dict[int, List[Tuple[str, Tuple[int, int, int]]]] = {}
+    tile_to_blacklists: Dict[int, List[Tuple[int, int, int]]] = {}
+
+    for team in teams:
+        bgr = _int_to_bgr(team.color)
+        tile_to_teams.setdefault(int(team.position), []).append((team.name, bgr))
+        for tile_id in team.blacklist_tiles:
+            tile_to_blacklists.setdefault(int(tile_id), []).append(bgr)
+    return tile_to_teams, tile_to_blacklists
+
+
+def _paint_circles(
+    board,
+    tile: Tuple[int, int, int, int],
+    team_list,
+    radius: int,
+    pad: int,
+    shift: int,
+) -> None:
+    x, y, w, h = tile
+    base_cx = x + w - pad - radius
+    cy = y + h - pad - radius
+
+    for k, (_, bgr) in enumerate(team_list):
+        cx = base_cx - k * shift
+        if cx - radius < x + pad:
+            cx = x + pad + radius
+
+        cv2.circle(
+            board,
+            (cx, cy),
+            radius + 2,
+            (255, 255, 255),
+            thickness=-1,
+            lineType=cv2.LINE_AA,
+        )
+        cv2.circle(
+            board,
+            (cx, cy),
+            radius,
+            bgr,
+            thickness=-1,
+            lineType=cv2.LINE_AA,
+        )
+
+
+def _warn_missing_tile(idx: int) -> None:
+    log.warning("Tile index %s not in tiles list - skipped", idx)
 
 
 def _paint_blacklist_crosses(
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+# Imported first so the startup report covers every import below.
+from util import startup_timer
+
+import asyncio
 import os
+import time
 
 import discord
 from discord import app_commands
@@ -9,26 +14,50 @@ from commands.proofs_command import proofs_command
 from commands.roll_command import roll_dice_command
 from commands.tile_info_command import info_command
 from commands.blacklist_commands import blacklist_command, change_blacklist_command
-from config import DISCORD_TOKEN
-from db.meta_table import get_channel_ids, set_meta
+from config import BOOTSTRAP_CONCURRENCY, DISCORD_TOKEN
+from db.client import adopt_legacy_state
+from db.meta_table import get_channel_ids, set_meta_many
+from db.migrations import run_migrations
+from commands.command_sync import sync_commands_command, sync_commands_if_changed
 from commands.race_control import start_tile_race_command
+from commands.stats_command import bot_stats_command
 from commands.race_gate import ensure_tile_race_live
 from commands.game_commands import (
     complete_command,
     post_pet_proof_command,
     post_command,
 )
-from game_state import update_game_board
+from game_state import request_board_update, wait_board_refresh, warm_up_rendering
 from commands.member_commands import add_member_command, remove_member_command
 from commands.team_commands import create_team_command, delete_team_command
+from util.executors import run_db, run_render
+from util import metrics
+from util.guild_context import current_guild_id, use_guild
 from util.logger import log
 
+startup_timer.mark("imports")
+
 intents = discord.Intents.default()
 if os.getenv("ENABLE_MEMBERS_INTENT") == "1":
     intents.members = True
 
-bot = discord.Client(intents=intents)
-cmds = app_commands.CommandTree(bot)
+
+class GuildScopedCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, inter: discord.Interaction) -> bool:
+        # Runs in the interaction's own task, ahead of the command callback,
+        # so everything the command does is scoped to this guild's state.
+        current_guild_id.set(inter.guild_id)
+        if inter.type is discord.InteractionType.application_command:
+            metrics.start_command((inter.data or {}).get("name", "unknown"))
+        return True
+
+    async def on_error(self, inter: discord.Interaction, error: app_commands.AppCommandError) -> None:
+        metrics.finish_command(failed=True)
+        await super().on_error(inter, error)
+
+
+bot = discord.Client(intents=intents, http_trace=metrics.discord_http_trace())
+cmds = GuildScopedCommandTree(bot)
 
 
 @cmds.command(
@@ -90,6 +119,21 @@ async def start_tile_race_cmd(inter: discord.Interaction):
     return await start_tile_race_command(inter)
 
 
+@cmds.command(
+    name="sync-commands",
+    description="Push the slash commands to Discord even if they look unchanged",
+)
+@app_commands.default_permissions(administrator=True)
+async def sync_commands_cmd(inter: discord.Interaction):
+    return await sync_commands_command(inter, cmds)
+
+
+@cmds.command(name="bot-stats", description="Show command, board and Discord API latencies")
+@app_commands.default_permissions(administrator=True)
+async def bot_stats_cmd(inter: discord.Interaction):
+    return await bot_stats_command(inter)
+
+
 @cmds.command(name="roll", description="Roll the dice for your team")
 async def roll_cmd(inter: discord.Interaction):
     if not await ensure_tile_race_live(inter):
@@ -163,6 +207,8 @@ async def change_blacklist_cmd(
     return await change_blacklist_command(inter, old_tile_nr, new_tile_nr)
 
 
+startup_timer.mark("command tree")
+
 DESIRED = {
     "category": "╔═══Tile race 2026═══╗",
     "board": "tr-board",
@@ -171,57 +217,128 @@ DESIRED = {
 }
 
 
+# Guilds whose channels have been verified; reconnects skip them.
+_bootstrapped: set[int] = set()
+_connected_at: float | None = None
+_warm_up: asyncio.Future | None = None
+
+
+@bot.event
+async def on_app_command_completion(inter: discord.Interaction, command) -> None:
+    # Dispatched from the interaction's task, so its command timing carries over.
+    metrics.finish_command()
+
+
+@bot.event
+async def on_connect():
+    global _connected_at
+    if _connected_at is None:
+        _connected_at = time.monotonic()
+        startup_timer.mark("gateway connect")
+
+
+def _log_warm_up_failure(fut: asyncio.Future) -> None:
+    if not fut.cancelled() and fut.exception() is not None:
+        log.error("Rendering warm-up failed", exc_info=fut.exception())
+
+
 @bot.event
 async def on_ready():
-    guilds = [g async for g in bot.fetch_guilds(limit=None)]
-    for g in guilds:
-        await ensure_tile_race_channels(g)
+    global _warm_up
+    pending = [g for g in bot.guilds if g.id not in _bootstrapped]
+    if not pending:
+        log.info("Reconnected as %s; all guilds already bootstrapped", bot.user)
+        return
+
+    first_ready = _warm_up is None
+    if first_ready:
+        startup_timer.mark("gateway ready")
+        # OpenCV/NumPy load in the background; commands are served meanwhile.
+        _warm_up = asyncio.ensure_future(run_render(warm_up_rendering))
+        _warm_up.add_done_callback(_log_warm_up_failure)
+        # Before any guild partition is bootstrapped, and with every guild known.
+        await run_db(adopt_legacy_state, [g.id for g in bot.guilds])
+    await bootstrap_guilds(pending)
+    if first_ready:
+        startup_timer.mark("guild bootstrap")
 
     log.info("Logged in as %s (ID %s)", bot.user, bot.user.id)
     try:
-        await cmds.sync()
-        log.info("Commands synced globally (may take up to 1 h)")
+        await sync_commands_if_changed(cmds)
     except Exception:
         log.exception("Slash command sync failed")
+    if _connected_at is not None:
+        log.info(
+            "Serving commands %.2fs after connect (%d guilds bootstrapped)",
+            time.monotonic() - _connected_at,
+            len(_bootstrapped),
+        )
+    if first_ready:
+        startup_timer.mark("command sync")
+        log.info(startup_timer.report())
+
+
+async def bootstrap_guilds(guilds, concurrency: int = BOOTSTRAP_CONCURRENCY) -> None:
+    """Set up every guild's channels and board, at most ``concurrency`` at once."""
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(guild: discord.Guild):
+        async with limit:
+            with use_guild(guild.id):
+                await run_db(run_migrations)
+                await ensure_tile_race_channels(guild)
+            _bootstrapped.add(guild.id)
+
+    results = await asyncio.gather(*(one(g) for g in guilds), return_exceptions=True)
+    for guild, result in zip(guilds, results):
+        if isinstance(result, Exception):
+            log.error("Bootstrap failed for guild %s", guild.id, exc_info=result)
 
 
 async def ensure_tile_race_channels(guild: discord.Guild):
-    ids = get_channel_ids()
+    ids = await run_db(get_channel_ids)
 
     cat_id = ids.get("category")
-    category = await _fetch_channel_or_none(guild, cat_id)
+    category = await _channel_or_none(guild, cat_id)
 
     if category is None:
         category = await guild.create_category(DESIRED["category"])
     elif category.name != DESIRED["category"]:
         await category.edit(name=DESIRED["category"])
 
-    set_meta("tr_category_id", category.id)
+    found = {"tr_category_id": category.id}
 
     async def need(name_key):
-        chan = await _fetch_channel_or_none(guild, ids.get(name_key))
+        chan = await _channel_or_none(guild, ids.get(name_key))
         if chan is None:
             chan = await guild.create_text_channel(
                 DESIRED[name_key],
                 category=category,
                 topic="OSRS Tile-Race" if name_key != "proofs" else "Screenshots only",
             )
-        set_meta(f"tr_{name_key}_id", chan.id)
+        found[f"tr_{name_key}_id"] = chan.id
         return chan
 
     await need("board")
     await need("proofs")
     await need("cmd")
 
-    await update_game_board(bot)
+    await run_db(set_meta_many, found)
+    # Through the guild's refresh scheduler: commands are already being
+    # served, and a direct render could overlap one of their refreshes.
+    request_board_update(bot)
+    await wait_board_refresh()
 
 
-async def _fetch_channel_or_none(
+async def _channel_or_none(
         guild: discord.Guild,
         channel_id: int | None,
 ):
+    """Gateway-cached channel, falling back to REST only on a cache miss."""
     if not channel_id:
         return None
+    if (chan := guild.get_channel(channel_id)) is not None:
+        return chan
     try:
         return await guild.fetch_channel(channel_id)
     except discord.NotFound:
@@ -232,4 +349,6 @@ if __name__ == "__main__":
     if not DISCORD_TOKEN:
         raise SystemExit("DISCORD_TOKEN missing in .env")
 
+    log.info("Schema version %s", run_migrations())
+    startup_timer.mark("db load + migrations")
     bot.run(DISCORD_TOKEN, reconnect=True)
@@ -1,15 +1,10 @@
-import asyncio
 import discord
 
 from commands.common import get_member, get_team
-from db.teams_table import (
-    add_blacklist_tile,
-    consume_blacklist_charge,
-    get_blacklist_charges,
-    replace_blacklist_tile,
-)
-from game_state import update_game_board
+from db.teams_table import spend_charge_on_blacklist_tile
+from game_state import request_board_update
 from services.tiles_service import get_tile
+from util.executors import run_db
 
 _BLACKLIST_FORBIDDEN_TILES = frozenset([0, *range(80, 91)])
 
@@ -25,16 +20,14 @@ async def blacklist_command(inter: discord.Interaction, tile_nr: int):
     if error:
         return await inter.followup.send(error, ephemeral=True)
 
-    remaining = consume_blacklist_charge(member.team_id)
-    if remaining is None:
-        charges = get_blacklist_charges(member.team_id)
-        return await inter.followup.send(
-            f"Your team has no blacklist charges left (`{charges}`).",
-            ephemeral=True,
-        )
+    result = await run_db(spend_charge_on_blacklist_tile, member.team_id, tile_nr)
+    if result is None:
+        return await _team_missing(inter)
+    applied, remaining, updated_tiles = result
+    if not applied:
+        return await _no_charges_left(inter, remaining)
 
-    updated_tiles = add_blacklist_tile(member.team_id, tile_nr) or []
-    asyncio.create_task(update_game_board(inter.client))
+    request_board_update(inter.client)
     return await inter.followup.send(
         f"🛑 Added tile `{tile_nr}` to blacklist. "
         f"Charges left: `{remaining}`. "
@@ -80,16 +73,21 @@ async def change_blacklist_command(
     if error:
         return await inter.followup.send(error, ephemeral=True)
 
-    remaining = consume_blacklist_charge(member.team_id)
-    if remaining is None:
-        charges = get_blacklist_charges(member.team_id)
+    result = await run_db(
+        spend_charge_on_blacklist_tile, member.team_id, new_tile_nr, old_tile_nr
+    )
+    if result is None:
+        return await _team_missing(inter)
+    applied, remaining, updated_tiles = result
+    if not applied and old_tile_nr not in updated_tiles:
         return await inter.followup.send(
-            f"Your team has no blacklist charges left (`{charges}`).",
+            f"Tile `{old_tile_nr}` is not currently blacklisted.",
             ephemeral=True,
         )
+    if not applied:
+        return await _no_charges_left(inter, remaining)
 
-    updated_tiles = replace_blacklist_tile(member.team_id, old_tile_nr, new_tile_nr) or []
-    asyncio.create_task(update_game_board(inter.client))
+    request_board_update(inter.client)
     return await inter.followup.send(
         f"🔁 Changed blacklist tile `{old_tile_nr}` -> `{new_tile_nr}`. "
         f"Charges left: `{remaining}`. "
@@ -98,6 +96,19 @@ async def change_blacklist_command(
     )
 
 
+async def _no_charges_left(inter: discord.Interaction, charges: int):
+    return await inter.followup.send(
+        f"Your team has no blacklist charges left (`{charges}`).",
+        ephemeral=True,
+    )
+
+
+async def _team_missing(inter: discord.Interaction):
+    return await inter.followup.send(
+        "Internal error: your team is missing. Ping an admin.", ephemeral=True
+    )
+
+
 def _validate_new_blacklist_tile(
     team_position: int,
     tile_nr: int,
@@ -0,0 +1,49 @@
+import hashlib
+import json
+
+import discord
+from discord import app_commands
+
+from commands.common import ensure_admin
+from db.meta_table import COMMANDS_FINGERPRINT_KEY, get_meta, set_meta
+from util.executors import run_db
+from util.guild_context import use_guild
+from util.logger import log
+
+
+def command_tree_fingerprint(tree: app_commands.CommandTree) -> str:
+    """Hash of the global command payload Discord would receive from ``sync``."""
+    payload = sorted(
+        (cmd.to_dict(tree) for cmd in tree.get_commands()),
+        key=lambda d: (d.get("type", 1), d["name"]),
+    )
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+async def sync_commands_if_changed(tree: app_commands.CommandTree, force: bool = False) -> bool:
+    """Sync global commands only when the tree differs from the last sync.
+
+    The fingerprint is stored in the unscoped meta table since global
+    commands are shared by every guild. Returns whether a sync happened.
+    """
+    fingerprint = command_tree_fingerprint(tree)
+    with use_guild(None):
+        if not force and await run_db(get_meta, COMMANDS_FINGERPRINT_KEY) == fingerprint:
+            log.info("Command tree unchanged (%s); skipping sync", fingerprint[:12])
+            return False
+        await tree.sync()
+        await run_db(set_meta, COMMANDS_FINGERPRINT_KEY, fingerprint)
+    log.info("Commands synced globally (may take up to 1 h), fingerprint %s", fingerprint[:12])
+    return True
+
+
+async def sync_commands_command(inter: discord.Interaction, tree: app_commands.CommandTree):
+    if not await ensure_admin(inter):
+        return
+    await inter.response.defer(ephemeral=True, thinking=True)
+    await sync_commands_if_changed(tree, force=True)
+    await inter.followup.send(
+        f"Synced {len(tree.get_commands())} commands globally (may take up to 1 h to show).",
+        ephemeral=True,
+    )
@@ -1,9 +1,13 @@
+import discord
+
+from config import ADMIN_USER_IDS
 from services.member_service import fetch_member, Member
 from services.team_service import fetch_team_by_id, Team
+from util.executors import run_db
 
 
 async def get_member(inter) -> Member:
-    m = fetch_member(inter.user.id)
+    m = await run_db(fetch_member, inter.user.id)
     if not m:
         await inter.followup.send(
             "You're not on a team. Ask an admin to add you.", ephemeral=True
@@ -12,9 +16,25 @@ async def get_member(inter) -> Member:
 
 
 async def get_team(inter, member) -> Team:
-    t = fetch_team_by_id(member.team_id)
+    t = await run_db(fetch_team_by_id, member.team_id)
     if not t:
         await inter.followup.send(
             "Internal error: your team is missing. Ping an admin.", ephemeral=True
         )
     return t
+
+
+async def ensure_admin(inter: discord.Interaction) -> bool:
+    if not ADMIN_USER_IDS:
+        await inter.response.send_message(
+            "Bot misconfigured: set `ADMIN_USER_ID` in `.env`.",
+            ephemeral=True,
+        )
+        return False
+    if inter.user.id not in ADMIN_USER_IDS:
+        await inter.response.send_message(
+            "You cannot use this command.",
+            ephemeral=True,
+        )
+        return False
+    return True
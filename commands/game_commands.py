@@ -1,4 +1,3 @@
-import asyncio
 from datetime import datetime
 
 import discord
@@ -9,9 +8,10 @@ from db.pet_proofs_table import add_pet_proof, count_pet_proofs_for_team
 from db.proofs_table import add_proof, list_proof_urls, list_proofs
 from db.teams_table import add_blacklist_charges
 from db.teams_table import clear_pending_flag
-from game_state import update_game_board
-from services.member_service import fetch_member
+from game_state import request_board_update
+from services.member_resolver import mention_for
 from services.team_service import fetch_team_by_id
+from util.executors import run_db
 
 PET_PROOF_BLACKLIST_CHARGE_CAP = 3
 
@@ -36,7 +36,8 @@ async def post_command(inter: discord.Interaction, proof: discord.Attachment):
             ephemeral=True,
         )
 
-    add_proof(
+    await run_db(
+        add_proof,
         team_id=member.team_id,
         tile=team.position,
         url=proof.url,
@@ -58,7 +59,7 @@ async def post_pet_proof_command(
 
     if not (member := await get_member(inter)):
         return
-    team = fetch_team_by_id(member.team_id)
+    team = await run_db(fetch_team_by_id, member.team_id)
     if team is None:
         return await inter.followup.send(
             "Internal error: your team is missing. Ping an admin.",
@@ -71,20 +72,21 @@ async def post_pet_proof_command(
             ephemeral=True,
         )
 
-    if count_pet_proofs_for_team(member.team_id) >= PET_PROOF_BLACKLIST_CHARGE_CAP:
+    used = await run_db(count_pet_proofs_for_team, member.team_id)
+    if used >= PET_PROOF_BLACKLIST_CHARGE_CAP:
         return await inter.followup.send(
             f"Your team already used all `{PET_PROOF_BLACKLIST_CHARGE_CAP}` "
             "pet proof blacklist charges.",
             ephemeral=True,
         )
 
-    add_pet_proof(
+    charges = await run_db(
+        _record_pet_proof,
         team_id=member.team_id,
         url=proof.url,
         user_id=inter.user.id,
         user_name=inter.user.display_name,
     )
-    charges = add_blacklist_charges(member.team_id, 1)
     await send_pet_proof_embed(
         inter=inter,
         team_id=team.team_id,
@@ -115,7 +117,7 @@ async def complete_command(inter: discord.Interaction):
         )
         return
 
-    if not list_proof_urls(team_id=member.team_id, tile=team.position):
+    if not await run_db(list_proof_urls, team_id=member.team_id, tile=team.position):
         await inter.followup.send(
             "No proof uploaded for this tile yet. "
             "Use `/post` to upload a screenshot first.",
@@ -123,7 +125,7 @@ async def complete_command(inter: discord.Interaction):
         )
         return
 
-    clear_pending_flag(member.team_id)
+    await run_db(clear_pending_flag, member.team_id)
 
     await inter.followup.send(
         f"✅ **{inter.user.display_name}** marked **tile {team.position} "
@@ -131,7 +133,7 @@ async def complete_command(inter: discord.Interaction):
         ephemeral=True,
     )
 
-    asyncio.create_task(update_game_board(inter.client))
+    request_board_update(inter.client)
 
     await send_proof_embed(
         inter=inter,
@@ -145,16 +147,16 @@ async def send_proof_embed(
     team_id: str,
     tile_number: int,
 ):
-    proofs_channel_id = get_proofs_channel_id()
+    proofs_channel_id = await run_db(get_proofs_channel_id)
     channel = inter.guild.get_channel(proofs_channel_id)
     if channel is None:
         raise RuntimeError("Proofs channel not found")
 
-    proofs = list_proofs(team_id=team_id, tile=tile_number)
+    proofs = await run_db(list_proofs, team_id=team_id, tile=tile_number)
     if not proofs:
         return
 
-    team = fetch_team_by_id(team_id)
+    team = await run_db(fetch_team_by_id, team_id)
     role = inter.guild.get_role(team.role_id) if team else None
 
     embeds: list[discord.Embed] = []
@@ -168,13 +170,12 @@ async def send_proof_embed(
     embeds.append(info_embed)
 
     for i, proof in enumerate(proofs, start=1):
-        submitter = await inter.guild.fetch_member(proof["user_id"])
         embed = discord.Embed(
             title=f"(proof {i}/{len(proofs)})",
             timestamp=datetime.fromisoformat(proof["ts"]),
             color=team.color,
         )
-        embed.add_field(name="Submitted by", value=submitter.mention)
+        embed.add_field(name="Submitted by", value=mention_for(proof["user_id"]))
         embed.set_image(url=proof["url"])
         embeds.append(embed)
 
@@ -190,16 +191,15 @@ async def send_pet_proof_embed(
     submitter_id: int,
     blacklist_charges: int,
 ):
-    proofs_channel_id = get_proofs_channel_id()
+    proofs_channel_id = await run_db(get_proofs_channel_id)
     channel = inter.guild.get_channel(proofs_channel_id)
     if channel is None:
         raise RuntimeError("Proofs channel not found")
 
-    team = fetch_team_by_id(team_id)
+    team = await run_db(fetch_team_by_id, team_id)
     if team is None:
         return
     role = inter.guild.get_role(team.role_id)
-    submitter = await inter.guild.fetch_member(submitter_id)
 
     embed = discord.Embed(
         title="🐾 PET PROOF SUBMITTED 🐾",
@@ -207,7 +207,7 @@ async def send_pet_proof_embed(
         colour=team.color,
         timestamp=datetime.now(),
     )
-    embed.add_field(name="Submitted by", value=submitter.mention, inline=False)
+    embed.add_field(name="Submitted by", value=mention_for(submitter_id), inline=False)
     embed.add_field(
         name="Blacklist charges",
         value=f"`{blacklist_charges}`",
@@ -218,5 +218,10 @@ async def send_pet_proof_embed(
     await channel.send(embed=embed)
 
 
+def _record_pet_proof(team_id: str, url: str, user_id: int, user_name: str) -> int:
+    add_pet_proof(team_id=team_id, url=url, user_id=user_id, user_name=user_name)
+    return add_blacklist_charges(team_id, 1)
+
+
 def _is_supported_image(proof: discord.Attachment) -> bool:
     return proof.content_type in {"image/jpeg", "image/png"}
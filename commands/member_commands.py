@@ -2,6 +2,7 @@ import discord
 
 from services.member_service import add_member, fetch_team_members, remove_member
 from services.team_service import fetch_team_by_id
+from util.executors import run_db
 from util.utils import slugify
 
 
@@ -11,7 +12,7 @@ async def add_member_command(
     role: discord.Role,
 ):
     team_id = slugify(role.name)
-    team = fetch_team_by_id(team_id)
+    team = await run_db(fetch_team_by_id, team_id)
 
     if not team or team.role_id != role.id:
         return await inter.response.send_message(
@@ -19,10 +20,10 @@ async def add_member_command(
             ephemeral=True,
         )
 
-    other_members = fetch_team_members(team_id)
+    other_members = await run_db(fetch_team_members, team_id)
 
     try:
-        add_member(user.id, user.display_name, team_id)
+        await run_db(add_member, user.id, user.display_name, team_id)
     except ValueError as ve:
         return await inter.response.send_message(str(ve), ephemeral=True)
 
@@ -40,7 +41,7 @@ async def remove_member_command(
     role: discord.Role,
 ):
     try:
-        remove_member(user.id)
+        await run_db(remove_member, user.id)
     except ValueError as ve:
         return await inter.response.send_message(str(ve), ephemeral=True)
 
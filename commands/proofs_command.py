@@ -4,6 +4,8 @@ import discord
 
 from commands.common import get_member, get_team
 from db.proofs_table import list_proofs
+from services.member_resolver import mention_for
+from util.executors import run_db
 
 
 async def proofs_command(inter: discord.Interaction):
@@ -20,7 +22,7 @@ async def proofs_command(inter: discord.Interaction):
             ephemeral=True,
         )
 
-    if not (proofs := list_proofs(team_id=team.team_id, tile=team.position)):
+    if not (proofs := await run_db(list_proofs, team_id=team.team_id, tile=team.position)):
         return await inter.followup.send(
             "No proofs uploaded yet for your team's current tile",
             ephemeral=True,
@@ -29,13 +31,12 @@ async def proofs_command(inter: discord.Interaction):
     # build all embeds
     embeds: list[discord.Embed] = []
     for i, proof in enumerate(proofs, start=1):
-        submitter = await inter.guild.fetch_member(proof["user_id"])
         embed = discord.Embed(
             title=f"(proof {i}/{len(proofs)})",
             timestamp=datetime.fromisoformat(proof["ts"]),
             color=team.color,
         )
-        embed.add_field(name="Submitted by", value=submitter.mention)
+        embed.add_field(name="Submitted by", value=mention_for(proof["user_id"]))
         embed.set_image(url=proof["url"])
         embeds.append(embed)
 
@@ -7,20 +7,22 @@ from commands.common import get_member, get_team
 from db.rolls_table import log_roll
 from db.teams_table import increment_return_blacklist_grant_if_allowed
 from db.teams_table import update_team_position
-from game_state import update_game_board
-from services.member_service import fetch_member
-from services.team_service import (
-    fetch_team_by_id,
-)
+from game_state import request_board_update
+from services.movement_service import RETURN, Move, resolve_move
+from services.team_service import fetch_team_by_id
 from services.tiles_service import get_tile
+from util.executors import run_db
+from util.guild_context import current_partition
 
-team_locks: dict[str, asyncio.Lock] = {}
+# Keyed by (storage partition, slug): team slugs are only unique per guild.
+team_locks: dict[tuple[int | None, str], asyncio.Lock] = {}
 
 
 def get_team_lock(slug: str) -> asyncio.Lock:
-    lock = team_locks.get(slug)
+    key = (current_partition(), slug)
+    lock = team_locks.get(key)
     if lock is None:
-        lock = team_locks[slug] = asyncio.Lock()
+        lock = team_locks[key] = asyncio.Lock()
     return lock
 
 
@@ -47,7 +49,7 @@ async def roll_dice_command(inter: discord.Interaction):
             )
 
         die, old_pos, rolled_pos = _roll_die(team.position)
-        final_pos, moved_note = _apply_tile_effect(rolled_pos, member.team_id)
+        final_pos, moved_note = await run_db(_apply_tile_effect, rolled_pos, team.team_id)
         await _update_state(
             member.team_id, old_pos, final_pos, die, inter.user, inter.client
         )
@@ -64,81 +66,49 @@ def _roll_die(position):
 
 
 def _apply_tile_effect(rolled_pos: int, team_id: str) -> tuple[int, str]:
-    final_pos = rolled_pos
+    # Re-read under the roll lock: a /blacklist since the lookup still counts.
+    team = fetch_team_by_id(team_id)
+    transition = resolve_move(rolled_pos, team.blacklist_tiles if team else ())
     notes: list[str] = []
+    for move in transition.moves:
+        if move.kind == RETURN:
+            notes.append(_return_note(move.position, team_id))
+        else:
+            notes.append(_blacklist_note(move))
+    return transition.final, "".join(notes)
 
-    for _ in range(20):
-        redirected_pos, blacklist_note = _apply_blacklist_redirect(final_pos, team_id)
-        if redirected_pos != final_pos:
-            final_pos = redirected_pos
-            if blacklist_note:
-                notes.append(blacklist_note)
-            continue
-
-        effected_pos, effect_note = _apply_primary_tile_effect(final_pos, team_id)
-        if effected_pos != final_pos:
-            final_pos = effected_pos
-            if effect_note:
-                notes.append(effect_note)
-            continue
-        break
-
-    return final_pos, "".join(notes)
-
-
-def _apply_primary_tile_effect(rolled_pos: int, team_id: str) -> tuple[int, str]:
-    tile = get_tile(rolled_pos) or {}
-    if tile.get("type") == "RETURN":
-        return _apply_return_tile_effect(tile, rolled_pos, team_id)
-    return rolled_pos, ""
 
-
-def _apply_return_tile_effect(tile, rolled_pos: int, team_id: str) -> tuple[int, str]:
-    dest = tile.get("destination_id")
-    if dest is None:
-        return rolled_pos, ""
+def _return_note(dest: int, team_id: str) -> str:
     charges, granted = increment_return_blacklist_grant_if_allowed(team_id)
     if granted:
-        return dest, f" ⏮️ Returned to {dest}. +1 blacklist charge ({charges})."
-    return dest, (
+        return f" ⏮️ Returned to {dest}. +1 blacklist charge ({charges})."
+    return (
         f" ⏮️ Returned to {dest}. Goback charge cap reached "
         f"(`{charges}` charges)."
     )
 
 
-def _apply_blacklist_redirect(position: int, team_id: str) -> tuple[int, str]:
-    team = fetch_team_by_id(team_id)
-    if team is None or not team.blacklist_tiles:
-        return position, ""
-    if position >= 90:
-        return position, ""
-
-    steps = 0
-    final_pos = position
-    blacklisted = set(team.blacklist_tiles)
-    while final_pos in blacklisted and final_pos < 90:
-        final_pos = min(final_pos + 1, 90)
-        steps += 1
+def _blacklist_note(move: Move) -> str:
+    if move.skipped == 1:
+        return f" 🚫 Blacklist hit, moved to {move.position}."
+    return f" 🚫 Blacklist chain skipped {move.skipped} tiles to {move.position}."
 
-    if steps == 0:
-        return final_pos, ""
-    if steps == 1:
-        return final_pos, f" 🚫 Blacklist hit, moved to {final_pos}."
-    return final_pos, f" 🚫 Blacklist chain skipped {steps} tiles to {final_pos}."
 
+async def _update_state(team_id, old_pos, final_pos, die, user, bot):
+    await run_db(_persist_roll, team_id, old_pos, final_pos, die, user.id, user.display_name)
+    request_board_update(bot)
 
 
-async def _update_state(team_id, old_pos, final_pos, die, user, bot):
+def _persist_roll(team_id, old_pos, final_pos, die, user_id, user_name):
     update_team_position(final_pos, team_id)
     log_roll(
         team_id=team_id,
-        user_id=user.id,
-        user_name=user.display_name,
+        user_id=user_id,
+        user_name=user_name,
         die=die,
         pos_before=old_pos,
         pos_after=final_pos,
     )
-    asyncio.create_task(update_game_board(bot))
 
 
 async def _send_roll_embed(inter, team, tile_info, die, moved_note):
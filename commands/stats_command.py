@@ -0,0 +1,34 @@
+import io
+
+import discord
+
+from commands.common import ensure_admin
+from game_state import board_refresh_stats, board_upload_stats
+from util import metrics
+
+# Leaves room for the code fence inside Discord's 2000 character limit.
+_MAX_SUMMARY = 1900
+
+
+def bot_stats_text() -> str:
+    lines = [
+        metrics.summary(("command_", "board_", "discord_rest_")) or "No commands timed yet.",
+        "",
+        f"board uploads {board_upload_stats()}",
+        f"board refresh {board_refresh_stats()}",
+    ]
+    text = "\n".join(lines)
+    if len(text) > _MAX_SUMMARY:
+        text = text[: _MAX_SUMMARY - 2] + "\n…"
+    return text
+
+
+async def bot_stats_command(inter: discord.Interaction):
+    if not await ensure_admin(inter):
+        return
+    exposition = metrics.render_text().encode("utf-8")
+    await inter.response.send_message(
+        f"```\n{bot_stats_text()}\n```",
+        file=discord.File(io.BytesIO(exposition), filename="metrics.txt"),
+        ephemeral=True,
+    )
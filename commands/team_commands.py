@@ -1,8 +1,8 @@
-import asyncio
 import discord
 
-from game_state import update_game_board
+from game_state import request_board_update
 from services.team_service import create_team, remove_team
+from util.executors import run_db
 from util.logger import log
 from util.utils import slugify
 
@@ -22,14 +22,14 @@ async def create_team_command(inter, name: str):
     )
 
     try:
-        create_team(name, team_id, role.id, role_colour)
+        await run_db(create_team, name, team_id, role.id, role_colour)
     except ValueError as ve:
         await role.delete()
         log.error(str(ve))
         return await inter.followup.send(str(ve), ephemeral=True)
 
     log.info(f"successfully created the team: {team_id}")
-    asyncio.create_task(update_game_board(inter.client))
+    request_board_update(inter.client)
 
     return await inter.followup.send(
         f"Team **{role.mention}** created!",
@@ -44,13 +44,13 @@ async def delete_team_command(inter, role: discord.Role):
     team_id = slugify(role.name)
 
     try:
-        remove_team(team_id)
+        await run_db(remove_team, team_id)
     except ValueError as ve:
         return await inter.followup.send(str(ve), ephemeral=True)
 
     await role.delete(reason="Remove team")
 
     log.info(f"successfully removed the team: {team_id}")
-    asyncio.create_task(update_game_board(inter.client))
+    request_board_update(inter.client)
 
     return await inter.followup.send("Team removed!", ephemeral=True)
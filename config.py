@@ -12,6 +12,31 @@ load_dotenv(dotenv_path=Path(__file__).with_suffix(".env").resolve().parent / ".
 
 DISCORD_TOKEN: str | None = os.getenv("DISCORD_TOKEN")
 DB_PATH: Path = Path(os.getenv("DB_PATH", "assets/state.json"))
+# "tinydb" (JSON file at DB_PATH) or "sqlite" (file at SQLITE_PATH).
+DB_BACKEND: str = os.getenv("DB_BACKEND", "tinydb").strip().lower()
+SQLITE_PATH: Path = Path(os.getenv("SQLITE_PATH", str(DB_PATH.with_suffix(".sqlite3"))))
+# TinyDB only: keep state in memory and flush to DB_PATH in batches.
+DB_WRITE_BEHIND: bool = os.getenv("DB_WRITE_BEHIND") == "1"
+DB_FLUSH_INTERVAL: float = float(os.getenv("DB_FLUSH_INTERVAL", "1.0"))
+DB_FLUSH_EVERY: int = int(os.getenv("DB_FLUSH_EVERY", "50"))
+# Each guild gets its own state file next to DB_PATH/SQLITE_PATH
+# (state.<guild_id>.json); this guild keeps using the unscoped files, which
+# is where a pre-partitioning deployment's data lives. Without it, a bot in
+# a single guild copies that data into the guild's partition on startup.
+DB_DEFAULT_GUILD_ID: int | None = (
+    int(os.environ["DB_DEFAULT_GUILD_ID"]) if os.getenv("DB_DEFAULT_GUILD_ID") else None
+)
+# How many guilds set up their channels and board at the same time on startup.
+BOOTSTRAP_CONCURRENCY: int = int(os.getenv("BOOTSTRAP_CONCURRENCY", "4"))
+# Size of the thread pool used for OpenCV decode/draw/encode work.
+RENDER_THREADS: int = int(os.getenv("RENDER_THREADS", "2"))
+# Render boards in a separate worker process instead of the render threads.
+RENDER_WORKER: bool = os.getenv("RENDER_WORKER") == "1"
+RENDER_WORKER_TIMEOUT: float = float(os.getenv("RENDER_WORKER_TIMEOUT", "30"))
+# In-process latency histograms (see /bot-stats); "0" turns recording off.
+METRICS_ENABLED: bool = os.getenv("METRICS", "1") != "0"
+# Seconds to wait before redrawing the board so bursts of commands share a render.
+BOARD_REFRESH_DEBOUNCE: float = float(os.getenv("BOARD_REFRESH_DEBOUNCE", "0.5"))
 
 
 def _parse_admin_user_ids() -> frozenset[int]:
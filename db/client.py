@@ -1,6 +1,200 @@
+import atexit
+import copy
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Sequence
 from tinydb import Query, TinyDB
-from config import DB_PATH
+from config import (
+    DB_BACKEND,
+    DB_DEFAULT_GUILD_ID,
+    DB_FLUSH_EVERY,
+    DB_FLUSH_INTERVAL,
+    DB_PATH,
+    DB_WRITE_BEHIND,
+    SQLITE_PATH,
+)
+from db.indexes import IndexedTable
+from db.partitions import Partitioned
+from util.guild_context import current_partition
+from util.logger import log
 
-db = TinyDB(Path(DB_PATH))
+if DB_BACKEND not in ("tinydb", "sqlite"):
+    raise ValueError(f"Unknown DB_BACKEND {DB_BACKEND!r} (expected tinydb or sqlite)")
+
+
+def guild_db_path(path: Path, partition: int | None) -> Path:
+    """``state.json`` for the default partition, ``state.<guild_id>.json`` otherwise."""
+    if partition is None:
+        return path
+    return path.with_name(f"{path.stem}.{partition}{path.suffix}")
+
+
+def _open_database(partition: int | None):
+    if DB_BACKEND == "sqlite":
+        from db.sqlite_client import SqliteDatabase
+
+        return SqliteDatabase(guild_db_path(SQLITE_PATH, partition))
+    path = guild_db_path(Path(DB_PATH), partition)
+    if DB_WRITE_BEHIND:
+        from db.storage import open_write_behind_db
+
+        return open_write_behind_db(
+            path, flush_interval=DB_FLUSH_INTERVAL, flush_every=DB_FLUSH_EVERY
+        )
+    return TinyDB(path)
+
+
+# One database per guild; ``db.table(...)`` etc. go to the current guild's.
+db = Partitioned(_open_database)
 Q = Query()
+
+
+# Every indexed_table(), so a failed batch can drop the mirrors it touched.
+_indexed_tables: list[Partitioned[IndexedTable]] = []
+
+
+def indexed_table(name: str, *indexes, latest=None) -> Partitioned[IndexedTable]:
+    """An ``IndexedTable`` over ``name`` with its own mirror per guild."""
+    table = Partitioned(
+        lambda partition: IndexedTable(
+            db.for_guild(partition).table(name), *indexes, latest=latest
+        )
+    )
+    _indexed_tables.append(table)
+    return table
+
+
+# Meta key in the unscoped database naming the guild that took over its data.
+LEGACY_ADOPTED_KEY = "tr_legacy_adopted_by"
+
+
+def adopt_legacy_state(guild_ids: Sequence[int]) -> int | None:
+    """Copy the unscoped database into the one connected guild, at most once.
+
+    Deployments from before per-guild storage keep their teams in the
+    unscoped files. With ``DB_DEFAULT_GUILD_ID`` set, that guild uses them in
+    place and nothing is copied. Otherwise, when exactly one guild is
+    connected and its partition holds no teams yet, it takes over a copy
+    (doc ids may be renumbered) and the unscoped database records the guild
+    so no other guild adopts the data too. With several guilds connected the
+    owner is ambiguous, so nothing is copied and an error is logged.
+
+    Runs once per process on startup, before any guild is bootstrapped.
+    Returns the adopting guild id, if any.
+    """
+    if DB_DEFAULT_GUILD_ID is not None:
+        return None
+    legacy = db.for_guild(None)
+    meta = legacy.table("meta")
+    if not len(legacy.table("teams")) or meta.get(Q.key == LEGACY_ADOPTED_KEY):
+        return None
+    if len(guild_ids) != 1:
+        log.error(
+            "The unscoped database holds teams from before per-guild storage but "
+            "%d guilds are connected; set DB_DEFAULT_GUILD_ID to the guild that owns them",
+            len(guild_ids),
+        )
+        return None
+    (guild_id,) = guild_ids
+    database = db.for_guild(guild_id)
+    if len(database.table("teams")):
+        log.error(
+            "Guild %s already has teams; not adopting the unscoped database "
+            "(set DB_DEFAULT_GUILD_ID=%s to use it in place)",
+            guild_id,
+            guild_id,
+        )
+        return None
+    for name in legacy.tables():
+        table = database.table(name)
+        table.truncate()
+        if rows := legacy.table(name).all():
+            table.insert_multiple(rows)
+    meta.insert({"key": LEGACY_ADOPTED_KEY, "value": guild_id})
+    _invalidate_mirrors(None)
+    _invalidate_mirrors(guild_id)
+    _flush(database)
+    _flush(legacy)
+    log.warning(
+        "Guild %s adopted the data in the unscoped database; set DB_DEFAULT_GUILD_ID=%s "
+        "to use it in place instead",
+        guild_id,
+        guild_id,
+    )
+    return guild_id
+
+
+def flush_db() -> None:
+    """Push buffered writes to disk (no-op for storages that write through)."""
+    for database in db.instances():
+        _flush(database)
+
+
+def _flush(database) -> None:
+    flush = getattr(database, "flush", None)
+    if flush is not None:
+        flush()
+
+
+@contextmanager
+def batched_writes():
+    """Apply every write made inside the block to storage in a single write.
+
+    SQLite runs the block in one transaction. For TinyDB the storage's
+    read/write are redirected to an in-memory copy and the final state is
+    written (and, for write-behind storage, flushed) once on exit. Only the
+    current guild's database is batched.
+
+    If the block raises, nothing it wrote reaches storage on either backend
+    and the current guild's index mirrors are reloaded on next use.
+    """
+    database = db.current()
+    if DB_BACKEND == "sqlite":
+        try:
+            with database.transaction():
+                yield
+        except BaseException:
+            _invalidate_mirrors(current_partition())
+            raise
+        return
+
+    storage = database.storage
+    real_read, real_write = storage.read, storage.write
+    # TinyDB updates the documents it read in place. Write-behind storage
+    # hands out its live cache, so the batch works on a copy of it.
+    shared = DB_WRITE_BEHIND
+    pending: dict = {}
+
+    def read():
+        if "data" not in pending:
+            data = real_read()
+            pending["data"] = copy.deepcopy(data) if shared else data
+        return pending["data"]
+
+    def write(data):
+        pending["data"] = data
+        pending["dirty"] = True
+
+    storage.read, storage.write = read, write
+    try:
+        yield
+    except BaseException:
+        storage.read, storage.write = real_read, real_write
+        # TinyDB tables cache query results computed from the discarded data.
+        for name in database.tables():
+            database.table(name).clear_cache()
+        _invalidate_mirrors(current_partition())
+        raise
+    storage.read, storage.write = real_read, real_write
+    if pending.get("dirty"):
+        real_write(pending["data"])
+        _flush(database)
+
+
+def _invalidate_mirrors(partition: int | None) -> None:
+    for table in _indexed_tables:
+        if (mirror := table.existing(partition)) is not None:
+            mirror.invalidate()
+
+
+atexit.register(flush_db)
@@ -0,0 +1,276 @@
+"""In-process hash indexes over a table.
+
+``IndexedTable`` wraps a TinyDB (or SQLite) table, mirrors its documents in
+memory and keeps hash indexes on the declared field tuples in sync with
+every insert, update and remove made through the wrapper. Lookups on an
+indexed key are O(1) in the table size instead of a full scan. Reads the
+wrapper does not index are passed through to the underlying table.
+
+Reads report how many rows they touched to ``util.metrics.count_rows``: the
+index bucket for indexed lookups, the whole table for scans.
+
+With ``DB_INDEX_VERIFY=1`` every indexed lookup is cross-checked against a
+full scan and raises ``IndexMismatch`` on disagreement.
+"""
+import copy
+import os
+from functools import reduce
+from typing import Dict, Iterable, List, Tuple
+
+from tinydb import Query
+from tinydb.table import Document
+
+from util.metrics import count_rows
+
+_MISSING = object()
+_SCANS = frozenset({"all", "search", "get", "contains"})
+
+
+class IndexMismatch(AssertionError):
+    pass
+
+
+class IndexedTable:
+    verify: bool = os.getenv("DB_INDEX_VERIFY") == "1"
+
+    def __init__(
+        self,
+        table,
+        *indexes: Tuple[str, ...],
+        latest: Tuple[str, str] | None = None,
+    ):
+        self._table = table
+        self._specs: List[Tuple[str, ...]] = list(indexes)
+        self._latest_spec = latest
+        if latest is not None and (latest[0],) not in self._specs:
+            self._specs.append((latest[0],))
+        self._docs: Dict[int, dict] | None = None
+        self._indexes: Dict[Tuple[str, ...], Dict[tuple, Dict[int, None]]] = {}
+        self._latest: Dict[object, int] = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._table, name)
+        if name in _SCANS:
+            self._count_scan()
+        return attr
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    # -- indexed reads -----------------------------------------------------
+
+    def find(self, **fields) -> List[Document]:
+        """Documents whose ``fields`` equal the given values, in doc id order."""
+        spec, key = self._key_for(fields)
+        if key is None:
+            self._count_scan()
+            return self._table.search(_query(fields))
+        self._ensure_loaded()
+        bucket = self._indexes[spec].get(key, {})
+        count_rows(len(bucket))
+        rows = [self._copy(doc_id) for doc_id in sorted(bucket)]
+        if self.verify:
+            self._check(rows, self._table.search(_query(fields)), fields)
+        return rows
+
+    def find_one(self, **fields) -> Document | None:
+        spec, key = self._key_for(fields)
+        if key is None:
+            self._count_scan()
+            return self._table.get(_query(fields))
+        self._ensure_loaded()
+        bucket = self._indexes[spec].get(key)
+        count_rows(len(bucket) if bucket else 0)
+        row = self._copy(min(bucket)) if bucket else None
+        if self.verify:
+            self._check([row] if row else [], self._table.search(_query(fields))[:1], fields)
+        return row
+
+    def count(self, **fields) -> int:
+        spec, key = self._key_for(fields)
+        if key is None:
+            self._count_scan()
+            return len(self._table.search(_query(fields)))
+        self._ensure_loaded()
+        n = len(self._indexes[spec].get(key, ()))
+        if self.verify and n != len(self._table.search(_query(fields))):
+            raise IndexMismatch(f"{self.name}: count mismatch for {fields}")
+        return n
+
+    def latest(self, group_value) -> Document | None:
+        """Document with the greatest order field in the group (first one on ties)."""
+        if self._latest_spec is None:
+            raise TypeError(f"{self.name} has no latest index")
+        self._ensure_loaded()
+        doc_id = self._latest.get(_hashable(group_value))
+        row = self._copy(doc_id) if doc_id is not None else None
+        count_rows(1 if row else 0)
+        if self.verify:
+            group, order = self._latest_spec
+            rows = self._table.search(_query({group: group_value}))
+            expected = max(rows, key=lambda r: r[order]) if rows else None
+            self._check([row] if row else [], [expected] if expected else [], group_value)
+        return row
+
+    # -- writes ------------------------------------------------------------
+
+    def insert(self, document) -> int:
+        self._ensure_loaded()
+        doc_id = self._table.insert(document)
+        self._add(doc_id, copy.deepcopy(dict(document)))
+        return doc_id
+
+    def insert_multiple(self, documents: Iterable) -> List[int]:
+        self._ensure_loaded()
+        documents = list(documents)
+        ids = self._table.insert_multiple(documents)
+        for doc_id, doc in zip(ids, documents):
+            self._add(doc_id, copy.deepcopy(dict(doc)))
+        return ids
+
+    def update(self, fields, cond=None, doc_ids=None) -> List[int]:
+        self._ensure_loaded()
+        ids = self._table.update(fields, cond, doc_ids=doc_ids)
+        for doc_id in ids:
+            doc = self._drop(doc_id)
+            if doc is None:
+                continue
+            if callable(fields):
+                fields(doc)
+            else:
+                doc.update(copy.deepcopy(dict(fields)))
+            self._add(doc_id, doc)
+        return ids
+
+    def remove(self, cond=None, doc_ids=None) -> List[int]:
+        self._ensure_loaded()
+        ids = self._table.remove(cond, doc_ids=doc_ids)
+        for doc_id in ids:
+            self._drop(doc_id)
+        return ids
+
+    def truncate(self) -> None:
+        self._table.truncate()
+        self._reset({})
+
+    def upsert(self, document, cond=None) -> List[int]:
+        ids = self._table.upsert(document, cond)
+        self._docs = None
+        return ids
+
+    def update_multiple(self, updates) -> List[int]:
+        ids = self._table.update_multiple(updates)
+        self._docs = None
+        return ids
+
+    def invalidate(self) -> None:
+        """Drop the mirror; it is rebuilt from the table on next use."""
+        self._docs = None
+
+    # -- internals ---------------------------------------------------------
+
+    def _count_scan(self) -> None:
+        # The mirror's size stands in for the table's; until it is loaded
+        # the scan goes uncounted rather than paying for a second read.
+        if self._docs is not None:
+            count_rows(len(self._docs))
+
+    def _ensure_loaded(self) -> None:
+        if self._docs is None:
+            self._reset(
+                {doc.doc_id: copy.deepcopy(dict(doc)) for doc in self._table.all()}
+            )
+
+    def _reset(self, docs: Dict[int, dict]) -> None:
+        self._docs = {}
+        self._indexes = {spec: {} for spec in self._specs}
+        self._latest = {}
+        for doc_id in sorted(docs):
+            self._add(doc_id, docs[doc_id])
+
+    def _key_for(self, fields: dict) -> tuple:
+        names = tuple(fields)
+        for spec in self._specs:
+            if len(spec) == len(names) and set(spec) == set(names):
+                key = tuple(fields[f] for f in spec)
+                try:
+                    hash(key)
+                except TypeError:
+                    return spec, None
+                return spec, key
+        return None, None
+
+    def _add(self, doc_id: int, doc: dict) -> None:
+        self._docs[doc_id] = doc
+        for spec, index in self._indexes.items():
+            key = tuple(_hashable(doc.get(f, _MISSING)) for f in spec)
+            index.setdefault(key, {})[doc_id] = None
+        if self._latest_spec is not None:
+            group, order = self._latest_spec
+            g = _hashable(doc.get(group, _MISSING))
+            current = self._latest.get(g)
+            if order in doc and (
+                current is None or _before(doc_id, doc, current, self._docs[current], order)
+            ):
+                self._latest[g] = doc_id
+
+    def _drop(self, doc_id: int) -> dict | None:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return None
+        for spec, index in self._indexes.items():
+            key = tuple(_hashable(doc.get(f, _MISSING)) for f in spec)
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(doc_id, None)
+                if not bucket:
+                    del index[key]
+        if self._latest_spec is not None:
+            group, order = self._latest_spec
+            g = _hashable(doc.get(group, _MISSING))
+            if self._latest.get(g) == doc_id:
+                del self._latest[g]
+                best = None
+                for other in self._indexes[(group,)].get((g,), {}):
+                    other_doc = self._docs[other]
+                    if order in other_doc and (
+                        best is None
+                        or _before(other, other_doc, best, self._docs[best], order)
+                    ):
+                        best = other
+                if best is not None:
+                    self._latest[g] = best
+        return doc
+
+    def _copy(self, doc_id: int) -> Document:
+        return Document(copy.deepcopy(self._docs[doc_id]), doc_id)
+
+    def _check(self, got: list, expected: list, what) -> None:
+        def norm(rows):
+            return [(r.doc_id, dict(r)) for r in rows]
+
+        if norm(got) != norm(expected):
+            raise IndexMismatch(
+                f"{self.name}: index returned {norm(got)} for {what}, "
+                f"full scan returned {norm(expected)}"
+            )
+
+
+def _before(doc_id: int, doc: dict, other_id: int, other: dict, order: str) -> bool:
+    """Whether ``doc`` should replace ``other`` as the group's latest (max() semantics)."""
+    if doc[order] != other[order]:
+        return doc[order] > other[order]
+    return doc_id < other_id
+
+
+def _hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _query(fields: dict):
+    q = Query()
+    return reduce(lambda a, b: a & b, (q[name] == value for name, value in fields.items()))
@@ -1,15 +1,15 @@
-from db.client import db, Q
+from db.client import Q, indexed_table
 
 
-members_table = db.table("members")
+members_table = indexed_table("members", ("user_id",), ("team_slug",))
 
 
 def get_team_members(slug: str):
-    return members_table.search(Q.team_slug == slug)
+    return members_table.find(team_slug=slug)
 
 
 def get_member(user_id: int):
-    return members_table.get(Q.user_id == user_id)
+    return members_table.find_one(user_id=user_id)
 
 
 def add_member(user_id: int, user_name, team_slug: str):
@@ -28,3 +28,7 @@ def remove_members_by_team_id(team_id: str):
 
 def remove_member(user_id: int):
     members_table.remove(Q.user_id == user_id)
+
+
+def get_all_members():
+    return members_table.all()
@@ -1,4 +1,4 @@
-from db.client import db, Q
+from db.client import Q, batched_writes, indexed_table
 
 CATEGORY_CHANNEL_ID = "tr_category_id"
 
@@ -8,19 +8,32 @@ BOARD_MESSAGE_ID = "tr_board_msg_id"
 PROOFS_CHANNEL_ID = "tr_proofs_id"
 COMMANDS_CHANNEL_ID = "tr_cmd_id"
 RACE_STARTED_KEY = "tr_race_started"
+SCHEMA_VERSION_KEY = "tr_schema_version"
+COMMANDS_FINGERPRINT_KEY = "tr_commands_fingerprint"
 
-meta_table = db.table("meta")
+meta_table = indexed_table("meta", ("key",))
+_UNSET = object()
 
 
 def set_meta(key: str, value) -> None:
-    if meta_table.contains(Q.key == key):
+    if meta_table.find_one(key=key) is not None:
         meta_table.update({"value": value}, Q.key == key)
     else:
         meta_table.insert({"key": key, "value": value})
 
 
+def set_meta_many(values: dict) -> None:
+    """Set several keys in one storage write, skipping values that are unchanged."""
+    changed = {k: v for k, v in values.items() if get_meta(k, _UNSET) != v}
+    if not changed:
+        return
+    with batched_writes():
+        for key, value in changed.items():
+            set_meta(key, value)
+
+
 def get_meta(key: str, default=None):
-    row = meta_table.get(Q.key == key)
+    row = meta_table.find_one(key=key)
     return row["value"] if row else default
 
 
@@ -0,0 +1,51 @@
+"""Versioned schema migrations, applied once at startup.
+
+The schema version lives in the ``meta`` table. Each step brings the stored
+documents up to its version in bulk, so the read path never has to patch
+old documents on the fly. Add new steps to the end of ``MIGRATIONS``.
+"""
+from typing import Callable, List, Tuple
+
+from db.client import batched_writes
+from db.meta_table import SCHEMA_VERSION_KEY, get_meta, set_meta
+from db.teams_table import DEFAULT_BLACKLIST_CHARGES, teams_table
+from util.logger import log
+
+
+def _backfill_team_blacklist_fields() -> None:
+    def backfill(doc: dict) -> None:
+        if "blacklist_tiles" not in doc:
+            legacy = doc.get("blacklist_tile")
+            doc["blacklist_tiles"] = [legacy] if legacy is not None else []
+        if "blacklist_charges" not in doc:
+            doc["blacklist_charges"] = DEFAULT_BLACKLIST_CHARGES
+
+    stale = [
+        doc.doc_id
+        for doc in teams_table.all()
+        if "blacklist_tiles" not in doc or "blacklist_charges" not in doc
+    ]
+    if stale:
+        teams_table.update(backfill, doc_ids=stale)
+
+
+MIGRATIONS: List[Tuple[int, Callable[[], None]]] = [
+    (1, _backfill_team_blacklist_fields),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def run_migrations() -> int:
+    """Apply pending steps in one storage write and return the schema version."""
+    current = int(get_meta(SCHEMA_VERSION_KEY, 0))
+    pending = [(v, step) for v, step in MIGRATIONS if v > current]
+    if not pending:
+        return current
+
+    with batched_writes():
+        for version, step in pending:
+            step()
+            log.info(f"Applied schema migration {version} ({step.__name__})")
+        set_meta(SCHEMA_VERSION_KEY, pending[-1][0])
+    return pending[-1][0]
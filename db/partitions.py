@@ -0,0 +1,49 @@
+"""Per-guild instances of storage objects.
+
+``Partitioned`` builds one instance per guild partition on first use and
+forwards attribute access to the instance for the guild bound in
+``util.guild_context``. Routing is a context lookup plus a dict hit, so the
+cost of a read or write does not depend on how many guilds the bot is in.
+"""
+import threading
+from typing import Callable, Dict, Generic, List, TypeVar
+
+from util.guild_context import current_partition, partition_key
+
+T = TypeVar("T")
+
+
+class Partitioned(Generic[T]):
+    def __init__(self, factory: Callable[[int | None], T]):
+        self._factory = factory
+        self._instances: Dict[int | None, T] = {}
+        self._lock = threading.Lock()
+
+    def current(self) -> T:
+        return self._get(current_partition())
+
+    def for_guild(self, guild_id: int | None) -> T:
+        return self._get(partition_key(guild_id))
+
+    def existing(self, key: int | None) -> T | None:
+        """The instance for partition ``key`` if one was built, without building it."""
+        return self._instances.get(key)
+
+    def instances(self) -> List[T]:
+        with self._lock:
+            return list(self._instances.values())
+
+    def __getattr__(self, name):
+        return getattr(self.current(), name)
+
+    def __len__(self) -> int:
+        return len(self.current())
+
+    def _get(self, key: int | None) -> T:
+        instance = self._instances.get(key)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(key)
+                if instance is None:
+                    instance = self._instances[key] = self._factory(key)
+        return instance
@@ -1,9 +1,9 @@
 from datetime import datetime, timezone
 
-from db.client import Q, db
+from db.client import indexed_table
 
 
-pet_proofs_table = db.table("pet_proofs")
+pet_proofs_table = indexed_table("pet_proofs", ("team_id",))
 
 
 def add_pet_proof(
@@ -24,4 +24,4 @@ def add_pet_proof(
 
 
 def count_pet_proofs_for_team(team_id: str) -> int:
-    return len(pet_proofs_table.search(Q.team_id == team_id))
+    return pet_proofs_table.count(team_id=team_id)
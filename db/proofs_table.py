@@ -1,10 +1,10 @@
 from datetime import datetime, timezone
 from typing import List
 
-from db.client import Q, db
+from db.client import indexed_table
 
 
-proofs_table = db.table("proofs")
+proofs_table = indexed_table("proofs", ("team_id", "tile"))
 
 
 def add_proof(
@@ -31,9 +31,7 @@ def list_proof_urls(
     tile: int,
 ) -> List[str] | None:
 
-    query = (Q.team_id == team_id) & (Q.tile == tile)
-
-    rows = proofs_table.search(query)
+    rows = proofs_table.find(team_id=team_id, tile=tile)
     rows.sort(key=lambda r: r["ts"])  # oldest → newest
     urls = [r["url"] for r in rows]
 
@@ -44,8 +42,7 @@ def list_proofs(
     team_id: str,
     tile: int,
 ):
-    query = (Q.team_id == team_id) & (Q.tile == tile)
-    rows = proofs_table.search(query)
+    rows = proofs_table.find(team_id=team_id, tile=tile)
     rows.sort(key=lambda r: r["ts"])
 
     return rows
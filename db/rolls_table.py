@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
-from db.client import db, Q
+from db.client import indexed_table
 
-rolls_table = db.table("rolls")
+rolls_table = indexed_table("rolls", latest=("team_id", "ts"))
 
 
 def log_roll(
@@ -27,5 +27,4 @@ def log_roll(
 
 
 def last_roll(team_id: str) -> dict | None:
-    rows = rolls_table.search(Q.team_id == team_id)
-    return max(rows, key=lambda r: r["ts"]) if rows else None
+    return rolls_table.latest(team_id)
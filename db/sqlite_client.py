@@ -0,0 +1,244 @@
+"""SQLite storage with the subset of the TinyDB API used by the table modules.
+
+Every table is ``(doc_id INTEGER PRIMARY KEY, doc TEXT)`` holding the JSON
+document, plus expression indexes over the hot lookup fields. Equality
+queries built from ``Query()`` are translated to SQL so they hit those
+indexes; anything else falls back to filtering rows in Python.
+"""
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, List, Mapping
+
+from tinydb.table import Document
+
+INDEXES: dict[str, list[tuple[str, ...]]] = {
+    "teams": [("slug",)],
+    "members": [("user_id",), ("team_slug",)],
+    "proofs": [("team_id", "tile"), ("ts",)],
+    "rolls": [("team_id", "ts"), ("ts",)],
+    "pet_proofs": [("team_id",)],
+    "meta": [("key",)],
+}
+
+_FIELD = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_SCALARS = (str, int, float, bool)
+
+
+def _expr(path: tuple[str, ...]) -> str:
+    return f"json_extract(doc, '$.{'.'.join(path)}')"
+
+
+def _compile(hashval) -> tuple[str, list] | None:
+    """Translate a TinyDB query hash into a SQL predicate, if possible."""
+    if not isinstance(hashval, tuple) or not hashval:
+        return None
+    op = hashval[0]
+    if op == "==":
+        _, path, value = hashval
+        if not path or not all(_FIELD.match(p) for p in path):
+            return None
+        if not isinstance(value, _SCALARS):
+            return None
+        return f"{_expr(path)} = ?", [value]
+    if op in ("and", "or"):
+        parts = [_compile(h) for h in hashval[1]]
+        if not parts or any(p is None for p in parts):
+            return None
+        joiner = " AND " if op == "and" else " OR "
+        return (
+            "(" + joiner.join(sql for sql, _ in parts) + ")",
+            [v for _, params in parts for v in params],
+        )
+    return None
+
+
+class SqliteDatabase:
+    def __init__(self, path: str | Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._tables: dict[str, SqliteTable] = {}
+
+    def table(self, name: str) -> "SqliteTable":
+        if name not in self._tables:
+            self._tables[name] = SqliteTable(self, name)
+        return self._tables[name]
+
+    def tables(self) -> set[str]:
+        rows = self._conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        ).fetchall()
+        return {name for (name,) in rows if not name.startswith("sqlite_")}
+
+    @contextmanager
+    def transaction(self):
+        """Group writes into one commit; nests by joining the outer transaction."""
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self._conn
+                finally:
+                    self._depth -= 1
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SqliteTable:
+    def __init__(self, database: SqliteDatabase, name: str):
+        if not _FIELD.match(name):
+            raise ValueError(f"Invalid table name {name!r}")
+        self._db = database
+        self.name = name
+        with database.transaction() as conn:
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{name}" '
+                "(doc_id INTEGER PRIMARY KEY AUTOINCREMENT, doc TEXT NOT NULL)"
+            )
+            for fields in INDEXES.get(name, []):
+                cols = ", ".join(_expr((f,)) for f in fields)
+                conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "ix_{name}_{"_".join(fields)}" '
+                    f'ON "{name}" ({cols})'
+                )
+
+    def __len__(self) -> int:
+        with self._db._lock:
+            (n,) = self._db._conn.execute(f'SELECT COUNT(*) FROM "{self.name}"').fetchone()
+        return n
+
+    def insert(self, document: Mapping) -> int:
+        return self.insert_multiple([document])[0]
+
+    def insert_multiple(self, documents: Iterable[Mapping]) -> List[int]:
+        ids = []
+        with self._db.transaction() as conn:
+            for doc in documents:
+                cur = conn.execute(
+                    f'INSERT INTO "{self.name}" (doc) VALUES (?)', (json.dumps(dict(doc)),)
+                )
+                ids.append(cur.lastrowid)
+        return ids
+
+    def all(self) -> List[Document]:
+        return self._select()
+
+    def search(self, cond) -> List[Document]:
+        return self._select(cond)
+
+    def get(self, cond=None, doc_id: int | None = None, doc_ids: list | None = None):
+        if doc_id is not None:
+            rows = self._select(doc_ids=[doc_id])
+            return rows[0] if rows else None
+        if doc_ids is not None:
+            return self._select(doc_ids=doc_ids)
+        if cond is None:
+            raise RuntimeError("You have to pass either cond or doc_id or doc_ids")
+        rows = self._select(cond, limit=1)
+        return rows[0] if rows else None
+
+    def contains(self, cond=None, doc_id: int | None = None) -> bool:
+        return self.get(cond, doc_id=doc_id) is not None
+
+    def count(self, cond) -> int:
+        return len(self._select(cond))
+
+    def update(
+        self,
+        fields: Mapping | Callable[[dict], None],
+        cond=None,
+        doc_ids: Iterable[int] | None = None,
+    ) -> List[int]:
+        with self._db.transaction() as conn:
+            if doc_ids is not None:
+                rows = self._select(doc_ids=list(doc_ids))
+            elif cond is not None:
+                rows = self._select(cond)
+            else:
+                rows = self._select()
+            for doc in rows:
+                if callable(fields):
+                    fields(doc)
+                else:
+                    doc.update(fields)
+                conn.execute(
+                    f'UPDATE "{self.name}" SET doc = ? WHERE doc_id = ?',
+                    (json.dumps(dict(doc)), doc.doc_id),
+                )
+        return [doc.doc_id for doc in rows]
+
+    def remove(self, cond=None, doc_ids: Iterable[int] | None = None) -> List[int]:
+        if cond is None and doc_ids is None:
+            raise RuntimeError("Use truncate() to remove all documents")
+        with self._db.transaction() as conn:
+            if doc_ids is not None:
+                ids = list(doc_ids)
+            else:
+                ids = [doc.doc_id for doc in self._select(cond)]
+            conn.executemany(
+                f'DELETE FROM "{self.name}" WHERE doc_id = ?', [(i,) for i in ids]
+            )
+        return ids
+
+    def truncate(self) -> None:
+        with self._db.transaction() as conn:
+            conn.execute(f'DELETE FROM "{self.name}"')
+
+    def _select(self, cond=None, doc_ids=None, limit: int | None = None) -> List[Document]:
+        sql = f'SELECT doc_id, doc FROM "{self.name}"'
+        params: list = []
+        python_filter = None
+        if doc_ids is not None:
+            ids = list(doc_ids)
+            if not ids:
+                return []
+            sql += f" WHERE doc_id IN ({', '.join('?' * len(ids))})"
+            params = ids
+        elif cond is not None:
+            compiled = _compile(getattr(cond, "_hash", None))
+            if compiled is None:
+                python_filter = cond
+            else:
+                sql += f" WHERE {compiled[0]}"
+                params = compiled[1]
+        sql += " ORDER BY doc_id"
+        if limit is not None and python_filter is None:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._db._lock:
+            rows = self._db._conn.execute(sql, params).fetchall()
+
+        out = []
+        for doc_id, raw in rows:
+            doc = Document(json.loads(raw), doc_id)
+            if python_filter is not None and not python_filter(doc):
+                continue
+            out.append(doc)
+            if limit is not None and len(out) >= limit:
+                break
+        return out
@@ -0,0 +1,141 @@
+"""Write-behind TinyDB storage.
+
+Reads are served from memory; writes mark the cache dirty and are flushed
+to disk after ``flush_every`` writes or ``flush_interval`` seconds,
+whichever comes first. Every flush goes to a temp file that is fsynced and
+atomically renamed over the target, so a crash mid-flush leaves the
+previous state.json intact.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+from tinydb import TinyDB
+from tinydb.middlewares import Middleware
+from tinydb.storages import Storage
+from tinydb.table import Table
+
+from util.logger import log
+
+
+class AtomicJSONStorage(Storage):
+    def __init__(self, path: str | Path, **kwargs):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._kwargs = kwargs
+
+    def read(self):
+        try:
+            with self.path.open(encoding="utf-8") as fp:
+                raw = fp.read()
+        except FileNotFoundError:
+            return None
+        return json.loads(raw) if raw.strip() else None
+
+    def write(self, data) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as fp:
+                json.dump(data, fp, **self._kwargs)
+                fp.flush()
+                os.fsync(fp.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        _fsync_dir(self.path.parent)
+
+    def close(self) -> None:
+        pass
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class WriteBehindMiddleware(Middleware):
+    def __init__(self, storage_cls, flush_interval: float = 1.0, flush_every: int = 50):
+        super().__init__(storage_cls)
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.lock = threading.RLock()
+        self.cache = None
+        self.pending_writes = 0
+        self.flushes = 0
+        self._timer: threading.Timer | None = None
+
+    def read(self):
+        if self.cache is None:
+            self.cache = self.storage.read()
+        return self.cache
+
+    def write(self, data) -> None:
+        with self.lock:
+            self.cache = data
+            self.pending_writes += 1
+            if self.pending_writes >= self.flush_every:
+                self.flush()
+            elif self._timer is None and self.flush_interval > 0:
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self.pending_writes:
+                return
+            self.storage.write(self.cache)
+            self.pending_writes = 0
+            self.flushes += 1
+
+    def close(self) -> None:
+        self.flush()
+        self.storage.close()
+
+    def _flush_from_timer(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            log.exception("Write-behind flush failed")
+
+
+class _LockedTable(Table):
+    # TinyDB mutates the cached documents in place between read() and
+    # write(); holding the storage lock keeps a timer flush from
+    # serializing a half-applied update.
+    def _update_table(self, updater):
+        with self._storage.lock:
+            super()._update_table(updater)
+
+
+class WriteBehindTinyDB(TinyDB):
+    table_class = _LockedTable
+
+    def flush(self) -> None:
+        self.storage.flush()
+
+
+def open_write_behind_db(
+    path: str | Path,
+    flush_interval: float = 1.0,
+    flush_every: int = 50,
+) -> WriteBehindTinyDB:
+    return WriteBehindTinyDB(
+        path,
+        storage=WriteBehindMiddleware(
+            AtomicJSONStorage, flush_interval=flush_interval, flush_every=flush_every
+        ),
+    )
@@ -1,11 +1,15 @@
+from typing import Callable, TypeVar
+
 from discord import Colour
-from db.client import db, Q
+from db.client import Q, indexed_table
 
 
-teams_table = db.table("teams")
+teams_table = indexed_table("teams", ("slug",))
 DEFAULT_BLACKLIST_CHARGES = 1
 MAX_RETURN_BLACKLIST_GRANTS = 2
 
+T = TypeVar("T")
+
 
 def add_team(name: str, slug: str, role_id: int, role_colour: Colour):
     teams_table.insert(
@@ -27,11 +31,11 @@ def remove_team(slug: str):
 
 
 def get_team(team_id: str):
-    return _normalize_team_doc(teams_table.get(Q.slug == team_id))
+    return teams_table.find_one(slug=team_id)
 
 
 def get_teams():
-    return [_normalize_team_doc(doc) for doc in teams_table.all()]
+    return teams_table.all()
 
 
 def clear_pending_flag(slug: str):
@@ -45,91 +49,127 @@ def update_team_position(position, team_name):
     )
 
 
+def mutate_team(slug: str, fn: Callable[[dict], tuple[dict | None, T]]) -> T | None:
+    """Read the team once, apply ``fn`` and write its changes in one update.
+
+    ``fn`` gets a copy of the team document and returns ``(changes, result)``;
+    ``changes`` (falsy for no write) is applied to the stored document and
+    ``result`` is returned. Returns ``None`` when the team does not exist.
+    """
+    row = teams_table.find_one(slug=slug)
+    if row is None:
+        return None
+    changes, result = fn(dict(row))
+    if changes:
+        teams_table.update(changes, doc_ids=[row.doc_id])
+    return result
+
+
 def get_blacklist_tiles(slug: str) -> list[int]:
     row = get_team(slug)
     if row is None:
         return []
-    return [int(tile) for tile in row.get("blacklist_tiles", [])]
+    return _tiles(row)
 
 
 def add_blacklist_tile(slug: str, tile_id: int) -> list[int] | None:
-    row = get_team(slug)
-    if row is None:
-        return None
-    tiles = [int(tile) for tile in row.get("blacklist_tiles", [])]
-    if tile_id not in tiles:
-        tiles.append(tile_id)
-        tiles.sort()
-        teams_table.update({"blacklist_tiles": tiles}, Q.slug == slug)
-    return tiles
+    def apply(doc):
+        tiles = _tiles(doc)
+        if tile_id in tiles:
+            return None, tiles
+        tiles = sorted([*tiles, tile_id])
+        return {"blacklist_tiles": tiles}, tiles
+
+    return mutate_team(slug, apply)
 
 
 def replace_blacklist_tile(slug: str, old_tile: int, new_tile: int) -> list[int] | None:
-    row = get_team(slug)
-    if row is None:
-        return None
-    tiles = [int(tile) for tile in row.get("blacklist_tiles", [])]
-    if old_tile not in tiles:
-        return None
-    tiles = [new_tile if tile == old_tile else tile for tile in tiles]
-    tiles = sorted(set(tiles))
-    teams_table.update({"blacklist_tiles": tiles}, Q.slug == slug)
-    return tiles
+    def apply(doc):
+        tiles = _tiles(doc)
+        if old_tile not in tiles:
+            return None, None
+        tiles = _replaced(tiles, old_tile, new_tile)
+        return {"blacklist_tiles": tiles}, tiles
+
+    return mutate_team(slug, apply)
 
 
 def get_blacklist_charges(slug: str) -> int:
     row = get_team(slug)
     if row is None:
         return 0
-    return int(row.get("blacklist_charges", DEFAULT_BLACKLIST_CHARGES))
+    return _charges(row)
 
 
 def add_blacklist_charges(slug: str, amount: int = 1) -> int:
-    charges = get_blacklist_charges(slug) + amount
-    teams_table.update({"blacklist_charges": charges}, Q.slug == slug)
-    return charges
+    def apply(doc):
+        charges = _charges(doc) + amount
+        return {"blacklist_charges": charges}, charges
+
+    charges = mutate_team(slug, apply)
+    return amount if charges is None else charges
 
 
 def increment_return_blacklist_grant_if_allowed(slug: str) -> tuple[int, bool]:
-    row = get_team(slug)
-    if row is None:
-        return 0, False
-    grants = int(row.get("return_blacklist_grants", 0))
-    if grants >= MAX_RETURN_BLACKLIST_GRANTS:
-        return get_blacklist_charges(slug), False
-    charges = get_blacklist_charges(slug) + 1
-    teams_table.update(
-        {
-            "blacklist_charges": charges,
-            "return_blacklist_grants": grants + 1,
-        },
-        Q.slug == slug,
-    )
-    return charges, True
+    def apply(doc):
+        grants = int(doc.get("return_blacklist_grants", 0))
+        charges = _charges(doc)
+        if grants >= MAX_RETURN_BLACKLIST_GRANTS:
+            return None, (charges, False)
+        return (
+            {"blacklist_charges": charges + 1, "return_blacklist_grants": grants + 1},
+            (charges + 1, True),
+        )
+
+    result = mutate_team(slug, apply)
+    return (0, False) if result is None else result
 
 
 def consume_blacklist_charge(slug: str) -> int | None:
-    row = get_team(slug)
-    if row is None:
-        return None
-    charges = int(row.get("blacklist_charges", DEFAULT_BLACKLIST_CHARGES))
-    if charges <= 0:
-        return None
-    updated = charges - 1
-    teams_table.update({"blacklist_charges": updated}, Q.slug == slug)
-    return updated
+    def apply(doc):
+        charges = _charges(doc)
+        if charges <= 0:
+            return None, None
+        return {"blacklist_charges": charges - 1}, charges - 1
 
+    return mutate_team(slug, apply)
 
-def _normalize_team_doc(doc: dict | None) -> dict | None:
-    if doc is None:
-        return None
-    updates = {}
-    if "blacklist_tiles" not in doc:
-        legacy = doc.get("blacklist_tile")
-        updates["blacklist_tiles"] = [legacy] if legacy is not None else []
-    if "blacklist_charges" not in doc:
-        updates["blacklist_charges"] = DEFAULT_BLACKLIST_CHARGES
-    if updates:
-        teams_table.update(updates, Q.slug == doc["slug"])
-        doc = {**doc, **updates}
-    return doc
+
+def spend_charge_on_blacklist_tile(
+    slug: str,
+    tile_id: int,
+    old_tile: int | None = None,
+) -> tuple[bool, int, list[int]] | None:
+    """Consume a charge and add ``tile_id`` (replacing ``old_tile`` if given).
+
+    Returns ``(applied, charges, tiles)`` after the operation; nothing is
+    written when the team has no charges or ``old_tile`` is not blacklisted.
+    """
+
+    def apply(doc):
+        charges = _charges(doc)
+        tiles = _tiles(doc)
+        if charges <= 0 or (old_tile is not None and old_tile not in tiles):
+            return None, (False, charges, tiles)
+        if old_tile is not None:
+            tiles = _replaced(tiles, old_tile, tile_id)
+        elif tile_id not in tiles:
+            tiles = sorted([*tiles, tile_id])
+        return (
+            {"blacklist_charges": charges - 1, "blacklist_tiles": tiles},
+            (True, charges - 1, tiles),
+        )
+
+    return mutate_team(slug, apply)
+
+
+def _tiles(doc: dict) -> list[int]:
+    return [int(tile) for tile in doc.get("blacklist_tiles", [])]
+
+
+def _charges(doc: dict) -> int:
+    return int(doc.get("blacklist_charges", DEFAULT_BLACKLIST_CHARGES))
+
+
+def _replaced(tiles: list[int], old_tile: int, new_tile: int) -> list[int]:
+    return sorted({new_tile if tile == old_tile else tile for tile in tiles})
@@ -0,0 +1,50 @@
+"""One-shot copy of a TinyDB ``state.json`` into the SQLite backend.
+
+    python -m db.tinydb_to_sqlite [state.json] [state.sqlite3]
+"""
+import json
+import sys
+from pathlib import Path
+
+from db.sqlite_client import SqliteDatabase
+
+
+def migrate_tinydb_to_sqlite(json_path: str | Path, sqlite_path: str | Path) -> dict[str, int]:
+    """Copy every table (keeping doc ids) and return the row count per table.
+
+    Refuses to write into a table that already has rows so a second run
+    cannot duplicate history.
+    """
+    json_path = Path(json_path)
+    if not json_path.is_file():
+        raise FileNotFoundError(json_path)
+    with json_path.open(encoding="utf-8") as fp:
+        raw = fp.read().strip()
+    data: dict = json.loads(raw) if raw else {}
+
+    target = SqliteDatabase(sqlite_path)
+    counts: dict[str, int] = {}
+    try:
+        with target.transaction() as conn:
+            for name, rows in data.items():
+                table = target.table(name)
+                if len(table):
+                    raise ValueError(f"SQLite table {name!r} is not empty")
+                conn.executemany(
+                    f'INSERT INTO "{name}" (doc_id, doc) VALUES (?, ?)',
+                    [(int(doc_id), json.dumps(doc)) for doc_id, doc in rows.items()],
+                )
+                counts[name] = len(rows)
+    finally:
+        target.close()
+    return counts
+
+
+if __name__ == "__main__":
+    from config import DB_PATH, SQLITE_PATH
+
+    src = Path(sys.argv[1]) if len(sys.argv) > 1 else DB_PATH
+    dst = Path(sys.argv[2]) if len(sys.argv) > 2 else SQLITE_PATH
+    for table, n in migrate_tinydb_to_sqlite(src, dst).items():
+        print(f"{table}: {n} rows")
+    print(f"Wrote {dst}")
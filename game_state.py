@@ -1,57 +1,244 @@
+import hashlib
+import io
+import json
 import os
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from util import metrics
 from util.logger import log
+from util.executors import run_db, run_render
+from util.guild_context import current_guild_id, current_partition, use_guild
+from util.single_flight import CoalescingScheduler
 import discord
-from board.board_detector import detect_tiles_by_bg
-from board.visualize import paint_team_circles
+from config import BOARD_REFRESH_DEBOUNCE, RENDER_WORKER, RENDER_WORKER_TIMEOUT
+from board.geometry_cache import get_tile_geometry, sidecar_path
 from db.meta_table import (
     get_board_channel_id,
     get_board_message_id,
     set_board_message_id,
 )
-from services.member_service import fetch_team_members
-from services.team_service import fetch_teams
+from services.board_snapshot import BoardSnapshot, build_board_snapshot
+from services.eta_service import Eta, estimate
 from services.tiles_service import get_tile
 
+if TYPE_CHECKING:
+    # OpenCV/NumPy are imported on first render or by warm_up_rendering(),
+    # not when the bot starts.
+    from board.render_worker import RenderWorker
+    from board.visualize import IncrementalBoardRenderer
+
 BOARD_PNG = os.getenv("BOARD_PNG", "assets/board_state.png")
+BOARD_BACKGROUND = "assets/background.png"
+BOARD_BASE = "assets/board.png"
+# Debug only: also write each rendered board to BOARD_PNG on disk.
+WRITE_BOARD_PNG = os.getenv("WRITE_BOARD_PNG") == "1"
+
+
+@dataclass(slots=True)
+class _GuildBoard:
+    """Render cache, refresh scheduler and posted message of one guild's board."""
+
+    renderer: "IncrementalBoardRenderer | None" = None
+    refresh: CoalescingScheduler | None = None
+    channel: discord.TextChannel | None = None
+    message: discord.PartialMessage | None = None
+    # (message id, png sha256, embed sha256) of what is currently posted.
+    posted: tuple[int, str, str] | None = None
+    uploads: dict[str, int] = field(
+        default_factory=lambda: {"uploads": 0, "embed_only": 0, "skipped": 0}
+    )
+
+
+_boards: dict[int | None, _GuildBoard] = {}
+_worker: "RenderWorker | None" = None
+_worker_lock = threading.Lock()
+
+# board_stage_seconds{stage=...}: fetch, snapshot, render (detect, paint,
+# encode when rendering in-process), embed, edit.
+_STAGE = "board_stage_seconds"
+
+# Discord JSON error code for a deleted channel (vs 10008, unknown message).
+UNKNOWN_CHANNEL = 10003
+
+
+def request_board_update(bot: discord.Client) -> CoalescingScheduler:
+    """Schedule a refresh of the current guild's board; bursts collapse into one render."""
+    board = _board()
+    if board.refresh is None:
+        guild_id = current_guild_id.get()
+        board.refresh = CoalescingScheduler(
+            lambda: _update_guild_board(bot, guild_id),
+            debounce=BOARD_REFRESH_DEBOUNCE,
+            name=f"Board refresh ({guild_id})",
+        )
+    board.refresh.request()
+    return board.refresh
+
+
+async def wait_board_refresh() -> None:
+    """Wait until the current guild's pending board refresh, if any, has run."""
+    refresh = _board().refresh
+    if refresh is not None:
+        await refresh.wait_idle()
+
+
+def board_upload_stats() -> dict[str, int]:
+    """Board edits by kind: full image uploads, embed-only edits, skipped no-ops."""
+    return dict(_board().uploads)
+
+
+def board_refresh_stats() -> dict[str, int]:
+    refresh = _board().refresh
+    if refresh is None:
+        return {"requested": 0, "coalesced": 0, "executed": 0, "failed": 0}
+    return refresh.stats()
+
+
+def _board() -> _GuildBoard:
+    key = current_partition()
+    board = _boards.get(key)
+    if board is None:
+        board = _boards.setdefault(key, _GuildBoard())
+    return board
+
+
+async def _update_guild_board(bot: discord.Client, guild_id: int | None) -> None:
+    with use_guild(guild_id):
+        await update_game_board(bot)
+
+
+def load_board_tiles():
+    return get_tile_geometry(BOARD_BACKGROUND, BOARD_BASE, sidecar_path(BOARD_PNG))
+
+
+def warm_up_rendering() -> None:
+    """Load the rendering stack and board geometry ahead of the first refresh."""
+    if RENDER_WORKER:
+        _render_worker().ensure_started()
+    else:
+        import board.visualize  # noqa: F401  (cv2 + numpy)
+
+        load_board_tiles()
+    estimate(0)
+
+
+def _render_worker() -> "RenderWorker":
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            from board.render_worker import start_render_worker
+
+            _worker = start_render_worker(
+                BOARD_BACKGROUND,
+                BOARD_BASE,
+                sidecar_path(BOARD_PNG),
+                timeout=RENDER_WORKER_TIMEOUT,
+            )
+        return _worker
 
 
 async def update_game_board(bot: discord.Client) -> None:
-    chan_id = get_board_channel_id()
-    if not chan_id:
-        log.warning("Board channel ID not set; skipping board update")
-        return
-
-    channel = bot.get_channel(chan_id) or await bot.fetch_channel(chan_id)
-    if channel is None or not isinstance(channel, discord.TextChannel):
-        log.warning("Board channel not found or not a text channel")
-        return
-
-    teams = fetch_teams()
-    if teams == None:
-        return
-
-    tiles = detect_tiles_by_bg("assets/background.png", "assets/board.png")
-    paint_team_circles("assets/board.png", tiles, teams, out_path=BOARD_PNG)
-
-    msg_id = get_board_message_id()
-    message = None
-    if msg_id:
+    """Redraw and post the board of the guild bound in ``util.guild_context``."""
+    with metrics.timer("board_update_seconds"):
+        await _update_game_board(bot)
+
+
+async def _update_game_board(bot: discord.Client) -> None:
+    board = _board()
+    with metrics.timer(_STAGE, stage="fetch"):
+        chan_id = await run_db(get_board_channel_id)
+        if not chan_id:
+            log.warning("Board channel ID not set; skipping board update")
+            return
+
+        channel = await _board_channel_for(board, bot, chan_id)
+        if channel is None:
+            log.warning("Board channel not found or not a text channel")
+            return
+        message = _board_message_for(board, channel, await run_db(get_board_message_id))
+
+    with metrics.timer(_STAGE, stage="snapshot"):
+        snapshot = await run_db(build_board_snapshot)
+    with metrics.timer(_STAGE, stage="render"):
+        board_png = await run_render(render_board_png, snapshot)
+    with metrics.timer(_STAGE, stage="embed"):
+        embed = build_board_embed(snapshot, channel.guild)
+        embed_hash = _embed_hash(embed)
+    png_hash = hashlib.sha256(board_png).hexdigest()
+    if message is not None:
+        posted = board.posted
+        posted = posted[1:] if posted and posted[0] == message.id else None
         try:
-            message = await channel.fetch_message(msg_id)
-        except discord.NotFound:
-            message = None
+            if posted == (png_hash, embed_hash):
+                board.uploads["skipped"] += 1
+                return
+            with metrics.timer(_STAGE, stage="edit"):
+                if posted is not None and posted[0] == png_hash:
+                    # Leaving out ``attachments`` keeps the uploaded image.
+                    await message.edit(embed=embed)
+                    board.uploads["embed_only"] += 1
+                else:
+                    await message.edit(embed=embed, attachments=[_board_file(board_png)])
+                    board.uploads["uploads"] += 1
+            board.posted = (message.id, png_hash, embed_hash)
+            return
+        except discord.NotFound as e:
+            board.posted = None
+            board.message = None
+            if e.code == UNKNOWN_CHANNEL:
+                board.channel = None
+                log.warning("Board channel %s no longer exists", chan_id)
+                return
+            log.info("Board message %s is gone; posting a new one", message.id)
+
+    with metrics.timer(_STAGE, stage="edit"):
+        sent = await channel.send(embed=embed, file=_board_file(board_png))
+    board.uploads["uploads"] += 1
+    board.posted = (sent.id, png_hash, embed_hash)
+    await run_db(set_board_message_id, sent.id)
+    _board_message_for(board, channel, sent.id)
+
+
+async def _board_channel_for(
+    board: _GuildBoard, bot: discord.Client, chan_id: int
+) -> discord.TextChannel | None:
+    if board.channel is not None and board.channel.id == chan_id:
+        return board.channel
+    try:
+        channel = bot.get_channel(chan_id) or await bot.fetch_channel(chan_id)
+    except discord.NotFound:
+        return None
+    if not isinstance(channel, discord.TextChannel):
+        return None
+    board.channel = channel
+    return channel
+
+
+def _board_message_for(
+    board: _GuildBoard, channel: discord.TextChannel, msg_id: int | None
+) -> discord.PartialMessage | None:
+    """PartialMessage for the stored board message; editing it needs no GET."""
+    if not msg_id:
+        return None
+    message = board.message
+    if message is None or message.id != msg_id or message.channel.id != channel.id:
+        message = board.message = channel.get_partial_message(msg_id)
+    return message
 
+
+def build_board_embed(snapshot: BoardSnapshot, guild: discord.Guild | None) -> discord.Embed:
     embed = discord.Embed(title="Board State")
 
-    for team in teams:
+    for team in snapshot.teams:
         tile = get_tile(team.position)
-        role = bot.guilds[0].get_role(team.role_id)
-        team_members = fetch_team_members(team.team_id)
-        members_str = ""
-        for member in team_members:
-            members_str += f"{member.name}, "
+        role = guild.get_role(team.role_id) if guild else None
 
-        embed.add_field(name="", value=role.mention if role else team.name, inline=False)
+        header = role.mention if role else team.name
+        eta = snapshot.eta_of(team.team_id)
+        if eta is not None:
+            header = f"{header} · {_eta_text(eta)}"
+        embed.add_field(name="", value=header, inline=False)
 
         if team.pending:
             embed.add_field(name="**Tile**", value=f"`{team.position}`", inline=True)
@@ -67,15 +254,58 @@ async def update_game_board(bot: discord.Client) -> None:
             )
             embed.add_field(name="**Assignment**", value="`/`", inline=True)
 
-        if len(members_str) > 0:
-            members_str = members_str[:-2]
-            members_str = f"`{members_str}`"
-            embed.add_field(name="**Members**", value=members_str)
+        members = snapshot.members_of(team.team_id)
+        if members:
+            names = ", ".join(member.name for member in members)
+            embed.add_field(name="**Members**", value=f"`{names}`")
         else:
             embed.add_field(name="**Members**", value="`/`")
 
-    if message:
-        await message.edit(embed=embed, attachments=[discord.File(BOARD_PNG)])
+    return embed
+
+
+def render_board_png(snapshot: BoardSnapshot) -> bytes:
+    """Render the board in memory and return the encoded PNG bytes.
+
+    With ``RENDER_WORKER=1`` the work is done by the render worker process;
+    the calling thread only waits on its pipe.
+    """
+    if RENDER_WORKER:
+        png = _render_worker().render(current_partition(), snapshot.teams)
     else:
-        sent = await channel.send(embed=embed, file=discord.File(BOARD_PNG))
-        set_board_message_id(sent.id)
+        png = _render_in_process(snapshot)
+    if WRITE_BOARD_PNG:
+        with open(BOARD_PNG, "wb") as fp:
+            fp.write(png)
+    return png
+
+
+def _render_in_process(snapshot: BoardSnapshot) -> bytes:
+    from board.visualize import IncrementalBoardRenderer, load_board_image
+
+    board = _board()
+    with metrics.timer(_STAGE, stage="detect"):
+        tiles = load_board_tiles()
+    if board.renderer is None or board.renderer.tiles is not tiles:
+        board.renderer = IncrementalBoardRenderer(load_board_image(BOARD_BASE), tiles)
+    teams = list(snapshot.teams)
+    with metrics.timer(_STAGE, stage="paint"):
+        board.renderer.render(teams)
+    with metrics.timer(_STAGE, stage="encode"):
+        # Nothing is dirty any more, so this only encodes (or reuses the PNG).
+        return board.renderer.render_png(teams)
+
+
+def _eta_text(eta: Eta) -> str:
+    if eta.expected == 0:
+        return "Finished"
+    return f"ETA ~{eta.expected:.1f} rolls ({eta.p10}–{eta.p90})"
+
+
+def _embed_hash(embed: discord.Embed) -> str:
+    raw = json.dumps(embed.to_dict(), sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _board_file(png: bytes) -> discord.File:
+    return discord.File(io.BytesIO(png), filename=os.path.basename(BOARD_PNG))
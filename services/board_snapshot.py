@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+from db import members_table as mt
+from db import teams_table as tt
+from services.eta_service import Eta, estimate
+from services.member_service import Member
+from services.team_service import Team
+
+
+@dataclass(slots=True, frozen=True)
+class BoardSnapshot:
+    """Teams, their members and ETAs as read for one board refresh."""
+
+    teams: Tuple[Team, ...]
+    members: Mapping[str, Tuple[Member, ...]]
+    etas: Mapping[str, Eta] = field(default_factory=lambda: MappingProxyType({}))
+
+    def members_of(self, team_id: str) -> Tuple[Member, ...]:
+        return self.members.get(team_id, ())
+
+    def eta_of(self, team_id: str) -> Eta | None:
+        return self.etas.get(team_id)
+
+
+def build_board_snapshot() -> BoardSnapshot:
+    """Read teams and members once and group members by team in one pass.
+
+    Runs on the DB thread, which also pays for the ETA solves (cached per
+    blacklist) so the event loop only formats them.
+    """
+    teams = tuple(Team.from_doc(doc) for doc in tt.get_teams())
+    grouped: dict[str, list[Member]] = {}
+    for doc in mt.get_all_members():
+        member = Member.from_doc(doc)
+        grouped.setdefault(member.team_id, []).append(member)
+    return BoardSnapshot(
+        teams=teams,
+        members=MappingProxyType({slug: tuple(ms) for slug, ms in grouped.items()}),
+        etas=MappingProxyType(
+            {team.team_id: estimate(team.position, team.blacklist_tiles) for team in teams}
+        ),
+    )
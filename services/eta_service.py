@@ -0,0 +1,104 @@
+"""Expected rolls to finish, from an absorbing Markov chain over the board.
+
+State ``p`` is the tile a team rests on; each roll moves it to
+``compile_transitions(blacklist, tiles)[min(p + d, 90)].final`` with probability
+1/6 per die face, and tile 90 is absorbing. The expected number of rolls
+solves ``(I - Q) t = 1`` over the transient states, and percentile bands
+come from stepping the state distribution until (almost) all of it is
+absorbed. The blacklist is taken as fixed, i.e. the team spends no more
+charges.
+
+Solutions are cached per (RETURN edges, blacklist), so a board refresh only
+pays for a solve when some team's blacklist changed; the refresh estimates
+on the DB thread while building its snapshot. NumPy is imported on the
+first solve, keeping it off the bot's startup path.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Mapping, Tuple
+
+from services.movement_service import FINISH, compile_edge_transitions, return_edges
+from services.tiles_service import TILES
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DIE_FACES = 6
+# Stop stepping the distribution once this much mass has finished.
+_CDF_COVERAGE = 0.9999
+_MAX_ROLLS = 2000
+
+
+@dataclass(slots=True, frozen=True)
+class Eta:
+    expected: float
+    p10: int
+    p50: int
+    p90: int
+
+
+def estimate(
+    position: int,
+    blacklist: Iterable[int] = (),
+    tiles: Mapping[int, Dict[str, Any]] = TILES,
+) -> Eta:
+    expected, cdf = _solve(return_edges(tiles), tuple(sorted({int(t) for t in blacklist})))
+    position = min(max(int(position), 0), FINISH)
+    column = cdf[:, position]
+    return Eta(
+        expected=float(expected[position]),
+        p10=_quantile(column, 0.10),
+        p50=_quantile(column, 0.50),
+        p90=_quantile(column, 0.90),
+    )
+
+
+def transition_matrix(
+    blacklist: Iterable[int] = (),
+    tiles: Mapping[int, Dict[str, Any]] = TILES,
+) -> np.ndarray:
+    """Row-stochastic (91, 91) matrix of one roll from each resting tile."""
+    return _matrix(return_edges(tiles), blacklist)
+
+
+def _matrix(edges: Tuple[Tuple[int, int], ...], blacklist: Iterable[int]) -> np.ndarray:
+    import numpy as np
+
+    table = compile_edge_transitions(edges, blacklist)
+    matrix = np.zeros((FINISH + 1, FINISH + 1))
+    for pos in range(FINISH):
+        for face in range(1, DIE_FACES + 1):
+            matrix[pos, table[min(pos + face, FINISH)].final] += 1 / DIE_FACES
+    matrix[FINISH, FINISH] = 1.0
+    return matrix
+
+
+def _quantile(cdf_column: np.ndarray, q: float) -> int:
+    # cdf_column[n] is P(finished within n rolls).
+    return int(cdf_column.searchsorted(q - 1e-12))
+
+
+@lru_cache(maxsize=128)
+def _solve(
+    edges: Tuple[Tuple[int, int], ...],
+    blacklist: Tuple[int, ...],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(expected rolls per start tile, cdf[n, start]) for one blacklist."""
+    import numpy as np
+
+    matrix = _matrix(edges, blacklist)
+    transient = matrix[:FINISH, :FINISH]
+    expected = np.zeros(FINISH + 1)
+    expected[:FINISH] = np.linalg.solve(np.eye(FINISH) - transient, np.ones(FINISH))
+
+    dist = np.eye(FINISH + 1)
+    finished = [dist[:, FINISH].copy()]
+    while finished[-1].min() < _CDF_COVERAGE and len(finished) <= _MAX_ROLLS:
+        dist = dist @ matrix
+        finished.append(dist[:, FINISH].copy())
+    cdf = np.stack(finished)
+    cdf.setflags(write=False)
+    expected.setflags(write=False)
+    return expected, cdf
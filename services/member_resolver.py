@@ -0,0 +1,3 @@
+def mention_for(user_id: int) -> str:
+    """Mention string built from the stored ID; needs no member lookup."""
+    return f"<@{int(user_id)}>"
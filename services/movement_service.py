@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+from services.tiles_service import TILES
+
+FINISH = 90
+MAX_EFFECT_STEPS = 20
+
+BLACKLIST = "blacklist"
+RETURN = "return"
+
+
+@dataclass(slots=True, frozen=True)
+class Move:
+    kind: str
+    position: int
+    skipped: int = 0
+
+
+@dataclass(slots=True, frozen=True)
+class Transition:
+    final: int
+    moves: Tuple[Move, ...]
+
+
+def return_edges(tiles: Mapping[int, Dict[str, Any]] = TILES) -> Tuple[Tuple[int, int], ...]:
+    return tuple(
+        sorted(
+            (int(tile_id), int(tile["destination_id"]))
+            for tile_id, tile in tiles.items()
+            if tile.get("type") == "RETURN" and tile.get("destination_id") is not None
+        )
+    )
+
+
+def compile_transitions(
+    blacklist: Iterable[int],
+    tiles: Mapping[int, Dict[str, Any]] = TILES,
+) -> Tuple[Transition, ...]:
+    """Landing position → final position (and the moves taken) for one blacklist.
+
+    Index ``p`` of the result is where a team ends up after its roll lands
+    on tile ``p``: blacklist skips and RETURN tiles are followed until the
+    position is stable. Tables are cached per (RETURN edges, blacklist), so
+    they are only rebuilt when a blacklist or the tile set changes.
+    """
+    return compile_edge_transitions(return_edges(tiles), blacklist)
+
+
+def compile_edge_transitions(
+    edges: Tuple[Tuple[int, int], ...],
+    blacklist: Iterable[int],
+) -> Tuple[Transition, ...]:
+    """``compile_transitions`` for RETURN edges already taken from ``return_edges``."""
+    return _compile(tuple(edges), tuple(sorted({int(t) for t in blacklist})))
+
+
+def resolve_move(position: int, blacklist: Iterable[int]) -> Transition:
+    return compile_transitions(blacklist)[position]
+
+
+@lru_cache(maxsize=256)
+def _compile(
+    edges: Tuple[Tuple[int, int], ...],
+    blacklist: Tuple[int, ...],
+) -> Tuple[Transition, ...]:
+    returns = dict(edges)
+    blacklisted = frozenset(blacklist)
+    return tuple(_follow(pos, returns, blacklisted) for pos in range(FINISH + 1))
+
+
+def _follow(position: int, returns: Dict[int, int], blacklisted: frozenset) -> Transition:
+    pos = position
+    moves: list[Move] = []
+    for _ in range(MAX_EFFECT_STEPS):
+        if pos < FINISH and pos in blacklisted:
+            skipped = 0
+            while pos in blacklisted and pos < FINISH:
+                pos = min(pos + 1, FINISH)
+                skipped += 1
+            moves.append(Move(BLACKLIST, pos, skipped))
+            continue
+
+        dest = returns.get(pos)
+        if dest is not None and dest != pos:
+            pos = dest
+            moves.append(Move(RETURN, pos))
+            continue
+        break
+    return Transition(pos, tuple(moves))
@@ -3,9 +3,11 @@ import json
 from pathlib import Path
 from typing import Dict, Any, List
 
+from util.startup_timer import measure
+
 _TILES_JSON = Path(__file__).resolve().parent.parent / "assets" / "tiles.json"
 
-with _TILES_JSON.open(encoding="utf-8") as fp:
+with measure("tiles.json parse"), _TILES_JSON.open(encoding="utf-8") as fp:
     _raw = json.load(fp)["tiles"]
 
 TILES: Dict[int, Dict[str, Any]] = {t["id"]: t for t in _raw}
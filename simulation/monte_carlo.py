@@ -0,0 +1,266 @@
+"""Vectorized Monte Carlo simulator for balancing a board before a race.
+
+Plays many independent team runs at once with NumPy arrays, one array step
+per turn, using the bot's own rules: the d6 capped at tile 90, RETURN tiles
+and blacklist skips via ``services.movement_service``, and the blacklist
+charge economics from ``db.teams_table`` (start with
+``DEFAULT_BLACKLIST_CHARGES``, +1 per RETURN hit up to
+``MAX_RETURN_BLACKLIST_GRANTS``). Pet proof charges are not modelled.
+
+Blacklist policy ("nearest-return"): whenever a team holds a charge it
+blacklists the nearest RETURN tile ahead of it that the bot would accept.
+
+    python -m simulation.monte_carlo --races 1000000 --teams 8 --seed 1
+    python -m simulation.monte_carlo --tiles variant.json --policy none --json
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping
+
+import numpy as np
+
+from db.teams_table import DEFAULT_BLACKLIST_CHARGES, MAX_RETURN_BLACKLIST_GRANTS
+from services.movement_service import FINISH, RETURN, compile_transitions, return_edges
+from services.tiles_service import TILES
+
+POLICIES = ("nearest-return", "none")
+# Same rule as commands.blacklist_commands._BLACKLIST_FORBIDDEN_TILES.
+_FORBIDDEN = frozenset([0, *range(80, FINISH + 1)])
+
+
+@dataclass(slots=True)
+class SimulationReport:
+    races: int
+    teams: int
+    max_turns: int
+    finish_turns: np.ndarray  # (races, teams); -1 when unfinished
+    visits: np.ndarray  # (91,) landings per tile over all runs
+    return_fires: Dict[int, int]  # RETURN tile id → times triggered
+    elapsed: float
+
+    def summary(self) -> Dict[str, Any]:
+        runs = self.finish_turns.size
+        done = self.finish_turns[self.finish_turns >= 0]
+        out: Dict[str, Any] = {
+            "races": self.races,
+            "teams": self.teams,
+            "runs": runs,
+            "unfinished": int(runs - done.size),
+            "elapsed_s": round(self.elapsed, 3),
+            "finish_turns": _describe(done),
+            "finish_turn_histogram": {
+                int(t): int(n) for t, n in zip(*np.unique(done, return_counts=True))
+            },
+            "visits_per_run": [round(float(v) / runs, 4) for v in self.visits],
+            "return_fires_per_run": {
+                tile: round(n / runs, 4) for tile, n in self.return_fires.items()
+            },
+        }
+        if self.teams > 1:
+            finished = np.where(self.finish_turns >= 0, self.finish_turns, np.iinfo(np.int32).max)
+            winners = finished.min(axis=1)
+            out["winning_turns"] = _describe(winners[winners < np.iinfo(np.int32).max])
+        return out
+
+
+def _describe(values: np.ndarray) -> Dict[str, float]:
+    if values.size == 0:
+        return {}
+    p10, p50, p90, p99 = np.percentile(values, [10, 50, 90, 99])
+    return {
+        "mean": round(float(values.mean()), 3),
+        "min": int(values.min()),
+        "p10": float(p10),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": int(values.max()),
+    }
+
+
+class _Board:
+    """Transition tables for every reachable set of blacklisted RETURN tiles.
+
+    A team can hold at most ``max_blacklisted`` blacklists, and only RETURN
+    tiles outside the forbidden rows can be blacklisted. So only masks over
+    those bits with at most that many set get a row. ``rows(masks)`` maps
+    masks to their rows.
+    """
+
+    def __init__(self, tiles: Mapping[int, Dict[str, Any]], max_blacklisted: int):
+        edges = return_edges(tiles)
+        self.return_tiles = np.array([tile for tile, _ in edges], dtype=np.int32)
+        self.blacklistable = np.array(
+            [tile not in _FORBIDDEN for tile, _ in edges], dtype=bool
+        )
+        k = len(edges)
+        bits = np.flatnonzero(self.blacklistable).tolist()
+        self.masks = np.array(
+            sorted(
+                sum(1 << j for j in chosen)
+                for r in range(min(max_blacklisted, len(bits)) + 1)
+                for chosen in itertools.combinations(bits, r)
+            ),
+            dtype=np.int64,
+        )
+        self.final = np.zeros((len(self.masks), FINISH + 1), dtype=np.int16)
+        self.fires = np.zeros((len(self.masks), FINISH + 1, k), dtype=np.int16)
+        column = {tile: j for j, (tile, _) in enumerate(edges)}
+        for row, mask in enumerate(self.masks.tolist()):
+            blacklist = [edges[j][0] for j in range(k) if mask >> j & 1]
+            for pos, transition in enumerate(compile_transitions(blacklist, tiles)):
+                self.final[row, pos] = transition.final
+                # A RETURN move is triggered by the tile the team stood on
+                # before jumping; walk the moves to attribute it.
+                at = pos
+                for move in transition.moves:
+                    if move.kind == RETURN:
+                        self.fires[row, pos, column[at]] += 1
+                    at = move.position
+
+    def rows(self, masks: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.masks, masks)
+
+
+def simulate(
+    races: int,
+    teams: int = 1,
+    tiles: Mapping[int, Dict[str, Any]] = TILES,
+    policy: str = "nearest-return",
+    max_turns: int = 1000,
+    seed: int | None = None,
+    batch: int = 250_000,
+) -> SimulationReport:
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r} (expected one of {POLICIES})")
+    started = time.perf_counter()
+    # Blacklists come from the starting charges plus the RETURN grants.
+    reachable = DEFAULT_BLACKLIST_CHARGES + MAX_RETURN_BLACKLIST_GRANTS
+    board = _Board(tiles, reachable if policy != "none" else 0)
+    rng = np.random.default_rng(seed)
+    runs = races * teams
+
+    finish = np.full(runs, -1, dtype=np.int32)
+    visits = np.zeros(FINISH + 1, dtype=np.int64)
+    fires = np.zeros(len(board.return_tiles), dtype=np.int64)
+
+    for lo in range(0, runs, batch):
+        hi = min(lo + batch, runs)
+        _simulate_batch(board, rng, policy, max_turns, finish[lo:hi], visits, fires)
+
+    return SimulationReport(
+        races=races,
+        teams=teams,
+        max_turns=max_turns,
+        finish_turns=finish.reshape(races, teams),
+        visits=visits,
+        return_fires={int(t): int(n) for t, n in zip(board.return_tiles, fires)},
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def _simulate_batch(board, rng, policy, max_turns, finish, visits, fires) -> None:
+    n = finish.size
+    pos = np.zeros(n, dtype=np.int16)
+    mask = np.zeros(n, dtype=np.int64)
+    charges = np.full(n, DEFAULT_BLACKLIST_CHARGES, dtype=np.int32)
+    grants = np.zeros(n, dtype=np.int32)
+    active = np.arange(n)
+
+    for turn in range(1, max_turns + 1):
+        if active.size == 0:
+            break
+        p = pos[active]
+        m = mask[active]
+        c = charges[active]
+
+        if policy == "nearest-return":
+            # Return tiles are sorted, so the first eligible one is the nearest.
+            wants = c > 0
+            for j, tile in enumerate(board.return_tiles):
+                if not board.blacklistable[j]:
+                    continue
+                take = wants & (tile > p) & ((m >> j) & 1 == 0)
+                m = np.where(take, m | (1 << j), m)
+                c = c - take
+                wants &= ~take
+
+        rolled = np.minimum(p + rng.integers(1, 7, size=active.size), FINISH)
+        row = board.rows(m)
+        final = board.final[row, rolled]
+        fired = board.fires[row, rolled]
+
+        hits = fired.sum(axis=1, dtype=np.int32)
+        g = grants[active]
+        granted = np.minimum(hits, MAX_RETURN_BLACKLIST_GRANTS - g)
+        charges[active] = c + granted
+        grants[active] = g + granted
+        mask[active] = m
+        pos[active] = final
+
+        visits += np.bincount(final, minlength=FINISH + 1)
+        fires += fired.sum(axis=0, dtype=np.int64)
+
+        done = final == FINISH
+        finish[active[done]] = turn
+        active = active[~done]
+
+
+def _load_tiles(path: str | None) -> Mapping[int, Dict[str, Any]]:
+    if path is None:
+        return TILES
+    with Path(path).open(encoding="utf-8") as fp:
+        return {t["id"]: t for t in json.load(fp)["tiles"]}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--races", type=int, default=100_000)
+    parser.add_argument("--teams", type=int, default=1, help="teams per race")
+    parser.add_argument("--tiles", help="tiles.json variant (default: assets/tiles.json)")
+    parser.add_argument("--policy", choices=POLICIES, default="nearest-return")
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    report = simulate(
+        races=args.races,
+        teams=args.teams,
+        tiles=_load_tiles(args.tiles),
+        policy=args.policy,
+        max_turns=args.max_turns,
+        seed=args.seed,
+    )
+    summary = report.summary()
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+        return 0
+
+    print(f"{summary['runs']:,} team runs in {summary['elapsed_s']}s")
+    print(f"finish turns: {summary['finish_turns']}")
+    if "winning_turns" in summary:
+        print(f"winning turns: {summary['winning_turns']}")
+    if summary["unfinished"]:
+        print(f"unfinished after {args.max_turns} turns: {summary['unfinished']}")
+    for tile, rate in summary["return_fires_per_run"].items():
+        print(f"RETURN {tile}: {rate} per run")
+    hottest = sorted(
+        range(FINISH), key=lambda i: summary["visits_per_run"][i], reverse=True
+    )[:10]
+    print("most visited: " + ", ".join(
+        f"{i} ({summary['visits_per_run'][i]})" for i in hottest
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
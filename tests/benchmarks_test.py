@@ -0,0 +1,67 @@
+import json
+
+from benchmarks import bench_roll, bench_storage
+from benchmarks.harness import compare, load_results, measure, percentile, write_results
+from config import DB_PATH, SQLITE_PATH
+from db.client import guild_db_path
+from db.meta_table import meta_table
+from db.members_table import members_table
+from db.pet_proofs_table import pet_proofs_table
+from db.proofs_table import proofs_table
+from db.rolls_table import rolls_table
+from db.teams_table import teams_table
+from util.guild_context import use_guild
+
+
+def _drop_guild(guild_id):
+    with use_guild(guild_id):
+        for table in (teams_table, members_table, proofs_table, rolls_table, pet_proofs_table, meta_table):
+            table.truncate()
+    for path in (DB_PATH, SQLITE_PATH):
+        guild_db_path(path, guild_id).unlink(missing_ok=True)
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([3.0], 99) == 3.0
+
+
+def test_measure_reports_per_call_time():
+    calls = []
+    result = measure(lambda: calls.append(1), repeat=4, warmup=1, number=5, size=10)
+    assert len(calls) == 1 + 4 * 5
+    assert result["runs"] == 4
+    assert result["number"] == 5
+    assert result["size"] == 10
+    assert result["min_ms"] <= result["median_ms"] <= result["p95_ms"]
+
+
+def test_compare_flags_regressions_beyond_threshold(tmp_path):
+    baseline = {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}, "c": {"median_ms": 10.0}}
+    current = {"a": {"median_ms": 11.0}, "b": {"median_ms": 13.0}, "c": {"median_ms": 5.0}, "new": {"median_ms": 1.0}}
+    path = tmp_path / "baseline.json"
+    write_results(baseline, path)
+    assert json.loads(path.read_text())["meta"]["python"]
+
+    rows = {r["name"]: r["status"] for r in compare(current, load_results(path), threshold=0.2)}
+    assert rows == {"a": "ok", "b": "regression", "c": "improvement"}
+
+
+def test_storage_suite_times_every_operation():
+    try:
+        results = bench_storage.run(repeat=1, sizes=(50,))
+    finally:
+        _drop_guild(50)
+    names = {name.split("[")[0].removeprefix("storage.") for name in results}
+    assert names == set(bench_storage.operations())
+    assert all(r["history"] == 50 for r in results.values())
+
+
+def test_roll_suite_drives_full_handler():
+    try:
+        results = bench_roll.run(repeat=12)
+    finally:
+        _drop_guild(bench_roll.GUILD_ID)
+    assert results["roll.roll_dice_command"]["runs"] == 12
@@ -0,0 +1,87 @@
+import pytest
+
+import services.board_snapshot as bs
+from game_state import build_board_embed
+from services.eta_service import estimate
+
+
+class DummyTT:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_teams(self):
+        return self.rows
+
+
+class DummyMT:
+    def __init__(self, rows):
+        self.rows = rows
+        self.scans = 0
+
+    def get_all_members(self):
+        self.scans += 1
+        return self.rows
+
+
+def _team(slug, pos=0, pending=False):
+    return {
+        "slug": slug,
+        "name": slug.title(),
+        "role_id": 1,
+        "pos": pos,
+        "color": 0,
+        "pending": pending,
+    }
+
+
+def _member(user_id, name, slug):
+    return {"user_id": user_id, "user_name": name, "team_slug": slug}
+
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    mt = DummyMT(
+        [
+            _member(1, "ann", "red"),
+            _member(2, "bob", "blue"),
+            _member(3, "cid", "red"),
+            _member(4, "dan", "gone"),
+        ]
+    )
+    monkeypatch.setattr(bs, "tt", DummyTT([_team("red", 12, True), _team("blue"), _team("green")]))
+    monkeypatch.setattr(bs, "mt", mt)
+    snap = bs.build_board_snapshot()
+    assert mt.scans == 1
+    return snap
+
+
+def test_members_grouped_by_team(snapshot):
+    assert [t.team_id for t in snapshot.teams] == ["red", "blue", "green"]
+    assert [m.name for m in snapshot.members_of("red")] == ["ann", "cid"]
+    assert [m.name for m in snapshot.members_of("blue")] == ["bob"]
+    assert snapshot.members_of("green") == ()
+
+
+def test_snapshot_is_immutable(snapshot):
+    with pytest.raises(TypeError):
+        snapshot.members["red"] = ()
+    with pytest.raises(AttributeError):
+        snapshot.teams = ()
+
+
+def test_embed_built_from_snapshot(snapshot):
+    embed = build_board_embed(snapshot, guild=None)
+    fields = embed.fields
+    assert len(fields) == 12
+    assert fields[0].value.startswith("Red · ETA")
+    assert fields[1].value == "`12`"
+    assert fields[3].value == "`ann, cid`"
+    assert fields[5].value == "`Your team needs to roll!`"
+    assert fields[11].value == "`/`"
+
+
+def test_etas_computed_with_the_snapshot(snapshot):
+    assert snapshot.eta_of("red") == estimate(12)
+    assert snapshot.eta_of("gone") is None
+    embed = build_board_embed(bs.BoardSnapshot(snapshot.teams, snapshot.members), guild=None)
+    assert embed.fields[0].value == "Red"
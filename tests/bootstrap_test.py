@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+import bot as bot_module
+from util.guild_context import current_guild_id
+
+
+class FakeChannel:
+    def __init__(self, channel_id, name=""):
+        self.id = channel_id
+        self.name = name
+
+
+class FakeGuild:
+    def __init__(self, guild_id, channels=()):
+        self.id = guild_id
+        self.channels = {c.id: c for c in channels}
+        self.fetched = []
+        self.created = []
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def fetch_channel(self, channel_id):
+        self.fetched.append(channel_id)
+        raise bot_module.discord.NotFound(_Resp(), "gone")
+
+    async def create_category(self, name):
+        self.created.append(name)
+        return FakeChannel(100, name)
+
+    async def create_text_channel(self, name, category, topic):
+        self.created.append(name)
+        return FakeChannel(100 + len(self.created), name)
+
+
+class _Resp:
+    status = 404
+    reason = "Not Found"
+
+
+@pytest.fixture
+def wired(monkeypatch):
+    written = {}
+    boards = []
+
+    async def fake_run_db(fn, *args):
+        return fn(*args)
+
+    def fake_request(_bot):
+        boards.append(current_guild_id.get())
+
+    async def fake_wait():
+        pass
+
+    monkeypatch.setattr(bot_module, "run_db", fake_run_db)
+    monkeypatch.setattr(bot_module, "request_board_update", fake_request)
+    monkeypatch.setattr(bot_module, "wait_board_refresh", fake_wait)
+    monkeypatch.setattr(bot_module, "run_migrations", lambda: 1)
+    monkeypatch.setattr(bot_module, "set_meta_many", written.update)
+    monkeypatch.setattr(bot_module, "_bootstrapped", set())
+    return written, boards
+
+
+def test_cached_channels_need_no_rest(wired, monkeypatch):
+    written, boards = wired
+    ids = {"category": 1, "board": 2, "proofs": 3, "cmd": 4}
+    monkeypatch.setattr(bot_module, "get_channel_ids", lambda: ids)
+    guild = FakeGuild(
+        7,
+        [FakeChannel(1, bot_module.DESIRED["category"]), *(FakeChannel(i) for i in (2, 3, 4))],
+    )
+    asyncio.run(bot_module.ensure_tile_race_channels(guild))
+    assert guild.fetched == [] and guild.created == []
+    assert written == {"tr_category_id": 1, "tr_board_id": 2, "tr_proofs_id": 3, "tr_cmd_id": 4}
+    assert boards == [None]
+
+
+def test_missing_channels_fall_back_to_rest_then_create(wired, monkeypatch):
+    written, _ = wired
+    monkeypatch.setattr(bot_module, "get_channel_ids", lambda: {"board": 2})
+    guild = FakeGuild(7)
+    asyncio.run(bot_module.ensure_tile_race_channels(guild))
+    assert guild.fetched == [2]
+    assert len(guild.created) == 4
+    assert set(written) == {"tr_category_id", "tr_board_id", "tr_proofs_id", "tr_cmd_id"}
+
+
+def test_guilds_bootstrap_concurrently_within_bound(wired, monkeypatch):
+    _, _ = wired
+    running = {"now": 0, "peak": 0}
+    seen = []
+
+    async def fake_ensure(guild):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        seen.append((guild.id, current_guild_id.get()))
+        running["now"] -= 1
+        if guild.id == 3:
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(bot_module, "ensure_tile_race_channels", fake_ensure)
+    guilds = [FakeGuild(i) for i in range(1, 8)]
+    asyncio.run(bot_module.bootstrap_guilds(guilds, concurrency=3))
+
+    assert running["peak"] == 3
+    assert all(gid == bound for gid, bound in seen)
+    # A failing guild is retried on the next ready; the rest are done.
+    assert bot_module._bootstrapped == {1, 2, 4, 5, 6, 7}
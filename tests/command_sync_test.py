@@ -0,0 +1,59 @@
+import asyncio
+
+import discord
+import pytest
+from discord import app_commands
+
+from commands.command_sync import command_tree_fingerprint, sync_commands_if_changed
+from db.meta_table import meta_table
+
+
+@pytest.fixture(autouse=True)
+def clear_meta():
+    meta_table.truncate()
+    yield
+    meta_table.truncate()
+
+
+def _tree(description="Roll the dice"):
+    tree = app_commands.CommandTree(discord.Client(intents=discord.Intents.none()))
+    syncs = []
+
+    @tree.command(name="roll", description=description)
+    async def roll(inter: discord.Interaction):
+        pass
+
+    @tree.command(name="blacklist", description="Blacklist a tile")
+    @app_commands.describe(tile_nr="Tile number")
+    async def blacklist(inter: discord.Interaction, tile_nr: int):
+        pass
+
+    async def sync(*, guild=None):
+        syncs.append(guild)
+        return []
+
+    tree.sync = sync
+    return tree, syncs
+
+
+def test_fingerprint_is_stable_and_tracks_changes():
+    assert command_tree_fingerprint(_tree()[0]) == command_tree_fingerprint(_tree()[0])
+    assert command_tree_fingerprint(_tree()[0]) != command_tree_fingerprint(_tree("Roll!")[0])
+
+
+def test_sync_only_when_tree_changed():
+    tree, syncs = _tree()
+    assert asyncio.run(sync_commands_if_changed(tree)) is True
+    assert asyncio.run(sync_commands_if_changed(tree)) is False
+    assert len(syncs) == 1
+
+    changed, changed_syncs = _tree("Roll the dice for your team")
+    assert asyncio.run(sync_commands_if_changed(changed)) is True
+    assert len(changed_syncs) == 1
+
+
+def test_force_always_syncs():
+    tree, syncs = _tree()
+    asyncio.run(sync_commands_if_changed(tree))
+    assert asyncio.run(sync_commands_if_changed(tree, force=True)) is True
+    assert len(syncs) == 2
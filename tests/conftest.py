@@ -0,0 +1,4 @@
+import os
+
+# Cross-check every hash index lookup against a full table scan.
+os.environ.setdefault("DB_INDEX_VERIFY", "1")
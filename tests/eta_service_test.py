@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from services.eta_service import _solve, estimate, transition_matrix
+from simulation.monte_carlo import simulate
+
+
+def test_transition_rows_are_distributions():
+    matrix = transition_matrix([24, 46])
+    assert np.allclose(matrix.sum(axis=1), 1.0)
+    # Nobody comes to rest on a RETURN tile or a blacklisted one.
+    assert matrix[:, 72].sum() == 0
+    assert matrix[:, 24].sum() == 0
+
+
+def test_end_of_board_closed_form():
+    assert estimate(90).expected == 0
+    assert estimate(89).expected == pytest.approx(1.0)
+    # From 88: a 1 leaves one roll to go, anything else finishes.
+    assert estimate(88).expected == pytest.approx(1 + 1 / 6)
+
+
+def test_blacklisting_a_return_tile_helps():
+    assert estimate(0, [24]).expected < estimate(0).expected
+
+
+def test_percentiles_are_ordered():
+    eta = estimate(30, [46])
+    assert 0 < eta.p10 <= eta.p50 <= eta.p90
+    assert eta.p10 <= eta.expected <= eta.p90
+
+
+def test_solutions_cached_per_blacklist():
+    _solve.cache_clear()
+    estimate(0, [46, 24])
+    estimate(10, [24, 46])
+    info = _solve.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_matches_simulation_without_blacklist_spending():
+    report = simulate(races=20_000, policy="none", seed=11)
+    mean = report.finish_turns.mean()
+    assert estimate(0).expected == pytest.approx(mean, rel=0.02)
+
+
+def test_solve_follows_the_given_tiles():
+    no_returns = {72: {"type": "TASK"}}
+    assert transition_matrix(tiles=no_returns)[:, 72].sum() > 0
+    assert estimate(0, tiles=no_returns).expected < estimate(0).expected
@@ -0,0 +1,41 @@
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from util.executors import run_db, run_render
+
+_var = contextvars.ContextVar("var", default=None)
+
+
+def test_db_work_runs_on_one_dedicated_thread():
+    async def main():
+        loop_thread = threading.get_ident()
+        names = await asyncio.gather(
+            *(run_db(lambda: threading.current_thread().name) for _ in range(10))
+        )
+        idents = await asyncio.gather(*(run_db(threading.get_ident) for _ in range(10)))
+        return loop_thread, set(names), set(idents)
+
+    loop_thread, names, idents = asyncio.run(main())
+    assert len(idents) == 1 and loop_thread not in idents
+    assert all(n.startswith("db-writer") for n in names)
+
+
+def test_render_work_runs_off_loop_and_propagates_context():
+    async def main():
+        _var.set("guild-1")
+        return await run_render(lambda: (threading.get_ident(), _var.get())), threading.get_ident()
+
+    (worker, value), loop_thread = asyncio.run(main())
+    assert worker != loop_thread
+    assert value == "guild-1"
+
+
+def test_exceptions_propagate_to_awaiter():
+    def boom():
+        raise ValueError("nope")
+
+    with pytest.raises(ValueError, match="nope"):
+        asyncio.run(run_db(boom))
@@ -0,0 +1,120 @@
+import asyncio
+
+import discord
+import pytest
+
+import game_state as gs
+from services.board_snapshot import BoardSnapshot
+from services.team_service import Team
+
+
+class _Resp:
+    status = 404
+    reason = "Not Found"
+
+
+def _not_found(code):
+    return discord.NotFound(_Resp(), {"code": code, "message": "Unknown"})
+
+
+class FakeMessage:
+    def __init__(self, channel, msg_id):
+        self.channel = channel
+        self.id = msg_id
+
+    async def edit(self, **kwargs):
+        kind = "edit" if "attachments" in kwargs else "edit-embed"
+        self.channel.calls.append((kind, self.id))
+        if self.channel.edit_error is not None:
+            raise self.channel.edit_error
+
+
+class FakeChannel(discord.TextChannel):
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.guild = None
+        self.calls = []
+        self.edit_error = None
+
+    def get_partial_message(self, msg_id):
+        self.calls.append(("partial", msg_id))
+        return FakeMessage(self, msg_id)
+
+    async def send(self, **kwargs):
+        self.calls.append(("send",))
+        return FakeMessage(self, 999)
+
+
+class FakeBot:
+    def __init__(self, channel):
+        self.channel = channel
+        self.fetches = 0
+
+    def get_channel(self, channel_id):
+        return None
+
+    async def fetch_channel(self, channel_id):
+        self.fetches += 1
+        return self.channel
+
+
+@pytest.fixture
+def board(monkeypatch):
+    state = {"message_id": 42, "png": b"png", "teams": ()}
+    monkeypatch.setattr(gs, "get_board_channel_id", lambda: 7)
+    monkeypatch.setattr(gs, "get_board_message_id", lambda: state["message_id"])
+    monkeypatch.setattr(gs, "set_board_message_id", lambda mid: state.update(message_id=mid))
+    monkeypatch.setattr(gs, "build_board_snapshot", lambda: BoardSnapshot(state["teams"], {}))
+    monkeypatch.setattr(gs, "render_board_png", lambda snapshot: state["png"])
+    monkeypatch.setattr(gs, "_boards", {})
+    channel = FakeChannel(7)
+    return FakeBot(channel), channel, state
+
+
+def test_edits_without_fetching_message_and_caches_channel(board):
+    bot, channel, _ = board
+    asyncio.run(gs.update_game_board(bot))
+    asyncio.run(gs.update_game_board(bot))
+    assert bot.fetches == 1
+    assert channel.calls == [("partial", 42), ("edit", 42)]
+    assert gs.board_upload_stats() == {"uploads": 1, "embed_only": 0, "skipped": 1}
+
+
+def test_deleted_message_is_reposted(board):
+    bot, channel, state = board
+    channel.edit_error = _not_found(10008)
+    asyncio.run(gs.update_game_board(bot))
+    assert channel.calls == [("partial", 42), ("edit", 42), ("send",), ("partial", 999)]
+    assert state["message_id"] == 999
+
+    channel.edit_error = None
+    state["png"] = b"moved"
+    asyncio.run(gs.update_game_board(bot))
+    assert channel.calls[-1] == ("edit", 999)
+
+
+def test_deleted_channel_drops_cache(board):
+    bot, channel, state = board
+    channel.edit_error = _not_found(gs.UNKNOWN_CHANNEL)
+    asyncio.run(gs.update_game_board(bot))
+    assert ("send",) not in channel.calls
+    assert gs._board().channel is None
+    assert state["message_id"] == 42
+
+
+def test_unchanged_image_sends_embed_only(board):
+    bot, channel, state = board
+    asyncio.run(gs.update_game_board(bot))
+    state["teams"] = (
+        Team("red", 1, "Red", 0, 0, False, [], 1),
+    )
+    asyncio.run(gs.update_game_board(bot))
+    state["png"] = b"moved"
+    asyncio.run(gs.update_game_board(bot))
+    assert channel.calls == [
+        ("partial", 42),
+        ("edit", 42),
+        ("edit-embed", 42),
+        ("edit", 42),
+    ]
+    assert gs.board_upload_stats() == {"uploads": 2, "embed_only": 1, "skipped": 0}
@@ -0,0 +1,87 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cv2")
+
+import board.geometry_cache as gc
+from board.board_detector import detect_tiles_by_bg
+
+_ROOT = Path(__file__).resolve().parent.parent
+_BG = _ROOT / "assets" / "background.png"
+_BOARD = _ROOT / "assets" / "board.png"
+
+pytestmark = pytest.mark.skipif(
+    not _BG.is_file() or not _BOARD.is_file(), reason="board PNG assets missing"
+)
+
+
+@pytest.fixture
+def assets(tmp_path):
+    bg = tmp_path / "background.png"
+    board = tmp_path / "board.png"
+    shutil.copyfile(_BG, bg)
+    shutil.copyfile(_BOARD, board)
+    gc._memo.clear()
+    yield bg, board, tmp_path / "board_state.tiles.json"
+    gc._memo.clear()
+
+
+def test_sidecar_path_sits_next_to_board_png():
+    assert gc.sidecar_path("data/board_state.png") == Path("data/board_state.tiles.json")
+
+
+def test_load_writes_sidecar_matching_detection(assets):
+    bg, board, cache = assets
+    tiles = gc.load_tile_geometry(bg, board, cache)
+    assert tiles == detect_tiles_by_bg(bg, board)
+    data = json.loads(cache.read_text())
+    assert data["key"] == gc.geometry_key(bg, board)
+    assert len(data["tiles"]) == len(tiles)
+
+
+def test_cache_hit_skips_detection(assets, monkeypatch):
+    bg, board, cache = assets
+    first = gc.load_tile_geometry(bg, board, cache)
+
+    def boom(*_a, **_kw):
+        raise AssertionError("detection should not run on a cache hit")
+
+    monkeypatch.setattr(gc, "detect_tiles_by_bg", boom)
+    assert gc.load_tile_geometry(bg, board, cache) == first
+
+
+def test_changed_image_invalidates_cache(assets, monkeypatch):
+    bg, board, cache = assets
+    gc.load_tile_geometry(bg, board, cache)
+
+    calls = []
+    monkeypatch.setattr(
+        gc, "detect_tiles_by_bg", lambda *a, **kw: calls.append(a) or [(1, 2, 3, 4)]
+    )
+    board.write_bytes(board.read_bytes() + b"\0")
+    assert gc.load_tile_geometry(bg, board, cache) == [(1, 2, 3, 4)]
+    assert len(calls) == 1
+
+
+def test_get_tile_geometry_memoizes_until_file_changes(assets, monkeypatch):
+    bg, board, cache = assets
+    tiles = gc.get_tile_geometry(bg, board, cache)
+
+    hashed = []
+    real_key = gc.geometry_key
+    monkeypatch.setattr(gc, "geometry_key", lambda *a: hashed.append(a) or real_key(*a))
+    assert gc.get_tile_geometry(bg, board, cache) is tiles
+    assert hashed == []
+
+    bg.write_bytes(bg.read_bytes() + b"\0")
+    gc.get_tile_geometry(bg, board, cache)
+    assert len(hashed) == 1
+
+
+def test_corrupt_sidecar_falls_back_to_detection(assets):
+    bg, board, cache = assets
+    cache.write_text("{not json")
+    assert len(gc.load_tile_geometry(bg, board, cache)) == 91
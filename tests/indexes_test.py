@@ -0,0 +1,91 @@
+import pytest
+from tinydb import TinyDB
+
+from db.indexes import IndexedTable, IndexMismatch
+from db.sqlite_client import SqliteDatabase
+
+
+@pytest.fixture(params=["tinydb", "sqlite"])
+def raw_db(request, tmp_path):
+    if request.param == "tinydb":
+        database = TinyDB(tmp_path / "state.json")
+    else:
+        database = SqliteDatabase(tmp_path / "state.sqlite3")
+    yield database
+    database.close()
+
+
+def test_verify_mode_is_on_in_tests():
+    assert IndexedTable.verify is True
+
+
+def test_find_tracks_insert_update_remove(raw_db):
+    t = IndexedTable(raw_db.table("members"), ("user_id",), ("team_slug",))
+    t.insert({"user_id": 1, "user_name": "a", "team_slug": "red"})
+    t.insert({"user_id": 2, "user_name": "b", "team_slug": "red"})
+    t.insert({"user_id": 3, "user_name": "c", "team_slug": "blue"})
+
+    assert [r["user_id"] for r in t.find(team_slug="red")] == [1, 2]
+    assert t.find_one(user_id=3)["team_slug"] == "blue"
+
+    t.update({"team_slug": "blue"}, doc_ids=[t.find_one(user_id=1).doc_id])
+    assert [r["user_id"] for r in t.find(team_slug="red")] == [2]
+    assert [r["user_id"] for r in t.find(team_slug="blue")] == [1, 3]
+
+    t.remove(doc_ids=[t.find_one(user_id=3).doc_id])
+    assert t.find_one(user_id=3) is None
+    assert t.count(team_slug="blue") == 1
+
+    t.truncate()
+    assert t.find(team_slug="blue") == []
+
+
+def test_composite_key(raw_db):
+    t = IndexedTable(raw_db.table("proofs"), ("team_id", "tile"))
+    t.insert({"team_id": "a", "tile": 1, "url": "x"})
+    t.insert({"team_id": "a", "tile": 2, "url": "y"})
+    assert [r["url"] for r in t.find(tile=2, team_id="a")] == ["y"]
+    assert t.find(team_id="a", tile=3) == []
+
+
+def test_latest_per_group_with_ties_and_removal(raw_db):
+    t = IndexedTable(raw_db.table("rolls"), latest=("team_id", "ts"))
+    first = t.insert({"team_id": "a", "ts": "2026-01-01T00:00:05", "die": 1})
+    t.insert({"team_id": "a", "ts": "2026-01-01T00:00:05", "die": 2})
+    t.insert({"team_id": "a", "ts": "2026-01-01T00:00:01", "die": 3})
+    t.insert({"team_id": "b", "ts": "2026-01-01T00:00:09", "die": 4})
+
+    assert t.latest("a").doc_id == first
+    t.remove(doc_ids=[first])
+    assert t.latest("a")["die"] == 2
+    assert t.latest("b")["die"] == 4
+    assert t.latest("missing") is None
+
+
+def test_mirror_loads_existing_rows_lazily(raw_db):
+    raw = raw_db.table("teams")
+    raw.insert({"slug": "old", "pos": 3})
+    t = IndexedTable(raw, ("slug",))
+    assert t.find_one(slug="old")["pos"] == 3
+
+
+def test_returned_documents_are_copies(raw_db):
+    t = IndexedTable(raw_db.table("teams"), ("slug",))
+    t.insert({"slug": "a", "blacklist_tiles": [5]})
+    t.find_one(slug="a")["blacklist_tiles"].append(9)
+    assert t.find_one(slug="a")["blacklist_tiles"] == [5]
+
+
+def test_unindexed_lookup_falls_back_to_scan(raw_db):
+    t = IndexedTable(raw_db.table("teams"), ("slug",))
+    t.insert({"slug": "a", "pos": 7})
+    assert t.find(pos=7)[0]["slug"] == "a"
+
+
+def test_verification_detects_out_of_band_writes(raw_db):
+    raw = raw_db.table("teams")
+    t = IndexedTable(raw, ("slug",))
+    t.insert({"slug": "a", "pos": 1})
+    raw.update({"pos": 2})  # bypasses the index layer
+    with pytest.raises(IndexMismatch):
+        t.find_one(slug="a")
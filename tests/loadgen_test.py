@@ -0,0 +1,49 @@
+from benchmarks.loadgen import COMMANDS, LoadReport, Sample, format_report, run_load
+from config import DB_PATH, SQLITE_PATH
+from db.client import guild_db_path
+from db.meta_table import meta_table
+from db.members_table import members_table
+from db.proofs_table import proofs_table
+from db.rolls_table import rolls_table
+from db.teams_table import teams_table
+from util.guild_context import use_guild
+
+GUILD = 9_000_000_025
+
+
+def test_drives_every_command_without_errors():
+    try:
+        report = run_load(
+            users=24, teams=4, duration=None, actions=5, latency=0.0, think=0.0,
+            guild_id=GUILD, seed=7,
+        )
+    finally:
+        with use_guild(GUILD):
+            for table in (teams_table, members_table, proofs_table, rolls_table, meta_table):
+                table.truncate()
+        for path in (DB_PATH, SQLITE_PATH):
+            guild_db_path(path, GUILD).unlink(missing_ok=True)
+
+    summary = report.summary()
+    assert summary["interactions"] == 24 * 5
+    assert summary["errors"] == 0
+    assert summary["expired"] == 0
+    assert set(summary["commands"]) == set(COMMANDS)
+    assert "roll" in format_report(summary)
+
+
+def test_summary_counts_errors_and_late_acks():
+    report = LoadReport(
+        users=2, teams=1, latency=0.0, elapsed=2.0,
+        samples=[
+            Sample("roll", 0.010, 0.005, None),
+            Sample("roll", 4.0, 3.5, None),
+            Sample("post", 0.020, None, "no reply"),
+        ],
+    )
+    summary = report.summary()
+    assert summary["throughput_per_s"] == 1.5
+    assert summary["errors"] == 1
+    assert summary["expired"] == 2
+    assert summary["commands"]["roll"]["latency_ms"]["p50"] == 10.0
+    assert summary["commands"]["post"]["errors"] == {"no reply": 1}
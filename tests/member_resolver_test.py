@@ -0,0 +1,6 @@
+import services.member_resolver as mr
+
+
+def test_mention_for_builds_from_id():
+    assert mr.mention_for(1234) == "<@1234>"
+    assert mr.mention_for("99") == "<@99>"
@@ -1,6 +1,7 @@
 import pytest
 from db.meta_table import (
     set_meta,
+    set_meta_many,
     get_meta,
     get_channel_ids,
     get_proofs_channel_id,
@@ -14,16 +15,15 @@ from db.meta_table import (
     PROOFS_CHANNEL_ID,
     COMMANDS_CHANNEL_ID,
     BOARD_MESSAGE_ID,
+    meta_table,
 )
-from db.client import db
 
 
 @pytest.fixture(autouse=True)
 def clear_meta():
-    tbl = db.table("meta")
-    tbl.truncate()
+    meta_table.truncate()
     yield
-    tbl.truncate()
+    meta_table.truncate()
 
 
 def test_get_meta_default():
@@ -84,3 +84,17 @@ def test_special_getters_and_setters():
     assert get_board_message_id() is None
     set_board_message_id(777)
     assert get_board_message_id() == 777
+
+
+def test_set_meta_many_writes_once_and_skips_unchanged(monkeypatch):
+    import db.meta_table as mt
+
+    set_meta(BOARD_CHANNEL_ID, 1)
+    batches = []
+    real = mt.batched_writes
+    monkeypatch.setattr(mt, "batched_writes", lambda: batches.append(1) or real())
+
+    set_meta_many({BOARD_CHANNEL_ID: 1, PROOFS_CHANNEL_ID: 2, COMMANDS_CHANNEL_ID: 3})
+    assert get_channel_ids()["proofs"] == 2 and get_channel_ids()["cmd"] == 3
+    set_meta_many({BOARD_CHANNEL_ID: 1, PROOFS_CHANNEL_ID: 2})
+    assert batches == [1]
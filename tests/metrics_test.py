@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from discord import Colour
+
+from commands.stats_command import bot_stats_text
+from db.teams_table import add_team, get_team, teams_table
+from util import metrics
+from util.executors import run_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+    teams_table.truncate()
+
+
+def _hist(name, **labels):
+    return metrics._histograms[metrics._key(name, labels)]
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    hist = metrics.Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        hist.observe(value)
+    assert hist.count == 4
+    assert hist.counts == [1, 2, 1, 0]
+    assert hist.quantile(0.5) == pytest.approx(1.5)
+    assert 2.0 < hist.quantile(0.99) <= 4.0
+
+
+def test_text_exposition_is_cumulative():
+    metrics.observe("req_seconds", 0.003, route="/x")
+    metrics.observe("req_seconds", 2.0, route="/x")
+    metrics.inc("errors_total", route="/x")
+    text = metrics.render_text()
+    assert "# TYPE req_seconds histogram" in text
+    assert 'req_seconds_bucket{route="/x",le="0.005"} 1' in text
+    assert 'req_seconds_bucket{route="/x",le="+Inf"} 2' in text
+    assert 'req_seconds_count{route="/x"} 2' in text
+    assert "# TYPE errors_total counter" in text
+    assert 'errors_total{route="/x"} 1' in text
+
+
+def test_commands_are_timed_and_failures_counted():
+    metrics.start_command("roll")
+    metrics.finish_command()
+    metrics.start_command("roll")
+    metrics.finish_command(failed=True)
+    metrics.finish_command(failed=True)  # nothing running: ignored
+    assert _hist("command_seconds", command="roll").count == 2
+    assert metrics._counters[metrics._key("command_errors_total", {"command": "roll"})] == 1
+
+
+def test_tree_hooks_time_commands():
+    import bot
+
+    def inter(name):
+        return SimpleNamespace(
+            guild_id=1, type=bot.discord.InteractionType.application_command, data={"name": name},
+            command=None,
+        )
+
+    async def invoke(name, error=None):
+        # As in discord.py: checks and on_error run in the interaction's task,
+        # the completion event in a task dispatched from it.
+        assert await bot.cmds.interaction_check(inter(name))
+        if error is None:
+            await asyncio.create_task(bot.on_app_command_completion(inter(name), None))
+        else:
+            await bot.cmds.on_error(inter(name), error)
+
+    async def main():
+        await asyncio.create_task(invoke("roll"))
+        await asyncio.create_task(invoke("post", bot.app_commands.AppCommandError("boom")))
+
+    asyncio.run(main())
+    assert _hist("command_seconds", command="roll").count == 1
+    assert _hist("command_seconds", command="post").count == 1
+    assert metrics._counters[metrics._key("command_errors_total", {"command": "post"})] == 1
+
+
+def test_rest_calls_inside_a_command_record_defer_and_followup():
+    ctx = SimpleNamespace(start=0.0)
+    metrics.start_command("roll")
+    ctx.start = metrics.time.perf_counter()
+    metrics._observe_rest(ctx, "POST", "/api/v10/interactions/123/" + "t" * 60 + "/callback", 204)
+    metrics._observe_rest(ctx, "POST", "/api/v10/webhooks/456/" + "t" * 60, 200)
+    metrics.finish_command()
+    metrics._observe_rest(ctx, "PATCH", "/api/v10/channels/1/messages/2", 200)
+
+    assert _hist("command_defer_seconds", command="roll").count == 1
+    assert _hist("command_followup_seconds", command="roll").count == 1
+    route = _hist("discord_rest_seconds", method="PATCH", route="/channels/{id}/messages/{id}", status=200)
+    assert route.count == 1
+
+
+def test_rest_route_normalisation():
+    assert metrics.rest_route("/api/v10/webhooks/1/" + "a" * 70 + "/messages/@original") == (
+        "/webhooks/{id}/{token}/messages/@original"
+    )
+
+
+def test_run_db_records_duration_and_rows_scanned():
+    add_team("Red", "red", 1, Colour(0))
+    add_team("Blue", "blue", 2, Colour(0))
+    asyncio.run(run_db(get_team, "red"))
+    name = "db.teams_table.get_team"
+    assert _hist("db_call_seconds", fn=name).count == 1
+    assert _hist("db_queue_seconds", fn=name).count == 1
+    rows = _hist("db_rows_scanned", fn=name)
+    assert rows.count == 1 and rows.sum == 1
+
+
+def test_bot_stats_summary_lists_commands():
+    metrics.start_command("roll")
+    metrics.finish_command()
+    text = bot_stats_text()
+    assert "command_seconds[roll]" in text
+    assert "board uploads" in text
@@ -0,0 +1,103 @@
+import pytest
+
+import db.migrations as migrations
+from db.client import db
+from db.meta_table import SCHEMA_VERSION_KEY, get_meta, meta_table, set_meta
+from db.teams_table import get_team, teams_table
+
+
+@pytest.fixture(autouse=True)
+def clear_tables():
+    teams_table.truncate()
+    meta_table.truncate()
+    yield
+    teams_table.truncate()
+    meta_table.truncate()
+
+
+def _legacy_team(slug, **extra):
+    teams_table.insert(
+        {
+            "slug": slug,
+            "name": slug.title(),
+            "role_id": 1,
+            "pos": 0,
+            "color": 0,
+            "pending": False,
+            **extra,
+        }
+    )
+
+
+def test_backfills_legacy_team_docs_and_records_version():
+    _legacy_team("old", blacklist_tile=30)
+    _legacy_team("bare")
+    _legacy_team("new", blacklist_tiles=[5], blacklist_charges=3)
+
+    assert migrations.run_migrations() == migrations.SCHEMA_VERSION
+    assert get_meta(SCHEMA_VERSION_KEY) == migrations.SCHEMA_VERSION
+
+    old = get_team("old")
+    assert old["blacklist_tiles"] == [30] and old["blacklist_charges"] == 1
+    bare = get_team("bare")
+    assert bare["blacklist_tiles"] == [] and bare["blacklist_charges"] == 1
+    new = get_team("new")
+    assert new["blacklist_tiles"] == [5] and new["blacklist_charges"] == 3
+
+
+def test_read_path_no_longer_writes():
+    _legacy_team("old", blacklist_tile=30)
+    assert "blacklist_tiles" not in get_team("old")
+    assert "blacklist_tiles" not in teams_table.find_one(slug="old")
+
+
+def test_already_current_schema_is_a_no_op(monkeypatch):
+    set_meta(SCHEMA_VERSION_KEY, migrations.SCHEMA_VERSION)
+    called = []
+    monkeypatch.setattr(
+        migrations, "MIGRATIONS", [(migrations.SCHEMA_VERSION, lambda: called.append(1))]
+    )
+    assert migrations.run_migrations() == migrations.SCHEMA_VERSION
+    assert called == []
+
+
+def test_pending_steps_land_in_one_storage_write(monkeypatch):
+    _legacy_team("a")
+    _legacy_team("b")
+    if not hasattr(db, "storage"):
+        pytest.skip("storage write counting applies to the TinyDB backend")
+    writes = []
+    real_write = db.storage.write
+    monkeypatch.setattr(db.storage, "write", lambda data: writes.append(1) or real_write(data))
+
+    migrations.run_migrations()
+    assert len(writes) == 1
+    assert get_team("a")["blacklist_charges"] == 1
+
+
+def test_failed_batch_writes_nothing_and_resets_mirrors():
+    from db.client import batched_writes
+
+    _legacy_team("kept")
+    with pytest.raises(RuntimeError):
+        with batched_writes():
+            _legacy_team("a")
+            teams_table.update({"pos": 5}, doc_ids=[get_team("kept").doc_id])
+            assert get_team("a") is not None
+            raise RuntimeError("step failed")
+
+    assert get_team("a") is None
+    assert get_team("kept")["pos"] == 0
+    assert len(teams_table.all()) == 1
+
+
+def test_failed_migration_keeps_schema_version(monkeypatch):
+    def broken():
+        _legacy_team("half")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", [*migrations.MIGRATIONS, (999, broken)])
+    with pytest.raises(RuntimeError):
+        migrations.run_migrations()
+    assert get_meta(SCHEMA_VERSION_KEY) != 999
+    assert get_team("half") is None
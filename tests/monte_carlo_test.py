@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+import pytest
+
+from services.tiles_service import TILES
+from simulation.monte_carlo import main, simulate
+
+
+def test_same_seed_same_result():
+    a = simulate(races=500, teams=2, seed=7)
+    b = simulate(races=500, teams=2, seed=7)
+    assert np.array_equal(a.finish_turns, b.finish_turns)
+    assert np.array_equal(a.visits, b.visits)
+    assert a.return_fires == b.return_fires
+
+
+def test_every_run_finishes_within_bounds():
+    report = simulate(races=2000, seed=1)
+    turns = report.finish_turns
+    assert turns.shape == (2000, 1)
+    assert (turns >= 0).all()
+    # 90 tiles with at most 6 per roll.
+    assert turns.min() >= 15
+    # Every run lands on the finish exactly once.
+    assert report.visits[90] == 2000
+
+
+def test_returns_only_fire_without_blacklist_and_batches_agree():
+    report = simulate(races=3000, policy="none", seed=3, batch=1000)
+    assert set(report.return_fires) == {24, 46, 72}
+    assert all(n > 0 for n in report.return_fires.values())
+    # Teams are sent back, so they never come to rest on a RETURN tile.
+    assert report.visits[[24, 46, 72]].sum() == 0
+
+
+def test_blacklisting_first_return_stops_it_firing():
+    report = simulate(races=2000, policy="nearest-return", seed=3)
+    assert report.return_fires[24] == 0
+
+
+def test_tile_variant_without_returns():
+    tiles = {
+        tile_id: {**tile, "type": "NORMAL", "destination_id": None}
+        for tile_id, tile in TILES.items()
+    }
+    report = simulate(races=1000, tiles=tiles, seed=5)
+    assert report.return_fires == {}
+    assert report.finish_turns.max() <= 90
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        simulate(races=1, policy="greedy")
+
+
+def test_cli_json(capsys):
+    assert main(["--races", "200", "--teams", "3", "--seed", "1", "--json"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["runs"] == 600
+    assert summary["unfinished"] == 0
+    assert summary["winning_turns"]["mean"] <= summary["finish_turns"]["mean"]
+    assert len(summary["visits_per_run"]) == 91
+
+
+def test_only_reachable_blacklist_masks_are_tabulated():
+    from simulation.monte_carlo import _Board
+
+    # 16 blacklistable RETURN tiles: 2**16 subsets, but at most 3 can be held.
+    tiles = {i: {"id": i} for i in range(91)}
+    for n, tile in enumerate(range(10, 74, 4)):
+        tiles[tile] = {"id": tile, "type": "RETURN", "destination_id": tile - 3 - n % 3}
+    board = _Board(tiles, max_blacklisted=3)
+    assert len(board.masks) == 1 + 16 + 120 + 560
+    assert _Board(tiles, max_blacklisted=0).masks.tolist() == [0]
+    assert board.rows(np.array([0, board.masks[-1]])).tolist() == [0, len(board.masks) - 1]
@@ -0,0 +1,98 @@
+import random
+
+from services.movement_service import (
+    BLACKLIST,
+    RETURN,
+    compile_transitions,
+    resolve_move,
+    return_edges,
+)
+from services.tiles_service import TILES, get_tile
+
+
+def _reference(position, blacklist):
+    """The pre-compiled per-roll loop from roll_command, without side effects."""
+    final_pos = position
+    kinds = []
+    for _ in range(20):
+        redirected = final_pos
+        if blacklist and final_pos < 90:
+            while redirected in blacklist and redirected < 90:
+                redirected = min(redirected + 1, 90)
+        if redirected != final_pos:
+            final_pos = redirected
+            kinds.append(BLACKLIST)
+            continue
+        tile = get_tile(final_pos) or {}
+        dest = tile.get("destination_id") if tile.get("type") == "RETURN" else None
+        if dest is not None and dest != final_pos:
+            final_pos = dest
+            kinds.append(RETURN)
+            continue
+        break
+    return final_pos, kinds
+
+
+def test_return_edges_come_from_tiles_json():
+    assert return_edges() == ((24, 17), (46, 40), (72, 67))
+
+
+def test_table_covers_whole_board():
+    table = compile_transitions([])
+    assert len(table) == 91
+    assert table[24].final == 17
+    assert [m.kind for m in table[24].moves] == [RETURN]
+    assert table[10].final == 10 and table[10].moves == ()
+
+
+def test_blacklist_chain_then_return():
+    t = resolve_move(22, [22, 23])
+    assert t.final == 17
+    assert [(m.kind, m.position, m.skipped) for m in t.moves] == [
+        (BLACKLIST, 24, 2),
+        (RETURN, 17, 0),
+    ]
+
+
+def test_blacklisted_return_tile_is_skipped():
+    t = resolve_move(24, [24])
+    assert t.final == 25
+    assert [m.kind for m in t.moves] == [BLACKLIST]
+
+
+def test_matches_reference_loop_for_random_blacklists():
+    rng = random.Random(1234)
+    for _ in range(200):
+        blacklist = set(rng.sample(range(1, 80), rng.randint(0, 8)))
+        table = compile_transitions(blacklist)
+        for pos in range(91):
+            final, kinds = _reference(pos, blacklist)
+            assert table[pos].final == final
+            assert [m.kind for m in table[pos].moves] == kinds
+
+
+def test_tables_are_cached_per_blacklist():
+    assert compile_transitions([30, 5]) is compile_transitions([5, 30, 30])
+    assert compile_transitions([5]) is not compile_transitions([6])
+
+
+def test_custom_tile_set_uses_its_own_returns():
+    tiles = dict(TILES)
+    tiles[10] = {"id": 10, "type": "RETURN", "destination_id": 2}
+    assert compile_transitions([], tiles)[10].final == 2
+    assert compile_transitions([])[10].final == 10
+
+
+def test_roll_uses_the_blacklist_stored_at_roll_time():
+    from discord import Colour
+
+    from commands.roll_command import _apply_tile_effect
+    from db.teams_table import add_blacklist_tile, add_team, teams_table
+
+    add_team("Red", "red", 1, Colour(0))
+    try:
+        assert _apply_tile_effect(30, "red") == (30, "")
+        add_blacklist_tile("red", 30)  # e.g. a /blacklist after the team lookup
+        assert _apply_tile_effect(30, "red") == (31, " 🚫 Blacklist hit, moved to 31.")
+    finally:
+        teams_table.truncate()
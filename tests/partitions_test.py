@@ -0,0 +1,134 @@
+import asyncio
+import threading
+
+import pytest
+from discord import Colour
+
+from config import DB_PATH, SQLITE_PATH
+import db.client as client
+from db.client import LEGACY_ADOPTED_KEY, adopt_legacy_state, db, guild_db_path
+from db.meta_table import get_meta, meta_table, set_meta
+from db.partitions import Partitioned
+from db.teams_table import add_team, get_team, get_teams, teams_table
+from util.executors import run_db
+from util.guild_context import current_partition, partition_key, use_guild
+
+GUILD_A = 9_000_000_001
+GUILD_B = 9_000_000_002
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    yield
+    for guild in (None, GUILD_A, GUILD_B):
+        with use_guild(guild):
+            teams_table.truncate()
+            meta_table.truncate()
+    for guild in (GUILD_A, GUILD_B):
+        for path in (DB_PATH, SQLITE_PATH):
+            guild_db_path(path, guild).unlink(missing_ok=True)
+
+
+def test_guild_paths():
+    assert guild_db_path(DB_PATH, None) == DB_PATH
+    assert guild_db_path(DB_PATH, 42).name == f"{DB_PATH.stem}.42{DB_PATH.suffix}"
+
+
+def test_guilds_see_only_their_own_state():
+    with use_guild(GUILD_A):
+        add_team("Red", "red", 1, Colour(0))
+        set_meta("tr_board_id", 1)
+    with use_guild(GUILD_B):
+        add_team("Blue", "blue", 2, Colour(0))
+        set_meta("tr_board_id", 2)
+        assert [t["slug"] for t in get_teams()] == ["blue"]
+        assert get_team("red") is None
+        assert get_meta("tr_board_id") == 2
+    with use_guild(GUILD_A):
+        assert [t["slug"] for t in get_teams()] == ["red"]
+        assert get_meta("tr_board_id") == 1
+    assert get_teams() == []
+    assert db.for_guild(GUILD_A) is not db.for_guild(GUILD_B)
+
+
+def test_instances_are_created_once_per_partition():
+    made = []
+    p = Partitioned(lambda key: made.append(key) or object())
+    with use_guild(GUILD_A):
+        first = p.current()
+        assert p.current() is first
+    assert p.for_guild(GUILD_A) is first
+    assert p.current() is not first
+    assert made == [GUILD_A, None]
+
+
+def test_default_guild_uses_unscoped_partition(monkeypatch):
+    import util.guild_context as gc
+
+    monkeypatch.setattr(gc, "DB_DEFAULT_GUILD_ID", GUILD_A)
+    assert partition_key(GUILD_A) is None
+    assert partition_key(GUILD_B) == GUILD_B
+    with use_guild(GUILD_A):
+        assert current_partition() is None
+
+
+def test_each_guild_gets_its_own_db_thread():
+    async def thread_for(guild):
+        with use_guild(guild):
+            return await run_db(threading.current_thread)
+
+    async def main():
+        return await asyncio.gather(thread_for(GUILD_A), thread_for(GUILD_B), thread_for(GUILD_A))
+
+    a, b, a_again = asyncio.run(main())
+    assert a is a_again
+    assert a is not b
+
+
+def test_team_locks_are_per_guild():
+    from commands.roll_command import get_team_lock, team_locks
+
+    try:
+        with use_guild(GUILD_A):
+            a = get_team_lock("red")
+            assert get_team_lock("red") is a
+        with use_guild(GUILD_B):
+            assert get_team_lock("red") is not a
+    finally:
+        team_locks.clear()
+
+
+def _legacy_team():
+    add_team("Red", "red", 1, Colour(0))
+    set_meta("tr_board_id", 7)
+
+
+def test_single_guild_adopts_unscoped_state_once():
+    _legacy_team()
+    assert adopt_legacy_state([GUILD_A]) == GUILD_A
+    with use_guild(GUILD_A):
+        assert [t["slug"] for t in get_teams()] == ["red"]
+        assert get_meta("tr_board_id") == 7
+    assert get_meta(LEGACY_ADOPTED_KEY) == GUILD_A
+    assert adopt_legacy_state([GUILD_B]) is None
+    with use_guild(GUILD_B):
+        assert get_teams() == []
+
+
+def test_no_adoption_when_default_guild_is_set(monkeypatch):
+    monkeypatch.setattr(client, "DB_DEFAULT_GUILD_ID", GUILD_B)
+    _legacy_team()
+    assert adopt_legacy_state([GUILD_A]) is None
+    with use_guild(GUILD_A):
+        assert get_teams() == []
+    assert get_meta(LEGACY_ADOPTED_KEY) is None
+
+
+def test_no_adoption_with_several_guilds(caplog):
+    _legacy_team()
+    assert adopt_legacy_state([GUILD_A, GUILD_B]) is None
+    for guild in (GUILD_A, GUILD_B):
+        with use_guild(guild):
+            assert get_teams() == []
+    assert get_meta(LEGACY_ADOPTED_KEY) is None
+    assert "2 guilds are connected" in caplog.text
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from board.geometry_cache import get_tile_geometry
+from board.render_worker import RenderWorker, compact_teams
+from board.visualize import IncrementalBoardRenderer, load_board_image
+from services.team_service import Team
+
+ASSETS = Path(__file__).resolve().parent.parent / "assets"
+
+
+def _team(slug, pos, color, blacklist=()):
+    return Team(slug, 1, slug, pos, color, False, list(blacklist), 1)
+
+
+@pytest.fixture(scope="module")
+def worker(tmp_path_factory):
+    sidecar = tmp_path_factory.mktemp("render") / "board.tiles.json"
+    w = RenderWorker(ASSETS / "background.png", ASSETS / "board.png", sidecar, timeout=60)
+    yield w, sidecar
+    w.close()
+
+
+def test_compact_snapshot_keeps_only_render_fields():
+    assert compact_teams([_team("a", 3, 0xFF, [5, 7])]) == (("a", 3, 0xFF, (5, 7)),)
+
+
+def test_worker_matches_in_process_render(worker):
+    w, sidecar = worker
+    teams = [_team("a", 3, 0xFF0000, [12]), _team("b", 3, 0x00FF00)]
+    png = w.render("guild", teams)
+
+    tiles = get_tile_geometry(ASSETS / "background.png", ASSETS / "board.png", sidecar)
+    local = IncrementalBoardRenderer(load_board_image(ASSETS / "board.png"), tiles)
+    assert png == local.render_png(teams)
+
+
+def test_worker_restarts_after_crash(worker):
+    w, _ = worker
+    teams = [_team("a", 10, 0x0000FF)]
+    first = w.render("guild", teams)
+    w._process.kill()
+    w._process.join()
+    assert w.render("guild", teams) == first
+    assert w.restarts == 1
@@ -0,0 +1,99 @@
+import asyncio
+
+from util.single_flight import CoalescingScheduler
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_single_request_runs_once():
+    calls = []
+
+    async def job():
+        calls.append(1)
+
+    async def main():
+        s = CoalescingScheduler(job)
+        s.request()
+        await s.wait_idle()
+        return s
+
+    s = _run(main())
+    assert calls == [1]
+    assert s.stats() == {"requested": 1, "coalesced": 0, "executed": 1, "failed": 0}
+
+
+def test_requests_during_run_collapse_into_one_trailing_run():
+    active = 0
+    peak = 0
+    runs = 0
+    started = None
+
+    async def job():
+        nonlocal active, peak, runs
+        active += 1
+        peak = max(peak, active)
+        runs += 1
+        if runs == 1:
+            started.set()
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    async def main():
+        nonlocal started
+        started = asyncio.Event()
+        s = CoalescingScheduler(job)
+        s.request()
+        await started.wait()
+        for _ in range(5):
+            s.request()
+        await s.wait_idle()
+        return s
+
+    s = _run(main())
+    assert peak == 1
+    assert runs == 2
+    assert s.stats() == {"requested": 6, "coalesced": 4, "executed": 2, "failed": 0}
+
+
+def test_debounce_window_merges_burst_into_first_run():
+    runs = 0
+
+    async def job():
+        nonlocal runs
+        runs += 1
+
+    async def main():
+        s = CoalescingScheduler(job, debounce=0.02)
+        for _ in range(10):
+            s.request()
+            await asyncio.sleep(0)
+        await s.wait_idle()
+        return s
+
+    s = _run(main())
+    assert runs == 1
+    assert s.requested == 10 and s.coalesced == 9 and s.executed == 1
+
+
+def test_failed_job_is_counted_and_scheduler_recovers():
+    runs = 0
+
+    async def job():
+        nonlocal runs
+        runs += 1
+        if runs == 1:
+            raise RuntimeError("boom")
+
+    async def main():
+        s = CoalescingScheduler(job)
+        s.request()
+        await s.wait_idle()
+        s.request()
+        await s.wait_idle()
+        return s
+
+    s = _run(main())
+    assert runs == 2
+    assert s.failed == 1 and s.executed == 2
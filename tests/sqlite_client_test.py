@@ -0,0 +1,117 @@
+import pytest
+from tinydb import Query, TinyDB
+
+from db.sqlite_client import SqliteDatabase, _compile
+from db.tinydb_to_sqlite import migrate_tinydb_to_sqlite
+
+Q = Query()
+
+
+@pytest.fixture
+def sdb(tmp_path):
+    database = SqliteDatabase(tmp_path / "state.sqlite3")
+    yield database
+    database.close()
+
+
+def test_wal_mode_enabled(sdb):
+    (mode,) = sdb._conn.execute("PRAGMA journal_mode").fetchone()
+    assert mode == "wal"
+
+
+def test_insert_get_search_update_remove(sdb):
+    t = sdb.table("teams")
+    a = t.insert({"slug": "a", "pos": 0, "pending": False})
+    t.insert({"slug": "b", "pos": 3, "pending": True})
+
+    row = t.get(Q.slug == "a")
+    assert row == {"slug": "a", "pos": 0, "pending": False}
+    assert row.doc_id == a
+    assert [r["slug"] for r in t.search(Q.pending == True)] == ["b"]
+
+    assert t.update({"pos": 5, "pending": True}, Q.slug == "a") == [a]
+    assert t.get(doc_id=a)["pos"] == 5
+    assert t.update({"pos": 1}, Q.slug == "missing") == []
+
+    assert t.remove(Q.slug == "a") == [a]
+    assert t.get(Q.slug == "a") is None
+    assert len(t) == 1
+
+
+def test_compound_query_and_callable_update(sdb):
+    t = sdb.table("proofs")
+    t.insert({"team_id": "x", "tile": 3, "url": "u1"})
+    t.insert({"team_id": "x", "tile": 4, "url": "u2"})
+    t.insert({"team_id": "y", "tile": 3, "url": "u3"})
+
+    rows = t.search((Q.team_id == "x") & (Q.tile == 3))
+    assert [r["url"] for r in rows] == ["u1"]
+
+    def bump(doc):
+        doc["tile"] += 10
+
+    t.update(bump, Q.team_id == "y")
+    assert t.get(Q.team_id == "y")["tile"] == 13
+
+
+def test_non_translatable_query_falls_back_to_python(sdb):
+    t = sdb.table("rolls")
+    t.insert({"team_id": "a", "die": 2})
+    t.insert({"team_id": "a", "die": 6})
+    assert _compile((Q.die > 3)._hash) is None
+    assert [r["die"] for r in t.search(Q.die > 3)] == [6]
+
+
+def test_equality_lookup_uses_expression_index(sdb):
+    t = sdb.table("members")
+    t.insert({"user_id": 1, "team_slug": "a"})
+    sql, params = _compile((Q.user_id == 1)._hash)
+    plan = sdb._conn.execute(
+        f'EXPLAIN QUERY PLAN SELECT doc FROM "members" WHERE {sql}', params
+    ).fetchall()
+    assert any("ix_members_user_id" in row[-1] for row in plan)
+
+
+def test_values_survive_json_round_trip(sdb):
+    t = sdb.table("meta")
+    t.insert({"key": "k", "value": None})
+    t.insert({"key": "big", "value": 1234567890123456789})
+    assert t.get(Q.key == "k")["value"] is None
+    assert t.get(Q.key == "big")["value"] == 1234567890123456789
+    t.update({"value": [1, 2]}, Q.key == "k")
+    assert t.get(Q.key == "k")["value"] == [1, 2]
+
+
+def test_transaction_rolls_back_on_error(sdb):
+    t = sdb.table("teams")
+    with pytest.raises(RuntimeError):
+        with sdb.transaction():
+            t.insert({"slug": "a"})
+            raise RuntimeError
+    assert t.all() == []
+
+
+def test_migrate_tinydb_to_sqlite(tmp_path):
+    src = tmp_path / "state.json"
+    tdb = TinyDB(src)
+    tdb.table("teams").insert({"slug": "a", "pos": 4})
+    tdb.table("teams").insert({"slug": "b", "pos": 9})
+    tdb.table("meta").insert({"key": "tr_board_id", "value": 123})
+    tdb.close()
+
+    dst = tmp_path / "state.sqlite3"
+    counts = migrate_tinydb_to_sqlite(src, dst)
+    assert counts["teams"] == 2 and counts["meta"] == 1
+
+    sdb = SqliteDatabase(dst)
+    try:
+        rows = sdb.table("teams").all()
+        assert [(r.doc_id, r["slug"]) for r in rows] == [(1, "a"), (2, "b")]
+        assert sdb.table("meta").get(Q.key == "tr_board_id")["value"] == 123
+        # doc ids continue after the migrated rows
+        assert sdb.table("teams").insert({"slug": "c"}) == 3
+    finally:
+        sdb.close()
+
+    with pytest.raises(ValueError):
+        migrate_tinydb_to_sqlite(src, dst)
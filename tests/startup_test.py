@@ -0,0 +1,35 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from util import startup_timer
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_importing_bot_does_not_load_rendering_stack(tmp_path):
+    code = (
+        "import sys, bot; "
+        "print(sorted(m for m in ('cv2', 'numpy') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"DB_PATH": str(tmp_path / "state.json"), "PATH": ""},
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_report_lists_marked_and_nested_stages():
+    startup_timer.mark("imports")
+    with startup_timer.measure("tiles.json parse"):
+        pass
+    startup_timer.mark("command tree")
+    names = [name for name, _, _ in startup_timer.stages()]
+    assert names[-3:] == ["imports", "tiles.json parse", "command tree"]
+    report = startup_timer.report()
+    assert report.startswith("Startup: ")
+    assert "    tiles.json parse" in report
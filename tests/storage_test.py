@@ -0,0 +1,69 @@
+import json
+import time
+
+import pytest
+from tinydb import Query
+
+from db.storage import AtomicJSONStorage, open_write_behind_db
+
+Q = Query()
+
+
+def _on_disk(path):
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def test_atomic_storage_round_trip_and_no_leftover_tmp(tmp_path):
+    path = tmp_path / "state.json"
+    storage = AtomicJSONStorage(path)
+    assert storage.read() is None
+    storage.write({"teams": {"1": {"slug": "a"}}})
+    assert storage.read() == {"teams": {"1": {"slug": "a"}}}
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "state.json"
+    storage = AtomicJSONStorage(path)
+    storage.write({"ok": 1})
+    with pytest.raises(TypeError):
+        storage.write({"bad": object()})
+    assert _on_disk(path) == {"ok": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+def test_writes_are_batched_until_flush_every(tmp_path):
+    path = tmp_path / "state.json"
+    db = open_write_behind_db(path, flush_interval=0, flush_every=3)
+    t = db.table("teams")
+    t.insert({"slug": "a"})
+    t.insert({"slug": "b"})
+    assert _on_disk(path) is None
+    assert t.get(Q.slug == "b") is not None  # reads come from memory
+    t.update({"pos": 4}, Q.slug == "a")
+    assert _on_disk(path)["teams"]["1"] == {"slug": "a", "pos": 4}
+    assert db.storage.flushes == 1
+    db.close()
+
+
+def test_timer_flushes_pending_writes(tmp_path):
+    path = tmp_path / "state.json"
+    db = open_write_behind_db(path, flush_interval=0.05, flush_every=1000)
+    db.table("meta").insert({"key": "k", "value": 1})
+    assert _on_disk(path) is None
+    deadline = time.monotonic() + 2
+    while _on_disk(path) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _on_disk(path)["meta"]["1"] == {"key": "k", "value": 1}
+    db.close()
+
+
+def test_close_flushes_and_reopen_sees_data(tmp_path):
+    path = tmp_path / "state.json"
+    db = open_write_behind_db(path, flush_interval=0, flush_every=1000)
+    db.table("rolls").insert({"team_id": "a", "die": 3})
+    db.close()
+
+    db = open_write_behind_db(path, flush_interval=0, flush_every=1000)
+    assert db.table("rolls").get(Q.team_id == "a")["die"] == 3
+    db.close()
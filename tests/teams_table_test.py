@@ -11,7 +11,9 @@ from db.teams_table import (
     get_blacklist_charges,
     get_blacklist_tiles,
     increment_return_blacklist_grant_if_allowed,
+    mutate_team,
     replace_blacklist_tile,
+    spend_charge_on_blacklist_tile,
     remove_team,
     get_team,
     get_teams,
@@ -95,6 +97,38 @@ def test_return_blacklist_grant_cap():
     assert get_team("fox")["return_blacklist_grants"] == 2
 
 
+def test_mutate_team_reads_once_and_writes_once(monkeypatch):
+    add_team("Golf", "golf", 12, Colour.dark_gold())
+    writes = []
+    real_update = tt.teams_table.update
+
+    def counting_update(*args, **kwargs):
+        writes.append(args)
+        return real_update(*args, **kwargs)
+
+    monkeypatch.setattr(tt.teams_table, "update", counting_update)
+
+    result = mutate_team("golf", lambda doc: ({"pos": doc["pos"] + 3}, "moved"))
+    assert result == "moved"
+    assert len(writes) == 1
+    assert get_team("golf")["pos"] == 3
+
+    assert mutate_team("golf", lambda doc: (None, doc["pos"])) == 3
+    assert len(writes) == 1
+    assert mutate_team("nobody", lambda doc: ({"pos": 1}, "x")) is None
+
+
+def test_spend_charge_on_blacklist_tile():
+    add_team("Hotel", "hotel", 13, Colour.magenta())
+    assert spend_charge_on_blacklist_tile("hotel", 20) == (True, 0, [20])
+    assert spend_charge_on_blacklist_tile("hotel", 25) == (False, 0, [20])
+    add_blacklist_charges("hotel", 1)
+    assert spend_charge_on_blacklist_tile("hotel", 25, old_tile=99) == (False, 1, [20])
+    assert spend_charge_on_blacklist_tile("hotel", 25, old_tile=20) == (True, 0, [25])
+    assert get_blacklist_tiles("hotel") == [25]
+    assert spend_charge_on_blacklist_tile("nobody", 25) is None
+
+
 def test_clear_pending_on_nonexistent():
     # should not raise, returns empty list
     result = clear_pending_flag("no_such")
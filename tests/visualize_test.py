@@ -0,0 +1,97 @@
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+import numpy as np
+
+from board.visualize import (
+    IncrementalBoardRenderer,
+    encode_png,
+    paint_team_circles,
+    render_board,
+)
+from services.team_service import Team
+
+_TILES = [(0, 0, 100, 100), (100, 0, 100, 100), (200, 0, 100, 100)]
+
+
+def _team(slug, pos, color, blacklist=()):
+    return Team(
+        team_id=slug,
+        role_id=1,
+        name=slug,
+        position=pos,
+        color=color,
+        pending=False,
+        blacklist_tiles=list(blacklist),
+        blacklist_charges=1,
+    )
+
+
+def _base():
+    return np.full((100, 300, 3), 40, dtype=np.uint8)
+
+
+def test_render_board_leaves_base_untouched():
+    base = _base()
+    out = render_board(base, _TILES, [_team("a", 1, 0xFF0000, [2])])
+    assert (base == 40).all()
+    assert not (out[:, 100:200] == 40).all()
+    assert not (out[:, 200:300] == 40).all()
+    assert (out[:, 0:100] == 40).all()
+
+
+def test_encode_png_round_trips():
+    out = render_board(_base(), _TILES, [_team("a", 0, 0x00FF00)])
+    decoded = cv2.imdecode(np.frombuffer(encode_png(out), np.uint8), cv2.IMREAD_COLOR)
+    assert np.array_equal(decoded, out)
+
+
+def test_paint_team_circles_matches_in_memory_render(tmp_path):
+    base_path = tmp_path / "board.png"
+    cv2.imwrite(str(base_path), _base())
+    teams = [_team("a", 0, 0x0000FF, [1]), _team("b", 0, 0xFFFFFF)]
+    out_path = tmp_path / "out.png"
+    paint_team_circles(base_path, _TILES, teams, out_path=str(out_path))
+    assert np.array_equal(cv2.imread(str(out_path)), render_board(_base(), _TILES, teams))
+
+
+def test_incremental_renderer_matches_full_render_across_updates():
+    renderer = IncrementalBoardRenderer(_base(), _TILES)
+    states = [
+        [_team("a", 0, 0xFF0000), _team("b", 0, 0x00FF00)],
+        [_team("a", 1, 0xFF0000, [2]), _team("b", 0, 0x00FF00)],
+        [_team("a", 1, 0xFF0000, [2]), _team("b", 2, 0x00FF00, [1])],
+        [_team("b", 2, 0x00FF00)],
+        [],
+    ]
+    for teams in states:
+        frame = renderer.render(teams)
+        assert np.array_equal(frame, render_board(_base(), _TILES, teams))
+
+
+def test_incremental_renderer_only_repaints_changed_tiles():
+    renderer = IncrementalBoardRenderer(_base(), _TILES)
+    renderer.render([_team("a", 0, 0xFF0000), _team("b", 2, 0x00FF00)])
+    assert renderer.last_dirty == [0, 2]
+
+    renderer.render([_team("a", 1, 0xFF0000), _team("b", 2, 0x00FF00)])
+    assert renderer.last_dirty == [0, 1]
+
+    renderer.render([_team("a", 1, 0xFF0000), _team("b", 2, 0x00FF00)])
+    assert renderer.last_dirty == []
+
+
+def test_incremental_renderer_reuses_png_when_clean():
+    renderer = IncrementalBoardRenderer(_base(), _TILES)
+    teams = [_team("a", 1, 0xFF0000, [2])]
+    first = renderer.render_png(teams)
+    assert renderer.render_png(teams) is first
+    assert renderer.render_png([_team("a", 2, 0xFF0000)]) != first
+
+
+def test_both_renderers_warn_about_tiles_off_the_board(caplog):
+    teams = [_team("a", 5, 0xFF0000)]
+    render_board(_base(), _TILES, teams)
+    IncrementalBoardRenderer(_base(), _TILES).render(teams)
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert warnings == ["Tile index 5 not in tiles list - skipped"] * 2
@@ -0,0 +1,73 @@
+"""Executors that keep blocking work off the discord.py event loop.
+
+Each guild's storage is accessed from one dedicated thread, so TinyDB, the
+write-behind cache and the index mirrors only ever see a single writer and
+need no locking of their own, while guilds never queue behind each other.
+Image work runs on a small bounded pool.
+
+Storage calls are timed (queue wait, run time, rows scanned) per function
+in ``util.metrics``.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+from config import METRICS_ENABLED, RENDER_THREADS
+from util import metrics
+from util.guild_context import current_partition
+
+T = TypeVar("T")
+
+_db_executors: Dict[int | None, ThreadPoolExecutor] = {}
+_db_executors_lock = threading.Lock()
+_render_executor = ThreadPoolExecutor(
+    max_workers=max(1, RENDER_THREADS), thread_name_prefix="render"
+)
+
+
+async def run_db(fn: Callable[..., T], /, *args, **kwargs) -> T:
+    """Run a storage call on the current guild's DB thread."""
+    executor = _db_executor(current_partition())
+    if METRICS_ENABLED:
+        return await _run(executor, _timed_db_call, (fn, time.perf_counter(), args), kwargs)
+    return await _run(executor, fn, args, kwargs)
+
+
+async def run_render(fn: Callable[..., T], /, *args, **kwargs) -> T:
+    """Run CPU-bound image work on the render pool."""
+    return await _run(_render_executor, fn, args, kwargs)
+
+
+def _db_executor(partition: int | None) -> ThreadPoolExecutor:
+    executor = _db_executors.get(partition)
+    if executor is None:
+        with _db_executors_lock:
+            executor = _db_executors.get(partition)
+            if executor is None:
+                name = "db-writer" if partition is None else f"db-writer-{partition}"
+                executor = _db_executors[partition] = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix=name
+                )
+    return executor
+
+
+def _run(executor, fn, args, kwargs):
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return loop.run_in_executor(executor, functools.partial(ctx.run, fn, *args, **kwargs))
+
+
+def _timed_db_call(fn, queued_at, args, /, **kwargs):
+    started = time.perf_counter()
+    name = f"{getattr(fn, '__module__', None)}.{getattr(fn, '__qualname__', type(fn).__name__)}"
+    metrics.observe("db_queue_seconds", started - queued_at, fn=name)
+    with metrics.counting_rows() as rows:
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            metrics.observe("db_call_seconds", time.perf_counter() - started, fn=name)
+            metrics.observe_rows("db_rows_scanned", rows[0], fn=name)
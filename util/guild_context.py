@@ -0,0 +1,32 @@
+"""The guild the current task works for.
+
+Bound once per interaction, bootstrap and board refresh; storage, the DB
+executors and the board state all key off it. Context variables follow
+``run_db``/``run_render`` into their worker threads.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from config import DB_DEFAULT_GUILD_ID
+
+current_guild_id: ContextVar[int | None] = ContextVar("current_guild_id", default=None)
+
+
+def partition_key(guild_id: int | None) -> int | None:
+    """Storage partition for a guild; ``None`` is the unscoped default."""
+    if guild_id is None or guild_id == DB_DEFAULT_GUILD_ID:
+        return None
+    return int(guild_id)
+
+
+def current_partition() -> int | None:
+    return partition_key(current_guild_id.get())
+
+
+@contextmanager
+def use_guild(guild_id: int | None):
+    token = current_guild_id.set(guild_id)
+    try:
+        yield
+    finally:
+        current_guild_id.reset(token)
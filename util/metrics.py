@@ -0,0 +1,283 @@
+"""In-process latency histograms and counters.
+
+Every series is keyed by a metric name plus a sorted label tuple and lives
+for the life of the process. Recording is a dict lookup, a bisect over the
+fixed buckets and three additions under the series' lock, so it is cheap
+enough to leave on; ``METRICS=0`` turns every call into a no-op.
+
+``render_text()`` is the Prometheus text exposition of everything recorded,
+``summary()`` a short human-readable digest with bucket-estimated
+percentiles (used by ``/bot-stats``).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Tuple
+
+from config import METRICS_ENABLED
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Seconds, 1-2.5-5 steps from 100 µs to 30 s.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+# Row counts, powers of four up to ~1M.
+ROW_BUCKETS: Tuple[float, ...] = tuple(float(4**k) for k in range(11))
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the ``q`` quantile, interpolated inside its bucket."""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if total == 0:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, n in enumerate(counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+_histograms: Dict[Tuple[str, Labels], Histogram] = {}
+_counters: Dict[Tuple[str, Labels], float] = {}
+_registry_lock = threading.Lock()
+
+
+def _key(name: str, labels: dict) -> Tuple[str, Labels]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def histogram(name: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels) -> Histogram:
+    key = _key(name, labels)
+    hist = _histograms.get(key)
+    if hist is None:
+        with _registry_lock:
+            hist = _histograms.setdefault(key, Histogram(buckets))
+    return hist
+
+
+def observe(name: str, value: float, **labels) -> None:
+    if METRICS_ENABLED:
+        histogram(name, **labels).observe(value)
+
+
+def observe_rows(name: str, rows: int, **labels) -> None:
+    if METRICS_ENABLED:
+        histogram(name, ROW_BUCKETS, **labels).observe(rows)
+
+
+def inc(name: str, amount: float = 1, **labels) -> None:
+    if not METRICS_ENABLED:
+        return
+    key = _key(name, labels)
+    with _registry_lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+@contextmanager
+def timer(name: str, **labels):
+    """Observe the wall time of the ``with`` body in seconds (also on error)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+# -- rows touched by the storage call running in this context ---------------
+
+_rows: ContextVar[List[int] | None] = ContextVar("db_rows", default=None)
+
+
+def count_rows(n: int) -> None:
+    """Add ``n`` to the rows counted for the enclosing ``counting_rows`` block."""
+    acc = _rows.get()
+    if acc is not None:
+        acc[0] += n
+
+
+@contextmanager
+def counting_rows():
+    acc = [0]
+    token = _rows.set(acc)
+    try:
+        yield acc
+    finally:
+        _rows.reset(token)
+
+
+# -- exposition --------------------------------------------------------------
+
+
+def _fmt_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def render_text() -> str:
+    """Everything recorded so far, in the Prometheus text format."""
+    with _registry_lock:
+        hists = sorted(_histograms.items())
+        counters = sorted(_counters.items())
+
+    lines: List[str] = []
+    typed = set()
+    for (name, labels), hist in hists:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        with hist._lock:
+            counts, total, value_sum = list(hist.counts), hist.count, hist.sum
+        cumulative = 0
+        for bound, n in zip(hist.buckets, counts):
+            cumulative += n
+            lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', _fmt_bound(bound)),))} {cumulative}")
+        lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', '+Inf'),))} {total}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {value_sum!r}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {total}")
+    for (name, labels), value in counters:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_fmt_labels(labels)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def summary(prefixes: Tuple[str, ...] = ()) -> str:
+    """One line per latency series: count, mean and p50/p95/p99 in ms."""
+    with _registry_lock:
+        hists = sorted(_histograms.items())
+    lines = []
+    for (name, labels), hist in hists:
+        if hist.buckets is not LATENCY_BUCKETS or hist.count == 0:
+            continue
+        if prefixes and not name.startswith(prefixes):
+            continue
+        label = ",".join(v for _, v in labels)
+        series = f"{name}[{label}]" if label else name
+        mean = hist.sum / hist.count
+        p50, p95, p99 = (hist.quantile(q) for q in (0.5, 0.95, 0.99))
+        lines.append(
+            f"{series:<44} n={hist.count:<6} mean={mean * 1000:8.1f}ms "
+            f"p50={p50 * 1000:8.1f} p95={p95 * 1000:8.1f} p99={p99 * 1000:8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def reset() -> None:
+    with _registry_lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+# -- slash commands and Discord REST -----------------------------------------
+
+_command: ContextVar[Tuple[str, float] | None] = ContextVar("command", default=None)
+
+
+def start_command(name: str) -> None:
+    """Start timing a slash command in the current task.
+
+    REST calls the task makes from here on are attributed to the command;
+    ``finish_command`` records it, from this task or one started from it.
+    """
+    _command.set((name, time.perf_counter()))
+
+
+def finish_command(failed: bool = False) -> None:
+    if (cmd := _command.get()) is None:
+        return
+    _command.set(None)
+    name, start = cmd
+    observe("command_seconds", time.perf_counter() - start, command=name)
+    if failed:
+        inc("command_errors_total", command=name)
+
+
+def rest_route(path: str) -> str:
+    """``/api/v10/channels/123/messages/456`` → ``/channels/{id}/messages/{id}``."""
+    parts = path.split("/")
+    if len(parts) > 3 and parts[1] == "api" and parts[2].startswith("v"):
+        parts = [""] + parts[3:]
+    for i, part in enumerate(parts):
+        if part.isdigit():
+            parts[i] = "{id}"
+        elif len(part) > 32:  # interaction and webhook tokens
+            parts[i] = "{token}"
+    return "/".join(parts)
+
+
+def discord_http_trace():
+    """aiohttp ``TraceConfig`` for ``discord.Client(http_trace=...)``.
+
+    Records every REST request by method, route and status. Inside a slash
+    command it also records the time from invocation to the initial
+    interaction response (the defer or first message) and the duration of
+    followup sends.
+    """
+    import aiohttp
+
+    async def on_start(session, ctx, params):
+        ctx.start = time.perf_counter()
+
+    async def on_end(session, ctx, params):
+        _observe_rest(ctx, params.method, params.url.path, params.response.status)
+
+    async def on_error(session, ctx, params):
+        _observe_rest(ctx, params.method, params.url.path, "error")
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_start)
+    trace.on_request_end.append(on_end)
+    trace.on_request_exception.append(on_error)
+    return trace
+
+
+def _observe_rest(ctx, method: str, path: str, status) -> None:
+    now = time.perf_counter()
+    route = rest_route(path)
+    observe("discord_rest_seconds", now - ctx.start, method=method, route=route, status=status)
+    cmd = _command.get()
+    if cmd is None:
+        return
+    name, started = cmd
+    if route.endswith("/callback"):
+        observe("command_defer_seconds", now - started, command=name)
+    elif route.startswith("/webhooks/"):
+        observe("command_followup_seconds", now - ctx.start, command=name)
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from util.logger import log
+
+
+class CoalescingScheduler:
+    """Runs an async job at most once at a time.
+
+    A request waits out the debounce window and then runs the job. Requests
+    that land during the debounce window ride along with that run; requests
+    that land while the job is running collapse into a single trailing run.
+    """
+
+    def __init__(
+        self,
+        job: Callable[[], Awaitable[None]],
+        debounce: float = 0.0,
+        name: str = "job",
+    ):
+        self._job = job
+        self.debounce = debounce
+        self.name = name
+        self._task: asyncio.Task | None = None
+        self._running = False
+        self._dirty = False
+
+        self.requested = 0
+        self.coalesced = 0
+        self.executed = 0
+        self.failed = 0
+
+    def request(self) -> None:
+        self.requested += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        elif not self._running or self._dirty:
+            self.coalesced += 1
+        else:
+            self._dirty = True
+
+    async def wait_idle(self) -> None:
+        while self._task is not None:
+            await asyncio.shield(self._task)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "executed": self.executed,
+            "failed": self.failed,
+        }
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                if self.debounce > 0:
+                    await asyncio.sleep(self.debounce)
+                self._running = True
+                self._dirty = False
+                self.executed += 1
+                try:
+                    await self._job()
+                except Exception:
+                    self.failed += 1
+                    log.exception("%s failed", self.name)
+                finally:
+                    self._running = False
+                if not self._dirty:
+                    return
+        finally:
+            self._task = None
@@ -0,0 +1,47 @@
+"""Wall-clock breakdown of the bot's startup.
+
+``mark(stage)`` closes a stage that started at the previous mark (or at
+process start for the first one). ``record`` adds a measured sub-stage that
+overlaps a marked one, e.g. parsing tiles.json during the imports.
+"""
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+_started = time.perf_counter()
+_last = _started
+_stages: List[Tuple[str, float, bool]] = []
+
+
+def mark(stage: str) -> float:
+    global _last
+    now = time.perf_counter()
+    elapsed = now - _last
+    _last = now
+    _stages.append((stage, elapsed, False))
+    return elapsed
+
+
+def record(stage: str, seconds: float) -> None:
+    _stages.append((stage, seconds, True))
+
+
+@contextmanager
+def measure(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def stages() -> List[Tuple[str, float, bool]]:
+    return list(_stages)
+
+
+def report() -> str:
+    lines = [f"Startup: {_last - _started:.3f}s total"]
+    for stage, seconds, nested in _stages:
+        indent = "    " if nested else "  "
+        lines.append(f"{indent}{stage:<24} {seconds * 1000:8.1f} ms")
+    return "\n".join(lines)